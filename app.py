@@ -1,8 +1,21 @@
 import streamlit as st
 import os
+import time
 from datetime import datetime
-from crewai import Agent, Task, Crew, Process
-from src.world_economics.crew import WorldEconomicsCrew
+from src.world_economics.chat_memory import ChatMemory
+from src.world_economics.events import STAGE, TASK_COMPLETED, TASK_STARTED, TOOL_STARTED
+from src.world_economics.jobs import JobStatus
+from src.world_economics.fetch import page_fetch_stats
+from src.world_economics.knowledge import knowledge_stats
+from src.world_economics.metrics import registry, start_metrics_server
+from src.world_economics.ratelimit import rate_limiter
+from src.world_economics.routing import ROUTED_AGENTS
+from src.world_economics.factory import crew_factory
+from src.world_economics.runner import (
+    get_report_cache, get_report_history, get_task_memo, report_flights, report_jobs, submit_report,
+)
+from src.world_economics.tools.serper_tool import search_cache_stats
+from src.world_economics.warmup import EXAMPLE_QUESTIONS, start_warmup
 import traceback
 
 # Page config
@@ -259,6 +272,19 @@ with st.sidebar:
         ),
         help="Choose which AI model to use for analysis"
     )
+
+    agent_models = {}
+    with st.expander("Per-agent models"):
+        st.caption("Route individual agents to a cheaper/faster or a stronger model.")
+        agent_options = ["Same as above", "gemini/gemini-2.5-flash-preview-05-20", "gemini-pro", "mistral-medium"]
+        for agent_name in ROUTED_AGENTS:
+            current = st.session_state.get(f"MODEL_{agent_name.upper()}", "Same as above")
+            agent_models[agent_name] = st.selectbox(
+                agent_name.replace("_", " ").title(),
+                agent_options,
+                index=agent_options.index(current) if current in agent_options else 0,
+                key=f"model_choice_{agent_name}",
+            )
     
     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -281,6 +307,14 @@ with st.sidebar:
             os.environ["MODEL"] = model_choice
             updated = True
 
+        for agent_name, agent_model in agent_models.items():
+            env_name = f"MODEL_{agent_name.upper()}"
+            st.session_state[env_name] = agent_model
+            if agent_model == "Same as above":
+                os.environ.pop(env_name, None)
+            else:
+                os.environ[env_name] = agent_model
+
         if updated:
             st.success("✅ Settings saved successfully!")
         else:
@@ -298,7 +332,34 @@ with st.sidebar:
     """)
     st.markdown('</div>', unsafe_allow_html=True)
 
-from src.world_economics.tools.serper_tool import serper_tool
+    # Runtime stats
+    with st.expander("📈 Performance"):
+        search_stats = search_cache_stats()
+        report_stats = get_report_cache().stats()
+        if search_stats:
+            st.markdown(f"- 🔍 **Search cache**: {search_stats['hit_rate']:.0%} hit rate ({search_stats['disk_size']} cached)")
+        st.markdown(f"- 📄 **Report cache**: {report_stats['exact_hits'] + report_stats['similar_hits']} hits / {report_stats['misses']} misses")
+        fetch_stats = page_fetch_stats()
+        if fetch_stats:
+            st.markdown(f"- 🌐 **Page fetches**: {fetch_stats['fetched']} downloaded, {fetch_stats['hit_rate']:.0%} from cache, {fetch_stats['errors']} failed")
+        knowledge = knowledge_stats()
+        if knowledge:
+            st.markdown(f"- 📚 **Knowledge index**: {knowledge['chunks']} chunks from {knowledge['files']} files, {knowledge['build_ms_last']:.1f} ms last refresh, {knowledge['query_ms_avg']:.2f} ms avg query")
+        memo_stats = get_task_memo().stats()
+        if memo_stats:
+            hits = sum(counts["hits"] for counts in memo_stats.values())
+            lookups = hits + sum(counts["misses"] for counts in memo_stats.values())
+            st.markdown(f"- ♻️ **Task memo**: {hits} of {lookups} task runs reused stored output")
+        flight_stats = report_flights.stats()
+        st.markdown(f"- 🔗 **Coalesced requests**: {flight_stats['suppressed']} duplicates joined {flight_stats['executions']} runs ({flight_stats['in_flight']} in flight)")
+        for provider, limits in rate_limiter.stats().items():
+            avg_wait = limits["wait_s"] / limits["acquired"] if limits["acquired"] else 0.0
+            st.markdown(f"- 🚦 **{provider}**: {limits['queued']} queued (max {limits['max_depth']}), {avg_wait:.2f}s avg wait, {limits['throttled']} rate-limited, {limits['retries']} retried")
+        for route, route_stats in registry.routes().items():
+            st.markdown(f"- 🧭 **{route}**: {route_stats['calls']} calls, {route_stats['avg_ms']:.0f} ms avg, ${route_stats['cost_usd']:.4f}")
+        for kind, setup in crew_factory.stats().items():
+            st.markdown(f"- ⚙️ **{kind}**: {setup['setup_ms_avg']:.1f} ms avg setup ({setup['built']:.0f} built, {setup['reused']:.0f} reused)")
+
 
 # Main Header
 st.markdown("""
@@ -309,27 +370,129 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Metrics Dashboard
-st.markdown("""
+start_metrics_server()
+start_warmup()
+dashboard = registry.dashboard()
+st.markdown(f"""
 <div class="metric-container">
     <div class="metric-box">
-        <div class="metric-value">AI-Powered</div>
-        <div class="metric-label">Analysis Engine</div>
+        <div class="metric-value">{dashboard['reports']}</div>
+        <div class="metric-label">Reports · {dashboard['report_avg_s']:.1f}s avg</div>
+    </div>
+    <div class="metric-box">
+        <div class="metric-value">{dashboard['llm_calls']}</div>
+        <div class="metric-label">LLM Calls · {dashboard['tokens']:,} tokens</div>
     </div>
     <div class="metric-box">
-        <div class="metric-value">Global</div>
-        <div class="metric-label">Market Coverage</div>
+        <div class="metric-value">${dashboard['cost_usd']:.3f}</div>
+        <div class="metric-label">Estimated Cost</div>
+    </div>
+    <div class="metric-box">
+        <div class="metric-value">{dashboard['search_calls']}</div>
+        <div class="metric-label">Searches · {dashboard['search_avg_s'] * 1000:.0f} ms avg</div>
     </div>
 </div>
 """, unsafe_allow_html=True)
 
-FINAL_REPORT_PATH = "final_report.md"
-
 # Helper function
 def load_final_report():
-    if os.path.exists(FINAL_REPORT_PATH):
-        with open(FINAL_REPORT_PATH, "r") as f:
-            return f.read()
-    return None
+    """The report of this session's latest run, handed over in memory by the job."""
+    return st.session_state.get("final_report")
+
+HISTORY_PAGE_SIZE = 10
+
+def render_report_history():
+    """Searchable, paginated list of stored reports; opening one makes it the current report."""
+    search = st.text_input("🔎 Search past reports", placeholder="e.g. tariffs Brazil", key="history_search")
+    if st.session_state.get("history_for") != search:
+        # a new search starts again from the first page
+        st.session_state.history_for = search
+        st.session_state.history_pages = [None]
+    pages = st.session_state.history_pages
+    report_history = get_report_history()
+    if search:
+        total = report_history.count(search)
+        entries = report_history.search(search, HISTORY_PAGE_SIZE, (len(pages) - 1) * HISTORY_PAGE_SIZE)
+    else:
+        total = report_history.count()
+        entries = report_history.page(HISTORY_PAGE_SIZE, before=pages[-1])
+    if not entries:
+        st.caption("No matching reports." if search else "No reports yet.")
+        return
+
+    for entry in entries:
+        entry_col, open_col = st.columns([5, 1])
+        with entry_col:
+            st.markdown(f"**{entry.query}**")
+            st.caption(f"{datetime.fromtimestamp(entry.created_at):%Y-%m-%d %H:%M} • {entry.elapsed:.0f}s • {entry.model or 'default model'}")
+            if entry.snippet:
+                st.caption(entry.snippet)
+        with open_col:
+            if st.button("Open", key=f"history_open_{entry.id}", use_container_width=True):
+                stored, report = report_history.get(entry.id)
+                st.session_state.final_report = report
+                st.session_state.report_run_id = stored.run_id
+                st.session_state.report_generated_at = datetime.fromtimestamp(stored.created_at)
+                st.session_state.report_query = stored.query
+                st.session_state.chat_memory = ChatMemory()
+                st.rerun()
+
+    prev_col, info_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        if len(pages) > 1 and st.button("◀ Newer", use_container_width=True):
+            pages.pop()
+            st.rerun()
+    with info_col:
+        first = (len(pages) - 1) * HISTORY_PAGE_SIZE
+        st.caption(f"{first + 1}–{first + len(entries)} of {total}")
+    with next_col:
+        if first + len(entries) < total and st.button("Older ▶", use_container_width=True):
+            pages.append(entries[-1].id)
+            st.rerun()
+
+PIPELINE_STEPS = {
+    "user_analysis_task": "🔄 Understanding your question",
+    "research_task": "🔍 Gathering economic data",
+    "analysis_task": "🧠 Analyzing the findings",
+    "reporting_task": "📊 Writing the report",
+}
+
+@st.fragment(run_every=1)
+def report_job_progress(job_id):
+    """Render live progress of the background report job from its event stream."""
+    job = report_jobs.get(job_id)
+    if job is None or job.done:
+        st.rerun()
+    if job.status == JobStatus.QUEUED:
+        queued = report_jobs.stats()[JobStatus.QUEUED.value]
+        st.markdown(f'<div class="status-card status-info">⏳ Report queued ({queued} waiting)...</div>', unsafe_allow_html=True)
+        return
+
+    events = job.events.since()
+    completed = {e.task: e for e in events if e.type == TASK_COMPLETED and e.task in PIPELINE_STEPS}
+    current = next((e.task for e in reversed(events) if e.type == TASK_STARTED and e.task in PIPELINE_STEPS), "user_analysis_task")
+    elapsed = time.time() - job.started_at
+    st.progress(len(completed) / len(PIPELINE_STEPS), text=f"{PIPELINE_STEPS[current]}... ({elapsed:.0f}s elapsed)")
+
+    reused = [e.task for e in events if e.type == STAGE and e.data.get("stage") == "memo_hit"]
+    if reused:
+        st.caption("♻️ Reused unchanged steps: " + ", ".join(PIPELINE_STEPS[t][2:] for t in reused))
+
+    tool_calls = [e for e in events if e.type == TOOL_STARTED]
+    if tool_calls:
+        st.caption(f"🔧 {len(tool_calls)} tool calls • latest: {tool_calls[-1].data['tool']} {tool_calls[-1].data['args'][:100]}")
+
+    draft = job.events.text("reporting_task")
+    if draft:
+        st.markdown('<div class="report-container">', unsafe_allow_html=True)
+        st.markdown(draft, unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+    else:
+        for task_name in reversed(PIPELINE_STEPS):
+            if task_name in completed:
+                with st.expander(f"✅ {PIPELINE_STEPS[task_name][2:]} — intermediate result"):
+                    st.markdown(completed[task_name].data.get("output", ""))
+                break
 
 # Enhanced Tabs
 tabs = st.tabs(["📘 Report Generator", "💬 Interactive Assistant"])
@@ -356,13 +519,7 @@ with tabs[0]:
         
         # Query examples
         with st.expander("💡 Example Questions"):
-            st.markdown("""
-            - How do interest rate changes affect emerging markets?
-            - What is the impact of inflation on consumer spending patterns?
-            - How does geopolitical tension influence global supply chains?
-            - What are the economic implications of cryptocurrency adoption?
-            - How do trade wars affect international commerce?
-            """)
+            st.markdown("\n".join(f"- {question}" for question in EXAMPLE_QUESTIONS))
         
         submit = st.button("📊 Generate Comprehensive Report", use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
@@ -395,44 +552,36 @@ with tabs[0]:
         if not user_query.strip():
             st.markdown('<div class="status-card status-warning">⚠️ Please enter a valid economic question to generate a report.</div>', unsafe_allow_html=True)
         else:
-            # Progress indicator
-            progress_container = st.empty()
-            with progress_container:
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                try:
-                    status_text.text("🔄 Initializing AI analysis...")
-                    progress_bar.progress(20)
-                    
-                    status_text.text("🔍 Gathering economic data...")
-                    progress_bar.progress(40)
-                    
-                    status_text.text("🧠 Processing with AI models...")
-                    progress_bar.progress(60)
-                    
-                    inputs = {
-                        "user_query": user_query,
-                        "current_year": str(datetime.now().year)
-                    }
-                    
-                    status_text.text("📊 Generating comprehensive report...")
-                    progress_bar.progress(80)
-                    
-                    WorldEconomicsCrew().crew().kickoff(inputs=inputs)
-                    
-                    progress_bar.progress(100)
-                    progress_container.empty()
-                    
-                    st.markdown('<div class="status-card status-success">✅ Report generated successfully!</div>', unsafe_allow_html=True)
-                    st.balloons()
-                    
-                except Exception as e:
-                    progress_container.empty()
-                    st.markdown('<div class="status-card status-error">❌ Error generating report</div>', unsafe_allow_html=True)
-                    st.error(f"Error details: {e}")
-                    with st.expander("🔍 Technical Details"):
-                        st.code(traceback.format_exc())
+            st.session_state.report_job_id = submit_report(user_query, str(datetime.now().year))
+            st.session_state.report_query = user_query
+
+    # Track the background report job
+    job_id = st.session_state.get("report_job_id")
+    if job_id:
+        job = report_jobs.get(job_id)
+        if job is not None and not job.done:
+            report_job_progress(job_id)
+        else:
+            st.session_state.report_job_id = None
+            if job is not None and job.status == JobStatus.SUCCEEDED:
+                st.session_state.final_report = job.result.report
+                st.session_state.report_run_id = job.result.run_id
+                st.session_state.report_generated_at = datetime.fromtimestamp(job.finished_at)
+            if job is not None and job.status == JobStatus.FAILED:
+                st.markdown('<div class="status-card status-error">❌ Error generating report</div>', unsafe_allow_html=True)
+                st.error(f"Error details: {job.error}")
+                with st.expander("🔍 Technical Details"):
+                    st.code(job.traceback)
+            elif job is not None and job.result.cached:
+                st.markdown(f'<div class="status-card status-info">⚡ Served a recent report for this question from cache ({job.result.elapsed * 1000:.0f} ms)</div>', unsafe_allow_html=True)
+            elif job is not None and job.result.coalesced:
+                st.markdown('<div class="status-card status-success">✅ Report generated! The same question was already being analyzed, so this request shared that run.</div>', unsafe_allow_html=True)
+            elif job is not None and job.result.reused:
+                reused = ", ".join(PIPELINE_STEPS[t][2:] for t in job.result.reused)
+                st.markdown(f'<div class="status-card status-success">✅ Report generated! Reused stored results for unchanged steps: {reused}</div>', unsafe_allow_html=True)
+            elif job is not None:
+                st.markdown('<div class="status-card status-success">✅ Report generated successfully!</div>', unsafe_allow_html=True)
+                st.balloons()
 
     # Show Report if available
     final_report = load_final_report()
@@ -446,23 +595,41 @@ with tabs[0]:
             st.markdown("### 📄 Economic Analysis Report")
         
         with report_col2:
-            st.markdown(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+            st.markdown(f"**Generated:** {st.session_state.report_generated_at.strftime('%Y-%m-%d %H:%M')}")
         
         with report_col3:
-            with open(FINAL_REPORT_PATH, "r") as f:
-                st.download_button(
-                    "📥 Download Report",
-                    f.read(),
-                    file_name=f"world_economics_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md",
-                    mime="text/markdown",
-                    use_container_width=True
-                )
+            st.download_button(
+                "📥 Download Report",
+                final_report,
+                file_name=f"world_economics_report_{st.session_state.report_run_id}.md",
+                mime="text/markdown",
+                use_container_width=True
+            )
         
         # Display report in styled container
         st.markdown('<div class="report-container">', unsafe_allow_html=True)
         st.markdown(final_report, unsafe_allow_html=True)
         st.markdown('</div>', unsafe_allow_html=True)
 
+        if st.session_state.get("report_query"):
+            with st.expander("🔁 Rerun part of this report"):
+                rerun_from = st.selectbox(
+                    "Execute again from",
+                    list(PIPELINE_STEPS),
+                    index=len(PIPELINE_STEPS) - 1,
+                    format_func=lambda t: PIPELINE_STEPS[t][2:],
+                    help="Earlier steps reuse their stored results; this step and the ones after it run again",
+                )
+                if st.button("🔁 Rerun", use_container_width=True):
+                    st.session_state.report_job_id = submit_report(
+                        st.session_state.report_query, str(datetime.now().year), use_cache=False, rerun_from=rerun_from
+                    )
+                    st.rerun()
+
+    st.markdown("---")
+    with st.expander(f"🗂️ Report History ({get_report_history().count()} saved)"):
+        render_report_history()
+
     st.markdown('</div>', unsafe_allow_html=True)
 
 # --- Tab 2: Interactive Assistant ---
@@ -498,14 +665,18 @@ with tabs[1]:
         st.markdown("Ask follow-up questions about your report or request real-time economic updates")
         
         # Initialize chat history
-        if "chat_history" not in st.session_state:
-            st.session_state.chat_history = []
+        if "chat_memory" not in st.session_state:
+            st.session_state.chat_memory = ChatMemory()
+        chat_memory = st.session_state.chat_memory
 
         # Chat interface
         st.markdown('<div class="chat-container">', unsafe_allow_html=True)
         
-        # Display chat history
-        for role, msg in st.session_state.chat_history:
+        # Display chat history: older messages only as their summary
+        if chat_memory.summarized:
+            with st.expander(f"🗂️ {chat_memory.summarized} earlier messages (summarized)"):
+                st.markdown(chat_memory.summary())
+        for role, msg in chat_memory.messages():
             with st.chat_message(role):
                 st.markdown(msg)
         
@@ -514,7 +685,6 @@ with tabs[1]:
 
         if follow_up:
             # Add user message to chat
-            st.session_state.chat_history.append(("user", follow_up))
             
             with st.chat_message("user"):
                 st.markdown(follow_up)
@@ -522,49 +692,24 @@ with tabs[1]:
             with st.chat_message("assistant"):
                 with st.spinner("🤖 Analyzing your question..."):
                     try:
-                        # Define inline agent
-                        chat_agent = Agent(
-                            role="Economic Report Assistant",
-                            goal="Answer follow-up questions based on the economic report and provide current economic insights.",
-                            backstory="You are an expert economic analyst trained to provide detailed, accurate responses based on economic reports and real-time data.",
-                            tools=[serper_tool],
-                            verbose=True
-                        )
-
-                        # Define task using context
-                        chat_task = Task(
-                            description=f"""Based on the economic report:
-
-{final_report}
-
-Answer the user's question: {follow_up}
-
-If the question can be answered from the report context, provide a detailed response.
-If additional current information is needed, use the search tool to find up-to-date data.
-Provide a comprehensive and informative answer.""",
-                            expected_output="A detailed, clear, and informative response that addresses the user's question with relevant economic insights.",
-                            agent=chat_agent
-                        )
-
-                        # Run the crew
-                        chat_crew = Crew(
-                            agents=[chat_agent],
-                            tasks=[chat_task],
-                            process=Process.sequential
-                        )
-                        
-                        response = chat_crew.kickoff()
+                        # Imported here so crewai only loads once the chat is actually used
+                        from src.world_economics.chat import answer_question
+
+                        response = answer_question(final_report, follow_up, memory=chat_memory)
+                        # recorded after answering, so the prompt's history holds only earlier turns
+                        chat_memory.add("user", follow_up)
                         
                         # Display response
                         st.markdown(response)
                         
                         # Add to chat history
-                        st.session_state.chat_history.append(("assistant", response))
+                        chat_memory.add("assistant", response)
 
                     except Exception as e:
                         error_msg = f"❌ Error processing your question: {str(e)}"
                         st.error(error_msg)
-                        st.session_state.chat_history.append(("assistant", error_msg))
+                        chat_memory.add("user", follow_up)
+                        chat_memory.add("assistant", error_msg)
                         
                         with st.expander("🔍 Technical Details"):
                             st.code(traceback.format_exc())
@@ -572,16 +717,16 @@ Provide a comprehensive and informative answer.""",
         st.markdown('</div>', unsafe_allow_html=True)
         
         # Quick action buttons
-        if st.session_state.chat_history:
+        if len(chat_memory):
             col1, col2 = st.columns(2)
             with col1:
                 if st.button("🗑️ Clear Chat History", use_container_width=True):
-                    st.session_state.chat_history = []
+                    st.session_state.chat_memory = ChatMemory()
                     st.rerun()
             
             with col2:
                 if st.button("💾 Export Chat", use_container_width=True):
-                    chat_export = "\n\n".join([f"**{role.title()}:** {msg}" for role, msg in st.session_state.chat_history])
+                    chat_export = chat_memory.export()
                     st.download_button(
                         "📥 Download Chat History",
                         chat_export,
@@ -0,0 +1,280 @@
+import json
+import re
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+OPERATIONS = ("summary", "yoy", "cagr", "rolling", "correlation", "ranking")
+
+_LINE = re.compile(r"^\s*[-*]?\s*([^:]+?)\s*:\s*(.+)$")
+_RATE = re.compile(
+    r"%|\b(?:(?<!exchange )rates?|growth|inflation|percent(?:age)?|ratio|share|yields?|unemployment|of gdp|pp)\b", re.IGNORECASE
+)
+# thousands separators only in groups of three, so "2020: 3,2021: 8" stays two points
+_POINT = re.compile(
+    r"((?:19|20)\d{2})\s*[:=]\s*(-?(?:\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d*\.?\d+)(?:[eE][-+]?\d+)?)(?!\d)"
+)
+
+
+class Panel:
+    """Series aligned on a common, gap-free year axis; missing observations are NaN."""
+
+    def __init__(self, series: Dict[str, Dict[int, float]]):
+        series = {label: points for label, points in series.items() if points}
+        if not series:
+            raise ValueError("no numeric series given")
+        first = min(min(points) for points in series.values())
+        last = max(max(points) for points in series.values())
+        self.labels: List[str] = list(series)
+        self.years = np.arange(first, last + 1)
+        self.values = np.full((len(self.labels), len(self.years)), np.nan)
+        for row, points in enumerate(series.values()):
+            self.values[row, np.fromiter(points, dtype=int) - first] = np.fromiter(points.values(), dtype=float)
+
+
+def parse_series(data: str) -> Dict[str, Dict[int, float]]:
+    """Read series from JSON (``{"Brazil": {"2020": 3.2, ...}}``) or lines like ``Brazil: 2020: 3.2, 2021: 8.3``.
+
+    The line format is what the local indicator tool returns, so its output can be passed straight in.
+    """
+    try:
+        parsed = json.loads(data)
+    except ValueError:
+        parsed = None
+    if isinstance(parsed, dict):
+        return {
+            str(label): {int(year): float(value) for year, value in points.items() if value is not None}
+            for label, points in parsed.items()
+            if isinstance(points, dict)
+        }
+
+    series: Dict[str, Dict[int, float]] = {}
+    for line in data.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        points = {int(y): float(v.replace(",", "")) for y, v in _POINT.findall(match.group(2))}
+        if points:
+            series.setdefault(match.group(1).strip(), {}).update(points)
+    return series
+
+
+def is_rate(*names: str) -> bool:
+    """Whether series or indicator names describe percentages or rates (inflation, GDP growth) rather than levels."""
+    return any(_RATE.search(name) for name in names if name)
+
+
+def series_rates(data: str) -> Dict[str, bool]:
+    """Which series in ``data`` (as read by parse_series) are rates.
+
+    A series is judged by its own label; in the line format, a label that
+    names no unit (a country) falls back to the heading line above it, such
+    as the indicator title the local indicator tool prints first.
+    """
+    try:
+        parsed = json.loads(data)
+    except ValueError:
+        parsed = None
+    if isinstance(parsed, dict):
+        return {str(label): is_rate(str(label)) for label in parsed}
+
+    rates: Dict[str, bool] = {}
+    heading = ""
+    for line in data.splitlines():
+        match = _LINE.match(line)
+        if match and _POINT.search(match.group(2)):
+            label = match.group(1).strip()
+            rates[label] = rates.get(label, False) or is_rate(label, heading)
+        elif line.strip():
+            heading = line
+    return rates
+
+
+def yoy(panel: Panel) -> np.ndarray:
+    """Year-over-year % change; NaN where either year is missing or the base is not positive.
+
+    Column ``j`` is the change into ``years[j + 1]``.
+    """
+    base = panel.values[:, :-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(base > 0, (panel.values[:, 1:] / base - 1) * 100, np.nan)
+
+
+def yearly_difference(panel: Panel) -> np.ndarray:
+    """Year-over-year change in the series' own units (percentage points for rates); laid out like ``yoy``."""
+    return panel.values[:, 1:] - panel.values[:, :-1]
+
+
+def _endpoints(panel: Panel) -> Tuple[np.ndarray, np.ndarray]:
+    """Column index of each series' first and last observation (-1 when empty)."""
+    present = ~np.isnan(panel.values)
+    first = np.where(present.any(axis=1), present.argmax(axis=1), -1)
+    last = np.where(present.any(axis=1), present.shape[1] - 1 - present[:, ::-1].argmax(axis=1), -1)
+    return first, last
+
+
+def cagr(panel: Panel) -> np.ndarray:
+    """Compound annual growth rate (%) between each series' first and last observation."""
+    first, last = _endpoints(panel)
+    rows = np.arange(len(panel.labels))
+    start, end = panel.values[rows, first], panel.values[rows, last]
+    periods = (last - first).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (np.power(end / start, 1 / periods) - 1) * 100
+    growth[(periods <= 0) | (start <= 0) | (end <= 0)] = np.nan
+    return growth
+
+
+def total_change(panel: Panel) -> np.ndarray:
+    """Change between each series' first and last observation, in the series' own units."""
+    first, last = _endpoints(panel)
+    rows = np.arange(len(panel.labels))
+    change = panel.values[rows, last] - panel.values[rows, first]
+    change[first < 0] = np.nan
+    return change
+
+
+def rolling(panel: Panel, window: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling mean and standard deviation over ``window`` years; column ``j`` ends at ``years[j + window - 1]``."""
+    window = max(1, min(window, len(panel.years)))
+    windows = np.lib.stride_tricks.sliding_window_view(panel.values, window, axis=1)
+    full = ~np.isnan(windows).any(axis=2)
+    with np.errstate(invalid="ignore"):
+        mean = np.where(full, windows.mean(axis=2), np.nan)
+        std = np.where(full, windows.std(axis=2, ddof=1 if window > 1 else 0), np.nan)
+    return mean, std
+
+
+def correlation(panel: Panel, min_overlap: int = 3) -> np.ndarray:
+    """Pairwise Pearson correlation over the years both series have; NaN when fewer than ``min_overlap``."""
+    present = ~np.isnan(panel.values)
+    x = np.where(present, panel.values, 0.0)
+    mask = present.astype(float)
+    n = mask @ mask.T
+    sum_x = x @ mask.T  # sum of row i over the years row j is also present
+    sum_xx = (x * x) @ mask.T
+    sum_xy = x @ x.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sum_xy - sum_x * sum_x.T / n
+        var_i = sum_xx - sum_x ** 2 / n
+        corr = cov / np.sqrt(var_i * var_i.T)
+    corr[n < min_overlap] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def latest(panel: Panel) -> Tuple[np.ndarray, np.ndarray]:
+    """Each series' latest value and its year."""
+    _, last = _endpoints(panel)
+    return panel.values[np.arange(len(panel.labels)), last], panel.years[last]
+
+
+def _cell(value: float, digits: int = 2) -> str:
+    return "–" if np.isnan(value) else f"{value:,.{digits}f}"
+
+
+def _units(rates: np.ndarray, rate: str, level: str) -> str:
+    """The unit wording for a section: one unit when every row shares it, both otherwise."""
+    if rates.all():
+        return rate
+    if not rates.any():
+        return level
+    return f"{rate} for rates, {level} for levels"
+
+
+def _table(header: List[str], rows: List[List[str]]) -> str:
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    lines += ["| " + " | ".join(row) + " |" for row in rows]
+    return "\n".join(lines)
+
+
+def analyze(
+    series: Dict[str, Dict[int, float]],
+    operations: Optional[List[str]] = None,
+    window: int = 3,
+    max_years: int = 8,
+    rates: Union[None, bool, Dict[str, bool]] = None,
+) -> str:
+    """Run the requested operations over all series at once and return compact markdown tables.
+
+    Per-year tables show only the most recent ``max_years`` columns. For
+    rates (percentages such as inflation or GDP growth), "yoy" and "cagr"
+    report percentage-point changes, because a growth rate of a growth rate
+    means nothing. ``rates`` says which series are rates: one flag for all of
+    them, or one per label; labels it doesn't cover are guessed from the
+    label. In a panel mixing rates and levels each row carries its own unit.
+    """
+    panel = Panel(series)
+    operations = [op for op in (operations or OPERATIONS) if op in OPERATIONS]
+    labels = panel.labels
+    if isinstance(rates, bool):
+        is_rate_row = np.full(len(labels), rates)
+    else:
+        is_rate_row = np.array([(rates or {}).get(label, is_rate(label)) for label in labels], dtype=bool)
+    mixed = is_rate_row.any() and not is_rate_row.all()
+
+    def growth_cell(i: int, value: float, digits: int = 2) -> str:
+        cell = _cell(value, digits)
+        if not mixed or cell == "–":
+            return cell
+        return f"{cell} pp" if is_rate_row[i] else f"{cell} %"
+
+    sections = []
+
+    if "summary" in operations:
+        values = panel.values
+        last_value, last_year = latest(panel)
+        mean, low, high = np.nanmean(values, axis=1), np.nanmin(values, axis=1), np.nanmax(values, axis=1)
+        rows = [
+            [label, str(int((~np.isnan(values[i])).sum())), _cell(mean[i]), _cell(low[i]), _cell(high[i]),
+             f"{_cell(last_value[i])} ({last_year[i]})"]
+            for i, label in enumerate(labels)
+        ]
+        sections.append("**Summary**\n" + _table(["Series", "Obs", "Mean", "Min", "Max", "Latest"], rows))
+
+    if "yoy" in operations and len(panel.years) > 1:
+        changes = np.where(is_rate_row[:, None], yearly_difference(panel), yoy(panel))[:, -max_years:]
+        years = panel.years[1:][-max_years:]
+        rows = [[label] + [growth_cell(i, v, 1) for v in changes[i]] for i, label in enumerate(labels)]
+        title = f"Year-over-year change ({_units(is_rate_row, 'percentage points', '%')})"
+        sections.append(f"**{title}**\n" + _table(["Series"] + [str(y) for y in years], rows))
+
+    if "cagr" in operations:
+        growth = np.where(is_rate_row, total_change(panel), cagr(panel))
+        first, last = _endpoints(panel)
+        rows = [
+            [label, f"{panel.years[first[i]]}–{panel.years[last[i]]}", growth_cell(i, growth[i])]
+            for i, label in enumerate(labels)
+        ]
+        if is_rate_row.any():
+            title = f"Change over the period ({_units(is_rate_row, 'percentage points', 'CAGR %')})"
+            sections.append(f"**{title}**\n" + _table(["Series", "Period", "Change"], rows))
+        else:
+            sections.append("**Compound annual growth (%)**\n" + _table(["Series", "Period", "CAGR"], rows))
+
+    if "rolling" in operations and len(panel.years) >= window:
+        mean, std = rolling(panel, window)
+        ends = panel.years[window - 1:][-max_years:]
+        mean, std = mean[:, -max_years:], std[:, -max_years:]
+        rows = [
+            [label] + [f"{_cell(m)} ± {_cell(s)}" if not np.isnan(m) else "–" for m, s in zip(mean[i], std[i])]
+            for i, label in enumerate(labels)
+        ]
+        sections.append(f"**{window}-year rolling mean ± std**\n" + _table(["Series"] + [str(y) for y in ends], rows))
+
+    if "correlation" in operations and len(labels) > 1:
+        corr = correlation(panel)
+        rows = [[label] + [_cell(v) for v in corr[i]] for i, label in enumerate(labels)]
+        sections.append("**Correlation (overlapping years)**\n" + _table([""] + labels, rows))
+
+    if "ranking" in operations and len(labels) > 1:
+        last_value, last_year = latest(panel)
+        growth = np.where(is_rate_row, total_change(panel), cagr(panel))
+        order = np.argsort(np.where(np.isnan(last_value), -np.inf, last_value))[::-1]
+        rows = [
+            [str(rank), labels[i], f"{_cell(last_value[i])} ({last_year[i]})", growth_cell(i, growth[i])]
+            for rank, i in enumerate(order, start=1)
+        ]
+        growth_header = "Change" if mixed else "Change pp" if is_rate_row.all() else "CAGR %"
+        sections.append("**Ranking by latest value**\n" + _table(["#", "Series", "Latest", growth_header], rows))
+
+    return "\n\n".join(sections)
@@ -0,0 +1,255 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Set
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+# Package modules are imported inside create_app: some read their settings at
+# import time, and `serve --stub` has to change those settings first.
+
+API_MAX_REPORTS = int(os.getenv("API_MAX_REPORTS", 8))
+API_MAX_CHATS = int(os.getenv("API_MAX_CHATS", 4))
+# models a request may pick; empty = any
+API_MODELS = [m.strip() for m in os.getenv("API_MODELS", "").split(",") if m.strip()]
+API_KEEPALIVE = float(os.getenv("API_KEEPALIVE", 15))
+
+_POLL = 0.1
+
+
+class ReportRequest(BaseModel):
+    query: str = Field(..., min_length=1, max_length=2000, description="The question to report on")
+    year: Optional[str] = Field(None, description="current_year input (default: this year)")
+    use_cache: bool = Field(True, description="Serve a cached report for the same question if there is one")
+    rerun_from: Optional[str] = Field(None, description="Always execute this task and the ones after it")
+    models: Dict[str, str] = Field(
+        default_factory=dict, description="Models for this request by agent name, or 'default' for every agent"
+    )
+
+
+class ChatMessage(BaseModel):
+    role: Literal["user", "assistant"]
+    text: str
+
+
+class ChatRequest(BaseModel):
+    question: str = Field(..., min_length=1, max_length=2000)
+    report: Optional[str] = Field(None, description="The report to discuss")
+    job_id: Optional[str] = Field(None, description="A finished report job whose report to discuss")
+    history: List[ChatMessage] = Field(default_factory=list, description="Earlier messages, oldest first")
+    models: Dict[str, str] = Field(default_factory=dict, description="Models for this request by agent name")
+
+
+def _sse(event: str, data: Dict[str, Any], id: Optional[int] = None) -> str:
+    head = f"id: {id}\n" if id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def create_app(max_reports: int = API_MAX_REPORTS, max_chats: int = API_MAX_CHATS) -> FastAPI:
+    """The HTTP API over the shared report job queue and the chat flow.
+
+    Report requests are queued with submit_report and return a job id right
+    away; clients poll the job, long-poll its result or follow its progress
+    as server-sent events. At most ``max_reports`` API jobs are queued or
+    running and at most ``max_chats`` chat answers are generated at once;
+    requests beyond that get 429 instead of piling up. Model choices are
+    per request (routing.override_models), never written to the environment.
+    """
+    from .jobs import Job, JobStatus
+    from .metrics import registry
+    from .routing import ROUTED_AGENTS, override_models
+    from .runner import report_jobs, submit_report
+
+    app = FastAPI(title="World Economics", description="Economic research reports and follow-up chat.")
+    active: Set[str] = set()
+    chats = asyncio.Semaphore(max_chats)
+
+    def check_models(models: Dict[str, str]) -> None:
+        for agent, model in models.items():
+            if agent != "default" and agent not in ROUTED_AGENTS:
+                raise HTTPException(422, f"Unknown agent {agent!r}; expected one of: default, {', '.join(ROUTED_AGENTS)}")
+            if API_MODELS and model not in API_MODELS:
+                raise HTTPException(422, f"Model {model!r} is not allowed; choose from: {', '.join(API_MODELS)}")
+
+    def busy(what: str) -> HTTPException:
+        return HTTPException(429, f"Too many {what} in progress, try again shortly", headers={"Retry-After": "5"})
+
+    def get_job(job_id: str) -> Job:
+        job = report_jobs.get(job_id)
+        if job is None:
+            raise HTTPException(404, f"No job {job_id}")
+        return job
+
+    def view(job: Job) -> Dict[str, Any]:
+        data = {
+            "id": job.id,
+            "status": job.status.value,
+            "query": job.description,
+            "submitted_at": job.submitted_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+            "events": len(job.events.since()),
+            "error": job.error,
+        }
+        if job.status == JobStatus.SUCCEEDED:
+            result = job.result
+            data.update(
+                run_id=result.run_id, cached=result.cached, coalesced=result.coalesced,
+                reused=result.reused, elapsed=result.elapsed,
+            )
+        return data
+
+    @app.get("/health")
+    async def health() -> Dict[str, Any]:
+        return {"status": "ok", "jobs": report_jobs.stats(), "api_jobs": len(active)}
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics() -> str:
+        return registry.prometheus_text()
+
+    @app.post("/reports", status_code=202)
+    async def create_report(body: ReportRequest) -> Dict[str, Any]:
+        from .pipeline import STAGES
+
+        check_models(body.models)
+        if body.rerun_from is not None and body.rerun_from not in STAGES:
+            raise HTTPException(422, f"Unknown task {body.rerun_from!r}; expected one of: {', '.join(STAGES)}")
+        for job_id in list(active):
+            job = report_jobs.get(job_id)
+            if job is None or job.done:
+                active.discard(job_id)
+        if len(active) >= max_reports:
+            raise busy("reports")
+        job_id = submit_report(body.query, body.year, body.use_cache, body.rerun_from, body.models or None)
+        active.add(job_id)
+        return view(get_job(job_id))
+
+    @app.get("/reports/{job_id}")
+    async def report_status(job_id: str) -> Dict[str, Any]:
+        return view(get_job(job_id))
+
+    @app.get("/reports/{job_id}/result")
+    async def report_result(job_id: str, wait: float = 0.0) -> Any:
+        """The finished report; 202 with the job status while it is still running.
+
+        ``wait`` holds the request open for up to that many seconds (at most 60) for the job to finish.
+        """
+        job = get_job(job_id)
+        deadline = time.monotonic() + min(max(wait, 0.0), 60.0)
+        while not job.done and time.monotonic() < deadline:
+            await asyncio.sleep(_POLL)
+        if not job.done:
+            return JSONResponse(view(job), status_code=202)
+        if job.status == JobStatus.FAILED:
+            raise HTTPException(500, f"Report failed: {job.error}")
+        return {**view(job), "report": job.result.report}
+
+    @app.get("/reports/{job_id}/events")
+    async def report_events(job_id: str, request: Request) -> StreamingResponse:
+        """Server-sent events: the job's progress events, then ``done`` with the final status.
+
+        Each event carries its index as the SSE id, so a client reconnecting with
+        Last-Event-ID resumes where it left off.
+        """
+        job = get_job(job_id)
+        try:
+            start = int(request.headers.get("last-event-id", -1)) + 1
+        except ValueError:
+            start = 0
+
+        async def stream() -> AsyncIterator[str]:
+            index, idle_since = start, time.monotonic()
+            while not await request.is_disconnected():
+                closed = job.events.closed  # read before draining, so no event is missed after close
+                events = job.events.since(index)
+                for event in events:
+                    yield _sse(event.type, {"task": event.task, "timestamp": event.timestamp, **event.data}, index)
+                    index += 1
+                if events:
+                    idle_since = time.monotonic()
+                elif closed:
+                    yield _sse("done", view(job))
+                    return
+                elif time.monotonic() - idle_since >= API_KEEPALIVE:
+                    yield ": keep-alive\n\n"
+                    idle_since = time.monotonic()
+                await asyncio.sleep(_POLL)
+
+        return StreamingResponse(
+            stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.post("/chat")
+    async def chat(body: ChatRequest) -> Dict[str, Any]:
+        """Answer a follow-up question about a report given inline or by job id."""
+        from .chat_memory import ChatMemory
+
+        check_models(body.models)
+        report = body.report
+        if report is None and body.job_id is not None:
+            job = get_job(body.job_id)
+            if job.status != JobStatus.SUCCEEDED:
+                raise HTTPException(409, f"Job {job.id} has no report ({job.status.value})")
+            report = job.result.report
+        if not report:
+            raise HTTPException(422, "Provide a report or the job_id of a finished report")
+        if chats.locked():
+            raise busy("chat answers")
+
+        def answer() -> str:
+            from .chat import answer_question
+
+            memory = None
+            if body.history:
+                memory = ChatMemory()
+                for message in body.history:
+                    memory.add(message.role, message.text)
+            with override_models(body.models or None):
+                return answer_question(report, body.question, memory=memory)
+
+        started = time.perf_counter()
+        async with chats:
+            text = await asyncio.to_thread(answer)
+        return {"answer": text, "elapsed": time.perf_counter() - started}
+
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the report and chat HTTP API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--stub", action="store_true",
+                        help="answer with the offline stub LLM and stub search server (no API keys needed)")
+    parser.add_argument("--stub-latency", type=float, default=0.05, help="seconds per stub LLM and search call")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    if not args.stub:
+        uvicorn.run(create_app(), host=args.host, port=args.port)
+        return
+
+    import tempfile
+
+    # Must be set before the app modules are imported: they read these at import time.
+    os.environ["WORLD_ECONOMICS_CACHE_DIR"] = tempfile.mkdtemp(prefix="we-api-cache-")
+    os.environ["ARTIFACT_PERSIST"] = "0"
+    os.environ["SERPER_API_KEY"] = "stub"
+    os.environ["FETCH_ALLOW_PRIVATE"] = "1"  # the stub pages are served from localhost
+
+    from .llms import register_llm
+    from .stubs import STUB_MODEL, StubLLM, StubSerperServer
+
+    os.environ["MODEL"] = STUB_MODEL
+    register_llm(STUB_MODEL, StubLLM(latency=args.stub_latency))
+    register_llm(STUB_MODEL, StubLLM(latency=args.stub_latency, stream=True), stream=True)
+    with StubSerperServer(latency=args.stub_latency) as serper:
+        os.environ["SERPER_BASE_URL"] = serper.base_url
+        uvicorn.run(create_app(), host=args.host, port=args.port)
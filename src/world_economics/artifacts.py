@@ -0,0 +1,74 @@
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", "runs")
+ARTIFACT_PERSIST = os.getenv("ARTIFACT_PERSIST", "1") == "1"
+
+
+class ArtifactStore:
+    """Run-scoped task outputs, held in memory and optionally written to disk in the background.
+
+    Each run gets its own id and directory (``<root>/<run_id>/<name>.md``), so
+    concurrent runs never share files. The ``max_runs`` most recent runs stay
+    in memory; older ones are read back from disk on demand.
+    """
+
+    def __init__(self, root: str = ARTIFACT_DIR, persist: bool = ARTIFACT_PERSIST, max_runs: int = 64):
+        self.root = root
+        self.persist = persist
+        self.max_runs = max_runs
+        self._runs: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artifact-writer")
+        self._pending: List[Future] = []
+
+    def new_run(self) -> str:
+        run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        with self._lock:
+            self._runs[run_id] = {}
+            while len(self._runs) > self.max_runs:
+                self._runs.popitem(last=False)
+        return run_id
+
+    def put(self, run_id: str, name: str, content: str) -> None:
+        with self._lock:
+            self._runs.setdefault(run_id, {})[name] = content
+            if self.persist:
+                self._pending = [f for f in self._pending if not f.done()]
+                self._pending.append(self._writer.submit(self._write, run_id, name, content))
+
+    def get(self, run_id: str, name: str) -> Optional[str]:
+        with self._lock:
+            content = self._runs.get(run_id, {}).get(name)
+        if content is None and os.path.exists(self.path(run_id, name)):
+            with open(self.path(run_id, name), "r") as f:
+                content = f.read()
+        return content
+
+    def outputs(self, run_id: str) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._runs.get(run_id, {}))
+
+    def path(self, run_id: str, name: str) -> str:
+        if not re.fullmatch(r"[\w-]+", run_id) or not re.fullmatch(r"[\w-]+", name):
+            raise ValueError(f"Invalid artifact reference: {run_id}/{name}")
+        return os.path.join(self.root, run_id, f"{name}.md")
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Wait for queued disk writes to finish."""
+        with self._lock:
+            pending = list(self._pending)
+        for future in pending:
+            future.result(timeout)
+
+    def _write(self, run_id: str, name: str, content: str) -> None:
+        path = self.path(run_id, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
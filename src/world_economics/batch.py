@@ -0,0 +1,205 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+BATCH_DIR = os.getenv("BATCH_DIR", "batch_results")
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", 4))
+
+CHECKPOINT = "checkpoint.jsonl"
+
+
+@dataclass
+class Question:
+    id: str
+    user_query: str
+    current_year: Optional[str] = None
+
+
+def question_id(user_query: str) -> str:
+    """Stable directory name for a question: a readable slug plus a content hash."""
+    slug = re.sub(r"[^a-z0-9]+", "-", user_query.lower()).strip("-")[:40].rstrip("-")
+    return f"{slug or 'question'}-{hashlib.sha1(user_query.encode()).hexdigest()[:8]}"
+
+
+def _question(record: Dict[str, Any]) -> Optional[Question]:
+    query = (record.get("user_query") or record.get("question") or "").strip()
+    if not query:
+        return None
+    raw_id = str(record.get("id") or "").strip()
+    qid = re.sub(r"[^\w-]+", "-", raw_id) if raw_id else question_id(query)
+    return Question(qid, query, str(record["current_year"]) if record.get("current_year") else None)
+
+
+def read_questions(path: str) -> List[Question]:
+    """Read questions from a CSV file (``question`` or ``user_query`` column) or JSON lines.
+
+    JSONL lines may be objects with the same fields or bare strings. ``id`` and
+    ``current_year`` are optional. Duplicate ids are kept once.
+    """
+    with open(path, newline="") as f:
+        if path.lower().endswith(".csv"):
+            records = list(csv.DictReader(f))
+        else:
+            records = []
+            for line in f:
+                if line.strip():
+                    value = json.loads(line)
+                    records.append(value if isinstance(value, dict) else {"user_query": str(value)})
+
+    questions: Dict[str, Question] = {}
+    for record in records:
+        question = _question(record)
+        if question is not None:
+            questions.setdefault(question.id, question)
+    return list(questions.values())
+
+
+def completed_ids(output_dir: str) -> Set[str]:
+    """Ids recorded as succeeded in the checkpoint; a torn last line from a crash is ignored."""
+    done: Set[str] = set()
+    path = os.path.join(output_dir, CHECKPOINT)
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "succeeded":
+                done.add(record["id"])
+    return done
+
+
+class BatchRunner:
+    """Runs report generation for many questions on a worker pool, checkpointing each result."""
+
+    def __init__(self, output_dir: str = BATCH_DIR, workers: int = BATCH_WORKERS, use_cache: bool = True):
+        self.output_dir = output_dir
+        self.workers = workers
+        self.use_cache = use_cache
+        self._lock = threading.Lock()
+
+    def run(self, questions: List[Question], resume: bool = True) -> Dict[str, Any]:
+        os.makedirs(self.output_dir, exist_ok=True)
+        done = completed_ids(self.output_dir) if resume else set()
+        pending = [q for q in questions if q.id not in done]
+        latencies: List[float] = []
+        failed: List[str] = []
+        cached = 0
+        interrupted = False
+
+        started = time.perf_counter()
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="batch")
+        futures = {pool.submit(self._run_one, q): q for q in pending}
+        try:
+            for future in as_completed(futures):
+                question = futures[future]
+                record = future.result()
+                if record["status"] == "succeeded":
+                    latencies.append(record["elapsed"])
+                    cached += record["cached"]
+                    print(f"[{len(latencies) + len(failed)}/{len(pending)}] {question.id} ({record['elapsed']:.1f}s)")
+                else:
+                    failed.append(question.id)
+                    print(f"[{len(latencies) + len(failed)}/{len(pending)}] {question.id} failed: {record['error']}")
+        except KeyboardInterrupt:
+            interrupted = True
+            print("Interrupted; finishing running questions. Run again to resume.")
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        wall = time.perf_counter() - started
+
+        from .benchmark import percentile
+
+        summary = {
+            "questions": len(questions),
+            "skipped": len(questions) - len(pending),
+            "succeeded": len(latencies),
+            "failed": len(failed),
+            "cached": cached,
+            "interrupted": interrupted,
+            "wall_s": wall,
+            "reports_per_min": len(latencies) / wall * 60 if wall else 0.0,
+            "mean_s": sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50_s": percentile(latencies, 50),
+            "p95_s": percentile(latencies, 95),
+            "failed_ids": failed,
+        }
+        with open(os.path.join(self.output_dir, "summary.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+    def _run_one(self, question: Question) -> Dict[str, Any]:
+        from .ratelimit import Priority, priority
+        from .runner import generate_report, get_artifacts
+
+        record: Dict[str, Any] = {"id": question.id, "user_query": question.user_query}
+        try:
+            # batch work yields provider quota to interactive chat and app reports
+            with priority(Priority.BATCH):
+                result = generate_report(question.user_query, question.current_year, use_cache=self.use_cache)
+            self._write_outputs(question, result.run_id, get_artifacts().outputs(result.run_id), result.report)
+            record.update(
+                status="succeeded", run_id=result.run_id, cached=result.cached, reused=result.reused, elapsed=result.elapsed
+            )
+        except Exception as e:
+            record.update(status="failed", error=str(e))
+        self._checkpoint(record)
+        return record
+
+    def _write_outputs(self, question: Question, run_id: str, outputs: Dict[str, str], report: str) -> None:
+        directory = os.path.join(self.output_dir, question.id)
+        os.makedirs(directory, exist_ok=True)
+        for name, content in {**outputs, "final_report": report}.items():
+            with open(os.path.join(directory, f"{name}.md"), "w") as f:
+                f.write(content)
+        with open(os.path.join(directory, "question.json"), "w") as f:
+            json.dump({"id": question.id, "user_query": question.user_query,
+                       "current_year": question.current_year, "run_id": run_id}, f, indent=2)
+
+    def _checkpoint(self, record: Dict[str, Any]) -> None:
+        with self._lock, open(os.path.join(self.output_dir, CHECKPOINT), "a") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    lines = [
+        f"questions  {summary['questions']} ({summary['skipped']} already done)",
+        f"succeeded  {summary['succeeded']} ({summary['cached']} from cache)",
+        f"failed     {summary['failed']}",
+        f"wall time  {summary['wall_s']:.1f}s",
+        f"throughput {summary['reports_per_min']:.2f} reports/min",
+        f"latency    mean {summary['mean_s']:.1f}s  p50 {summary['p50_s']:.1f}s  p95 {summary['p95_s']:.1f}s",
+    ]
+    if summary["failed_ids"]:
+        lines.append("failed ids " + ", ".join(summary["failed_ids"]))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate reports for every question in a JSONL or CSV file.")
+    parser.add_argument("input", help="JSONL or CSV file with a question/user_query field")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="reports generated concurrently")
+    parser.add_argument("--output-dir", default=BATCH_DIR, help="one sub-directory per question, plus checkpoint")
+    parser.add_argument("--no-resume", action="store_true", help="rerun questions already in the checkpoint")
+    parser.add_argument("--no-cache", action="store_true", help="don't serve reports from the report cache")
+    args = parser.parse_args(argv)
+
+    # Outputs go to the batch directory; don't also write a copy per run under runs/.
+    os.environ.setdefault("ARTIFACT_PERSIST", "0")
+
+    questions = read_questions(args.input)
+    runner = BatchRunner(args.output_dir, workers=args.workers, use_cache=not args.no_cache)
+    summary = runner.run(questions, resume=not args.no_resume)
+    print(format_summary(summary))
@@ -0,0 +1,216 @@
+import argparse
+import glob
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+BENCHMARK_DIR = os.getenv("BENCHMARK_DIR", "benchmark_results")
+
+QUESTION = "What is the impact of rising US interest rates on emerging economies?"
+CHAT_QUESTION = "How did inflation in Brazil respond to the rate changes?"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def measure(fn: Callable[[int], Any], requests: int, concurrency: int) -> Dict[str, float]:
+    """Call ``fn(i)`` for ``requests`` items on ``concurrency`` threads and summarize latency.
+
+    ``peak_alloc_mb`` is the peak of Python memory allocated while this call
+    ran (tracemalloc), so each concurrency level gets its own figure rather
+    than the process's high-water mark so far. Tracing slows allocation a
+    little, equally in every run being compared.
+    """
+    latencies: List[float] = []
+    errors: List[int] = []
+    lock = threading.Lock()
+
+    def timed(i: int) -> None:
+        started = time.perf_counter()
+        try:
+            fn(i)
+        except Exception:
+            with lock:
+                errors.append(i)
+        with lock:
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(timed, range(requests)))
+    wall = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    if not tracing:
+        tracemalloc.stop()
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": len(errors),
+        "wall_s": wall,
+        "throughput_rps": requests / wall if wall else 0.0,
+        "mean_ms": sum(latencies) / len(latencies) if latencies else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "peak_alloc_mb": (peak - baseline) / (1024 * 1024),
+    }
+
+
+def sample_report(sections: int = 20) -> str:
+    from .stubs import filler_text
+
+    parts = ["# Economic Report"]
+    for i in range(sections):
+        topic = ["Inflation in Brazil", "Capital flows", "Policy rates", "Trade balance"][i % 4]
+        parts.append(f"## {topic} {i}\n{filler_text(120)}")
+    return "\n\n".join(parts)
+
+
+def run_benchmark(
+    concurrency_levels: Iterable[int] = (1, 2, 4),
+    requests: int = 8,
+    llm_latency: float = 0.05,
+    llm_output_tokens: int = 200,
+    search_latency: float = 0.05,
+    chat: bool = True,
+    fanout: bool = True,
+) -> Dict[str, Any]:
+    """Benchmark the report pipeline (and chat flow) against the stub LLM and stub Serper server.
+
+    ``stub_ms_per_request`` is the model and search time the stubs simulated;
+    ``overhead_ms_per_request`` is latency beyond it. With research fan-out the
+    stub calls overlap, so the overhead figure is a lower bound.
+    """
+    # Must be set before the app modules are imported: they read these at import time.
+    os.environ["WORLD_ECONOMICS_CACHE_DIR"] = tempfile.mkdtemp(prefix="we-bench-cache-")
+    os.environ["ARTIFACT_PERSIST"] = "0"
+    os.environ["RESEARCH_FANOUT"] = "1" if fanout else "0"
+    os.environ["SERPER_API_KEY"] = "stub"
+    os.environ["FETCH_ALLOW_PRIVATE"] = "1"  # the stub pages are served from localhost
+
+    from .llms import register_llm
+    from .stubs import STUB_MODEL, StubLLM, StubSerperServer
+
+    os.environ["MODEL"] = STUB_MODEL
+    llm = StubLLM(latency=llm_latency, output_tokens=llm_output_tokens)
+    streaming = StubLLM(latency=llm_latency, output_tokens=llm_output_tokens, stream=True)
+    register_llm(STUB_MODEL, llm)
+    register_llm(STUB_MODEL, streaming, stream=True)
+
+    results: Dict[str, Any] = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "config": {
+            "concurrency_levels": list(concurrency_levels),
+            "requests": requests,
+            "llm_latency": llm_latency,
+            "llm_output_tokens": llm_output_tokens,
+            "search_latency": search_latency,
+            "fanout": fanout,
+        },
+        "pipeline": [],
+        "chat": [],
+    }
+
+    with StubSerperServer(latency=search_latency) as serper:
+        os.environ["SERPER_BASE_URL"] = serper.base_url
+        from .chat import answer_question
+        from .runner import generate_report
+
+        def stub_seconds() -> float:
+            return llm.simulated_seconds + streaming.simulated_seconds + serper.simulated_seconds
+
+        report = sample_report()
+        flows = [("pipeline", lambda c, i: generate_report(f"{QUESTION} #{c}-{i}", use_cache=False))]
+        if chat:
+            flows.append(("chat", lambda c, i: answer_question(report, f"{CHAT_QUESTION} #{c}-{i}")))
+
+        for name, flow in flows:
+            for concurrency in concurrency_levels:
+                before = stub_seconds()
+                row = measure(lambda i: flow(concurrency, i), requests, concurrency)
+                row["stub_ms_per_request"] = (stub_seconds() - before) / requests * 1000
+                row["overhead_ms_per_request"] = row["mean_ms"] - row["stub_ms_per_request"]
+                results[name].append(row)
+    return results
+
+
+def save_results(results: Dict[str, Any], directory: str = BENCHMARK_DIR) -> str:
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"benchmark-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def latest_results(directory: str = BENCHMARK_DIR) -> Optional[str]:
+    paths = sorted(glob.glob(os.path.join(directory, "benchmark-*.json")))
+    return paths[-1] if paths else None
+
+
+def format_results(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """Summary table; with a baseline, each metric also shows its relative change."""
+    columns = ["throughput_rps", "p50_ms", "p95_ms", "overhead_ms_per_request", "peak_alloc_mb"]
+    lines = []
+    for flow in ("pipeline", "chat"):
+        if not results.get(flow):
+            continue
+        lines.append(f"\n{flow}")
+        lines.append(f"{'conc':>5} " + " ".join(f"{c:>26}" for c in columns))
+        previous = {row["concurrency"]: row for row in (baseline or {}).get(flow, [])}
+        for row in results[flow]:
+            cells = []
+            for column in columns:
+                cell = f"{row[column]:.1f}"
+                old = previous.get(row["concurrency"], {}).get(column)
+                if old:
+                    cell += f" ({(row[column] - old) / abs(old):+.0%})"
+                cells.append(f"{cell:>26}")
+            lines.append(f"{row['concurrency']:>5} " + " ".join(cells))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Offline benchmark of the report pipeline and chat flow.")
+    parser.add_argument("--concurrency", default="1,2,4", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=8, help="requests per concurrency level")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="stub model latency per call (s)")
+    parser.add_argument("--llm-tokens", type=int, default=200, help="stub model output size (words)")
+    parser.add_argument("--search-latency", type=float, default=0.05, help="stub Serper latency per query (s)")
+    parser.add_argument("--no-chat", action="store_true", help="skip the chat flow")
+    parser.add_argument("--no-fanout", action="store_true", help="run research as a single task")
+    parser.add_argument("--output-dir", default=BENCHMARK_DIR)
+    parser.add_argument("--compare", help="results file to compare against (default: latest in output dir)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(
+        concurrency_levels=[int(c) for c in args.concurrency.split(",")],
+        requests=args.requests,
+        llm_latency=args.llm_latency,
+        llm_output_tokens=args.llm_tokens,
+        search_latency=args.search_latency,
+        chat=not args.no_chat,
+        fanout=not args.no_fanout,
+    )
+    baseline_path = args.compare or latest_results(args.output_dir)
+    baseline = None
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    path = save_results(results, args.output_dir)
+    print(format_results(results, baseline))
+    print(f"\nSaved {path}" + (f" (compared with {baseline_path})" if baseline else ""))
@@ -0,0 +1,145 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+CACHE_DIR = os.getenv("WORLD_ECONOMICS_CACHE_DIR", ".world_economics_cache")
+
+# a word, number or symbol run; inner punctuation joins its parts, outer punctuation is left out
+_WORD = re.compile(r"[\w%$€£¥]+(?:[.,'’&/-][\w%$€£¥]+)*")
+_FILLER_WORDS = {"a", "an", "the", "of", "on", "in", "for", "to", "and", "is", "are", "what", "how", "please"}
+
+
+def cache_path(filename: str) -> str:
+    """Return a path inside the shared cache directory, creating it if needed."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, filename)
+
+
+def query_tokens(query: str) -> List[str]:
+    """Lower-cased content tokens of a query, in their original order."""
+    text = unicodedata.normalize("NFKC", query or "").lower()
+    tokens = (t.strip(".") for t in re.findall(r"[\w%$.]+", text))
+    return [t for t in tokens if t and t not in _FILLER_WORDS]
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a query: case, whitespace and punctuation normalized, word order kept.
+
+    Punctuation inside a word or number ("U.S", "2.5%", "year-on-year") stays;
+    around words ("inflation?", "(Brazil)") it is dropped. Reordering changes
+    meaning ("US sanctions on Russia" vs "Russia sanctions on US"), so those
+    queries must not share a cache key.
+    """
+    return " ".join(_WORD.findall(unicodedata.normalize("NFKC", query or "").lower()))
+
+
+class TTLCache:
+    """Two-tier key/value cache: an in-process LRU hot tier in front of a SQLite store.
+
+    Entries expire after ``ttl`` seconds; the disk tier is trimmed to
+    ``max_entries`` by least-recent access. Values must be JSON serializable.
+    """
+
+    def __init__(self, path: str, ttl: float = 6 * 3600, max_entries: int = 5000, memory_entries: int = 256):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is not None:
+                created_at, value = hit
+                if now - created_at < self.ttl:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] >= self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self._conn.commit()
+                self._stats["misses"] += 1
+                return None
+
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            value = json.loads(row[0])
+            self._remember(key, row[1], value)
+            self._stats["disk_hits"] += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            self._remember(key, now, value)
+            self._stats["writes"] += 1
+            self._evict(now)
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_size"] = len(self._memory)
+            stats["disk_size"] = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def _remember(self, key: str, created_at: float, value: Any) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now: float) -> None:
+        expired = self._conn.execute("DELETE FROM entries WHERE created_at <= ?", (now - self.ttl,)).rowcount
+        count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+        self._stats["evictions"] += max(expired, 0) + max(overflow, 0)
@@ -0,0 +1,78 @@
+from typing import Optional
+
+from crewai import Agent, Crew, Process, Task
+
+from .chat_memory import ChatMemory
+from .factory import crew_factory
+from .knowledge import get_knowledge_index
+from .llms import get_llm
+from .metrics import install_crewai_instrumentation, span
+from .ratelimit import Priority, priority
+from .retrieval import CHAT_CONTEXT_TOKENS, CHAT_TOP_K, index_for
+from .routing import model_for
+from .tokens import estimate_tokens
+from .tools.knowledge_tool import KnowledgeLookupTool
+from .tools.serper_tool import serper_tool
+
+
+def answer_question(
+    report: str,
+    question: str,
+    top_k: int = CHAT_TOP_K,
+    token_budget: int = CHAT_CONTEXT_TOKENS,
+    memory: Optional[ChatMemory] = None,
+) -> str:
+    """Answer a follow-up question using only the report sections relevant to it.
+
+    With a ``memory``, the conversation so far (within its token budget) goes
+    into the prompt, and the previous question also steers which report
+    sections are retrieved, so short follow-ups like "and for India?" work.
+    """
+    install_crewai_instrumentation()
+    with span("run", "chat") as attrs, priority(Priority.INTERACTIVE):
+        history = memory.context() if memory is not None else ""
+        query = f"{memory.last_question()} {question}" if memory is not None else question
+        context = index_for(report).context(query, k=top_k, token_budget=token_budget)
+        attrs["history_tokens"] = estimate_tokens(history)
+        with crew_factory.checkout("chat_agent", build_chat_agent) as chat_agent:
+            return _run_chat_task(chat_agent, context, question, history)
+
+
+def build_chat_agent() -> Agent:
+    return Agent(
+        role="Economic Report Assistant",
+        goal="Answer follow-up questions based on the economic report and provide current economic insights.",
+        backstory="You are an expert economic analyst trained to provide detailed, accurate responses based on economic reports and real-time data.",
+        tools=[serper_tool, KnowledgeLookupTool()] if get_knowledge_index() else [serper_tool],
+        llm=get_llm(model_for("chat")),
+        verbose=True
+    )
+
+
+def _run_chat_task(chat_agent: Agent, context: str, question: str, history: str = "") -> str:
+    conversation = f"""
+The conversation with the user so far (use it to resolve references to earlier
+questions, and don't search again for facts already established there):
+
+{history}
+""" if history else ""
+    chat_task = Task(
+        description=f"""Based on these sections of the economic report:
+
+{context}
+{conversation}
+Answer the user's question: {question}
+
+If the question can be answered from the report context, provide a detailed response.
+If additional current information is needed, use the search tool to find up-to-date data.
+Provide a comprehensive and informative answer.""",
+        expected_output="A detailed, clear, and informative response that addresses the user's question with relevant economic insights.",
+        agent=chat_agent
+    )
+
+    chat_crew = Crew(
+        agents=[chat_agent],
+        tasks=[chat_task],
+        process=Process.sequential
+    )
+    return chat_crew.kickoff().raw
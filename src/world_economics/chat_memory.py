@@ -0,0 +1,113 @@
+import os
+import re
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+from .cache import query_tokens
+from .report_cache import jaccard
+from .tokens import estimate_tokens, truncate_to_tokens
+
+CHAT_MEMORY_TURNS = int(os.getenv("CHAT_MEMORY_TURNS", 4))
+CHAT_HISTORY_TOKENS = int(os.getenv("CHAT_HISTORY_TOKENS", 600))
+CHAT_SUMMARY_TOKENS = int(os.getenv("CHAT_SUMMARY_TOKENS", 200))
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def _gist(text: str, tokens: int = 40) -> str:
+    """First sentence of a message (headings skipped), as one line of at most ~``tokens`` tokens."""
+    body = [line for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+    text = " ".join(re.sub(r"[*_>`|]+", " ", " ".join(body or [text])).split())
+    first = _SENTENCE_END.split(text, 1)[0]
+    return truncate_to_tokens(first, tokens)
+
+
+class ChatMemory:
+    """Conversation state for the assistant with a fixed upper bound on size.
+
+    The last ``turns`` question/answer pairs are kept verbatim. Older messages
+    are folded into a rolling summary, one short line per message. Lines that
+    repeat an earlier point are skipped, and the oldest lines are dropped once
+    the summary is over ``summary_tokens``. Neither memory nor the prompt
+    block from ``context`` grows with the length of the session.
+    """
+
+    def __init__(self, turns: int = CHAT_MEMORY_TURNS, summary_tokens: int = CHAT_SUMMARY_TOKENS):
+        self.summary_tokens = summary_tokens
+        self._recent: Deque[Tuple[str, str]] = deque(maxlen=max(1, turns) * 2)
+        self._summary: Deque[str] = deque()
+        self._summary_size = 0
+        self.total = 0
+
+    def add(self, role: str, text: str) -> None:
+        if len(self._recent) == self._recent.maxlen:
+            self._fold(*self._recent[0])
+        self._recent.append((role, text))
+        self.total += 1
+
+    def _fold(self, role: str, text: str) -> None:
+        line = f"{'Asked' if role == 'user' else 'Answered'}: {_gist(text)}"
+        terms = frozenset(query_tokens(line))
+        if any(jaccard(terms, frozenset(query_tokens(other))) >= 0.8 for other in self._summary):
+            return
+        self._summary.append(line)
+        self._summary_size += estimate_tokens(line)
+        while self._summary_size > self.summary_tokens and len(self._summary) > 1:
+            self._summary_size -= estimate_tokens(self._summary.popleft())
+
+    def messages(self) -> List[Tuple[str, str]]:
+        """The recent messages, oldest first, as ``(role, text)`` pairs."""
+        return list(self._recent)
+
+    @property
+    def summarized(self) -> int:
+        """Messages no longer kept verbatim."""
+        return self.total - len(self._recent)
+
+    def summary(self) -> str:
+        """The rolling summary of older messages as markdown bullets."""
+        return "\n".join(f"- {line}" for line in self._summary)
+
+    def last_question(self) -> str:
+        return next((text for role, text in reversed(self._recent) if role == "user"), "")
+
+    def context(self, budget: int = CHAT_HISTORY_TOKENS) -> str:
+        """The conversation so far for the chat prompt, within about ``budget`` tokens.
+
+        Newer messages are added first, so when space runs out the oldest ones are left out.
+        Long answers are shortened because the report is already in the prompt.
+        """
+        summary = self.summary()
+        remaining = budget - estimate_tokens(summary)
+        recent: List[str] = []
+        for role, text in reversed(self._recent):
+            line = f"{'User' if role == 'user' else 'Assistant'}: {truncate_to_tokens(text, 60 if role == 'user' else 150)}"
+            if estimate_tokens(line) > remaining:
+                break
+            recent.append(line)
+            remaining -= estimate_tokens(line)
+        parts = []
+        if summary:
+            parts.append(f"Earlier in this conversation:\n{summary}")
+        if recent:
+            parts.append("Recent messages:\n" + "\n".join(reversed(recent)))
+        return "\n\n".join(parts)
+
+    def export(self) -> str:
+        """Markdown transcript: the summary of older messages, then the recent ones in full."""
+        parts = []
+        if self._summary:
+            parts.append(f"_Summary of {self.summarized} earlier messages:_\n{self.summary()}")
+        parts += [f"**{role.title()}:** {text}" for role, text in self._recent]
+        return "\n\n".join(parts)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "messages": self.total,
+            "kept": len(self._recent),
+            "summary_lines": len(self._summary),
+            "context_tokens": estimate_tokens(self.context()),
+        }
+
+    def __len__(self) -> int:
+        return self.total
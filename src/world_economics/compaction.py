@@ -0,0 +1,154 @@
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .cache import query_tokens
+from .report_cache import jaccard
+from .tokens import estimate_tokens
+
+CONTEXT_COMPACTION = os.getenv("CONTEXT_COMPACTION", "1") == "1"
+
+_URL = re.compile(r"https?://[^\s<>\"')\]]+")
+_MD_LINK = re.compile(r"\[([^\]]+)\]\((https?://[^)\s]+)\)")
+_HEADING = re.compile(r"^\s*#{1,6}\s+")
+_BULLET = re.compile(r"^\s*(?:[-*+•]|\d+[.)])\s+")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+_NUMBER = re.compile(r"\d")
+_BOILERPLATE = re.compile(
+    r"^\s*(?:thought:.*|final answer:\s*|i now (?:can give|know) .*|"
+    r"(?:i hope|hope) this (?:helps|report).*|let me know if .*|feel free to .*|"
+    r"(?:here is|here's|below is) (?:the|a|my) [^.:]*[:.]\s*|"
+    r"in (?:summary|conclusion),?\s*|overall,\s*|-{3,}|\*{3,}|_{3,})$",
+    re.I,
+)
+_TRACKING = re.compile(r"^(?:utm_\w+|gclid|fbclid|ref|ref_src|mc_cid|mc_eid)$", re.I)
+
+
+@dataclass
+class Compaction:
+    text: str
+    tokens_before: int
+    tokens_after: int
+    duplicates: int = 0
+    dropped: int = 0
+
+
+@dataclass
+class _Unit:
+    heading: bool
+    text: str
+    terms: FrozenSet[str]
+    tokens: int
+
+
+def canonical_url(url: str) -> str:
+    """URL without fragment, tracking parameters or trailing punctuation."""
+    parts = urlsplit(url.rstrip(".,;:"))
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if not _TRACKING.match(k)])
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path.rstrip("/") or "/", query, ""))
+
+
+def _cite(text: str, sources: Dict[str, int]) -> str:
+    """Replace links with numbered references; each URL is then spelled out once, in the source list."""
+    def ref(url: str) -> str:
+        return f"[{sources.setdefault(canonical_url(url), len(sources) + 1)}]"
+
+    text = _MD_LINK.sub(lambda m: f"{m.group(1)} {ref(m.group(2))}", text)
+    return _URL.sub(lambda m: ref(m.group()), text)
+
+
+def _units(text: str, sources: Dict[str, int]) -> List[_Unit]:
+    """Headings, bullets and sentences with boilerplate removed and links turned into references."""
+    units: List[_Unit] = []
+    for line in text.splitlines():
+        if not line.strip() or _BOILERPLATE.match(line):
+            continue
+        line = re.sub(r"^\s*final answer:\s*", "", line, flags=re.I)
+        if _HEADING.match(line):
+            units.append(_Unit(True, line.strip(), frozenset(), estimate_tokens(line)))
+            continue
+        bullet = _BULLET.match(line)
+        prefix = "- " if bullet else ""
+        body = _cite(line[bullet.end():] if bullet else line.strip(), sources)
+        pieces = [body] if bullet else _SENTENCE.split(body)
+        for piece in pieces:
+            piece = re.sub(r"\s+", " ", piece).strip()
+            if piece and not _BOILERPLATE.match(piece):
+                units.append(_Unit(False, prefix + piece, frozenset(query_tokens(piece)), estimate_tokens(piece) + 1))
+    return units
+
+
+def _dedupe(units: List[_Unit], threshold: float) -> Tuple[List[_Unit], int]:
+    kept: List[_Unit] = []
+    duplicates = 0
+    for unit in units:
+        if not unit.heading and unit.terms and any(
+            jaccard(unit.terms, other.terms) >= threshold for other in kept if not other.heading
+        ):
+            duplicates += 1
+            continue
+        kept.append(unit)
+    return kept, duplicates
+
+
+def _select(units: List[_Unit], budget: int, query: str) -> List[_Unit]:
+    """Extractive summary: the most central, query-relevant, fact-bearing units that fit ``budget``, in original order."""
+    document = Counter(term for unit in units for term in unit.terms)
+    focus = set(query_tokens(query))
+    scores = {}
+    for i, unit in enumerate(units):
+        if unit.heading or not unit.terms:
+            continue
+        centrality = sum(document[t] for t in unit.terms) / len(unit.terms)
+        relevance = len(unit.terms & focus)
+        facts = 1.0 if _NUMBER.search(unit.text) else 0.0
+        scores[i] = centrality + 2.0 * relevance + facts + 0.5 / (1 + i)  # slight preference for earlier points
+
+    chosen, used = set(), 0
+    for i in sorted(scores, key=scores.get, reverse=True):
+        if used + units[i].tokens <= budget:
+            chosen.add(i)
+            used += units[i].tokens
+    # keep a heading only if something under it survived
+    selected: List[_Unit] = []
+    pending: Optional[_Unit] = None
+    for i, unit in enumerate(units):
+        if unit.heading:
+            pending = unit
+        elif i in chosen:
+            if pending is not None:
+                selected.append(pending)
+                pending = None
+            selected.append(unit)
+    return selected
+
+
+def compact(text: str, budget: int, query: str = "", dedupe_threshold: float = 0.8, summarize: bool = True) -> Compaction:
+    """Shrink a task output for use as another task's context.
+
+    Boilerplate is stripped, links become numbered references with one
+    source list, near-duplicate facts are dropped, and if the result is still
+    over ``budget`` tokens an extractive summary is taken.
+    """
+    before = estimate_tokens(text)
+    sources: Dict[str, int] = {}
+    units, duplicates = _dedupe(_units(text, sources), dedupe_threshold)
+    total = sum(u.tokens for u in units)
+    source_tokens = sum(estimate_tokens(url) + 2 for url in sources)
+
+    dropped = 0
+    if summarize and total + source_tokens > budget:
+        selected = _select(units, max(budget - source_tokens, budget // 2), query)
+        dropped = sum(1 for u in units if not u.heading) - sum(1 for u in selected if not u.heading)
+        units = selected
+
+    body = "\n".join(u.text for u in units)
+    cited = {int(n) for n in re.findall(r"\[(\d+)\]", body)}
+    references = [f"[{n}] {url}" for url, n in sources.items() if n in cited]
+    compacted = body + ("\n\nSources:\n" + "\n".join(references) if references else "")
+    if estimate_tokens(compacted) >= before:
+        return Compaction(text, before, before)
+    return Compaction(compacted, before, estimate_tokens(compacted), duplicates, dropped)
@@ -1,8 +1,17 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
+from crewai.tools import BaseTool
+from .indicators import get_indicator_store
+from .knowledge import get_knowledge_index
+from .llms import get_llm
+from .routing import model_for
+from .tools.analytics_tool import EconomicAnalyticsTool
+from .tools.indicator_tool import IndicatorQueryTool
+from .tools.knowledge_tool import KnowledgeLookupTool
+from .tools.page_fetch_tool import PageFetchTool
 from .tools.serper_tool import serper_tool
-from typing import List
+from typing import Dict, List, Optional
 
 
 @CrewBase
@@ -12,10 +21,36 @@ class WorldEconomicsCrew():
     agents: List[BaseAgent]
     tasks: List[Task]
 
+    # CLI runs write each task's output to a fixed file in the working
+    # directory; the app turns this off and collects outputs per run instead.
+    write_output_files: bool = True
+
+    # Token budget for each task's output when later tasks receive it as
+    # context; staged runs (pipeline.run_pipeline) compact outputs to fit.
+    context_budgets: Dict[str, int] = {
+        "user_analysis_task": 300,
+        "research_task": 1500,
+        "analysis_task": 2000,
+    }
+
+    def _output_file(self, filename: str) -> Optional[str]:
+        return filename if self.write_output_files else None
+
+    def _researcher_tools(self) -> List[BaseTool]:
+        # local indicators only once a dataset has been ingested (see `ingest_indicators`)
+        web = [serper_tool, PageFetchTool()]
+        return [IndicatorQueryTool(), *web] if get_indicator_store() else web
+
+    def _knowledge_tools(self) -> List[BaseTool]:
+        # the knowledge/ index is refreshed incrementally, so this is cheap on every crew build
+        return [KnowledgeLookupTool()] if get_knowledge_index() else []
+
     @agent
     def user_analyst(self) -> Agent:
         return Agent(
             config=self.agents_config['user_analyst'],
+            tools=self._knowledge_tools(),
+            llm=get_llm(model_for('user_analyst')),
             verbose=True
         )
 
@@ -23,7 +58,8 @@ class WorldEconomicsCrew():
     def data_researcher(self) -> Agent:
         return Agent(
             config=self.agents_config['data_researcher'],
-            tools=[serper_tool],
+            tools=self._researcher_tools(),
+            llm=get_llm(model_for('data_researcher')),
             verbose=True
         )
 
@@ -31,6 +67,8 @@ class WorldEconomicsCrew():
     def economic_analyst(self) -> Agent:
         return Agent(
             config=self.agents_config['economic_analyst'],
+            tools=[EconomicAnalyticsTool()],
+            llm=get_llm(model_for('economic_analyst')),
             verbose=True
         )
 
@@ -38,6 +76,8 @@ class WorldEconomicsCrew():
     def response_writer(self) -> Agent:
         return Agent(
             config=self.agents_config['response_writer'],
+            tools=self._knowledge_tools(),
+            llm=get_llm(model_for('response_writer'), stream=True),
             verbose=True
         )
 
@@ -46,7 +86,7 @@ class WorldEconomicsCrew():
     def user_analysis_task(self) -> Task:
         return Task(
             config=self.tasks_config['user_analysis_task'],
-            output_file='user_analysis_report.md'
+            output_file=self._output_file('user_analysis_report.md')
             
         )
 
@@ -55,7 +95,7 @@ class WorldEconomicsCrew():
         return Task(
             config=self.tasks_config['research_task'],
             context=[self.user_analysis_task()],
-            output_file='research_task_report.md'
+            output_file=self._output_file('research_task_report.md')
         )
 
     @task
@@ -63,7 +103,7 @@ class WorldEconomicsCrew():
         return Task(
             config=self.tasks_config['analysis_task'],
             context=[self.research_task()],
-            output_file="analysis_task_report.md"
+            output_file=self._output_file("analysis_task_report.md")
         )
 
     @task
@@ -71,9 +111,23 @@ class WorldEconomicsCrew():
         return Task(
             config=self.tasks_config['reporting_task'],
             context=[self.user_analysis_task(),self.analysis_task()],
-            output_file='final_report.md'
+            output_file=self._output_file('final_report.md')
         )
 
+    def research_subtask(self, focus: str) -> Task:
+        """research_task narrowed to one region/topic, with its own researcher so sub-tasks can run concurrently."""
+        config = {k: v for k, v in self.tasks_config['research_task'].items() if k not in ('agent', 'context')}
+        config['description'] = f"{config['description']}\nFocus this research on: {focus}\n"
+        return Task(
+            config=config,
+            name=f"research_task:{focus}",
+            agent=Agent(
+                config=self.agents_config['data_researcher'],
+                tools=self._researcher_tools(),
+                llm=get_llm(model_for('data_researcher')),
+                verbose=True
+            )
+        )
 
     @crew
     def crew(self) -> Crew:
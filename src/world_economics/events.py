@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+TASK_STARTED = "task_started"
+TASK_COMPLETED = "task_completed"
+TASK_FAILED = "task_failed"
+TOOL_STARTED = "tool_started"
+TOOL_FINISHED = "tool_finished"
+TOKEN = "token"
+STAGE = "stage"
+
+
+@dataclass
+class Event:
+    type: str
+    task: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+
+class EventStream:
+    """Append-only, thread-safe event log for one run, readable while the run is in progress."""
+
+    def __init__(self):
+        self._events: List[Event] = []
+        self._text: Dict[str, List[str]] = defaultdict(list)
+        self._cond = threading.Condition()
+        self.closed = False
+
+    def emit(self, type: str, task: Optional[str] = None, **data: Any) -> None:
+        with self._cond:
+            self._events.append(Event(type, task, data))
+            if type == TOKEN and task:
+                self._text[task].append(data.get("text", ""))
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def since(self, index: int = 0) -> List[Event]:
+        with self._cond:
+            return self._events[index:]
+
+    def wait(self, index: int, timeout: Optional[float] = None) -> List[Event]:
+        """Block until there are events past ``index`` or the stream closes."""
+        with self._cond:
+            self._cond.wait_for(lambda: len(self._events) > index or self.closed, timeout)
+            return self._events[index:]
+
+    def text(self, task: str) -> str:
+        """Token deltas streamed so far for ``task``."""
+        with self._cond:
+            return "".join(self._text.get(task, ()))
+
+
+_current_stream: ContextVar[Optional[EventStream]] = ContextVar("event_stream", default=None)
+_current_task: ContextVar[Optional[str]] = ContextVar("event_task", default=None)
+
+
+@contextmanager
+def bind_stream(stream: EventStream) -> Iterator[EventStream]:
+    """Route events emitted in this context (and contexts copied from it) to ``stream``."""
+    token = _current_stream.set(stream)
+    try:
+        yield stream
+    finally:
+        _current_stream.reset(token)
+
+
+def current_stream() -> Optional[EventStream]:
+    return _current_stream.get()
+
+
+def emit(type: str, task: Optional[str] = None, **data: Any) -> None:
+    stream = _current_stream.get()
+    if stream is not None:
+        stream.emit(type, task or _current_task.get(), **data)
+
+
+_listeners_installed = False
+_install_lock = threading.Lock()
+
+
+def install_crewai_listeners() -> None:
+    """Forward crewai task, tool and LLM-stream events to the bound EventStream."""
+    global _listeners_installed
+    with _install_lock:
+        if _listeners_installed:
+            return
+        from crewai.utilities.events import (
+            LLMStreamChunkEvent,
+            TaskCompletedEvent,
+            TaskFailedEvent,
+            TaskStartedEvent,
+            ToolUsageFinishedEvent,
+            ToolUsageStartedEvent,
+            crewai_event_bus,
+        )
+
+        def task_name(source: Any, event: Any) -> Optional[str]:
+            task = getattr(event, "task", None) or source
+            return getattr(event, "task_name", None) or getattr(task, "name", None)
+
+        @crewai_event_bus.on(TaskStartedEvent)
+        def on_task_started(source, event):
+            name = task_name(source, event)
+            _current_task.set(name)
+            emit(TASK_STARTED, name)
+
+        @crewai_event_bus.on(TaskCompletedEvent)
+        def on_task_completed(source, event):
+            output = getattr(event, "output", None)
+            emit(TASK_COMPLETED, task_name(source, event), output=getattr(output, "raw", ""))
+
+        @crewai_event_bus.on(TaskFailedEvent)
+        def on_task_failed(source, event):
+            emit(TASK_FAILED, task_name(source, event), error=str(getattr(event, "error", "")))
+
+        @crewai_event_bus.on(ToolUsageStartedEvent)
+        def on_tool_started(source, event):
+            emit(TOOL_STARTED, tool=event.tool_name, args=str(getattr(event, "tool_args", "")))
+
+        @crewai_event_bus.on(ToolUsageFinishedEvent)
+        def on_tool_finished(source, event):
+            emit(TOOL_FINISHED, tool=event.tool_name, from_cache=getattr(event, "from_cache", False))
+
+        @crewai_event_bus.on(LLMStreamChunkEvent)
+        def on_llm_chunk(source, event):
+            emit(TOKEN, text=event.chunk)
+
+        _listeners_installed = True
@@ -0,0 +1,101 @@
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from .routing import model_routes
+
+if TYPE_CHECKING:
+    from .crew import WorldEconomicsCrew
+
+T = TypeVar("T")
+
+# Per-execution fields crewai sets on a Task; cleared when a pooled crew is handed out again.
+_TASK_RUN_STATE = {"output": None, "used_tools": 0, "tools_errors": 0, "delegations": 0, "retry_count": 0}
+
+
+def build_report_crew() -> "WorldEconomicsCrew":
+    from .crew import WorldEconomicsCrew
+
+    crew_base = WorldEconomicsCrew()
+    crew_base.write_output_files = False
+    return crew_base
+
+
+def reset_report_crew(crew_base: "WorldEconomicsCrew") -> None:
+    """Give a reused crew fresh per-run task state."""
+    for make_task in (
+        crew_base.user_analysis_task,
+        crew_base.research_task,
+        crew_base.analysis_task,
+        crew_base.reporting_task,
+    ):
+        task = make_task()
+        for attr, value in _TASK_RUN_STATE.items():
+            if hasattr(task, attr):
+                setattr(task, attr, value)
+        if hasattr(task, "processed_by_agents"):
+            task.processed_by_agents = set()
+
+
+class CrewFactory:
+    """Process-wide pool of constructed crews and agents.
+
+    Objects are built once (configs parsed, agents and LLM clients created),
+    checked out by one run at a time, and returned for reuse. Pools are keyed
+    by kind and per-agent model assignment so a model change in settings gets
+    fresh objects.
+    Setup time per checkout is recorded and exposed via ``stats()``.
+    """
+
+    def __init__(self, max_idle: int = int(os.getenv("CREW_POOL_SIZE", 4))):
+        self.max_idle = max_idle
+        self._idle: Dict[Tuple[str, Tuple[Optional[str], ...]], List[Any]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"built": 0, "reused": 0, "setup_ms_total": 0.0, "setup_ms_last": 0.0}
+        )
+
+    @contextmanager
+    def checkout(self, kind: str, build: Callable[[], T], reset: Optional[Callable[[T], None]] = None) -> Iterator[T]:
+        started = time.perf_counter()
+        key = (kind, model_routes())
+        with self._lock:
+            obj = self._idle[key].pop() if self._idle[key] else None
+        reused = obj is not None
+        if obj is None:
+            obj = build()
+        if reset is not None:
+            reset(obj)
+        self._record(kind, reused, (time.perf_counter() - started) * 1000)
+        try:
+            yield obj
+        finally:
+            with self._lock:
+                if len(self._idle[key]) < self.max_idle:
+                    self._idle[key].append(obj)
+
+    @contextmanager
+    def report_crew(self) -> Iterator["WorldEconomicsCrew"]:
+        with self.checkout("report_crew", build_report_crew, reset_report_crew) as crew_base:
+            yield crew_base
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            stats = {}
+            for kind, s in self._stats.items():
+                checkouts = s["built"] + s["reused"]
+                stats[kind] = dict(s, setup_ms_avg=s["setup_ms_total"] / checkouts if checkouts else 0.0)
+            return stats
+
+    def _record(self, kind: str, reused: bool, setup_ms: float) -> None:
+        with self._lock:
+            s = self._stats[kind]
+            s["reused" if reused else "built"] += 1
+            s["setup_ms_total"] += setup_ms
+            s["setup_ms_last"] = setup_ms
+
+
+crew_factory = CrewFactory()
@@ -0,0 +1,106 @@
+import contextvars
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+from .cache import normalize_query
+
+FANOUT_WORKERS = int(os.getenv("RESEARCH_FANOUT_WORKERS", 4))
+FANOUT_MAX_SUBQUERIES = int(os.getenv("RESEARCH_FANOUT_MAX", 6))
+
+_LABEL = re.compile(r"^[\s\-*#>\d.]*\**\s*([A-Za-z ()/]+?)\s*\**\s*:\s*\**\s*(.*)$")
+_HEADING = re.compile(r"^\s*#+\s*\**\s*([A-Za-z ()/]+?)\s*\**\s*()$")
+_FIELD = re.compile(r"categor|classif|topic|theme|region|countr|entit|intent|data need", re.I)
+_BULLET = re.compile(r"^\s*(?:[-*+•]|\d+[.)])\s+")
+_URL = re.compile(r"https?://[^\s)\]>]+")
+_SPLIT = re.compile(r",|;|/|\band\b")
+_EMPTY = {"", "n/a", "na", "none", "not specified", "unspecified", "-"}
+
+
+def _clean(text: str) -> str:
+    return re.sub(r"[*_`#]+", "", text.split(":")[0]).strip(" .:-\t")
+
+
+def _values(text: str) -> List[str]:
+    return _SPLIT.split(re.sub(r"\([^)]*\)", "", text))
+
+
+def _section_values(intent: str, label: re.Pattern) -> List[str]:
+    """Values listed for a labelled field, either inline or as bullets below it."""
+    values: List[str] = []
+    collecting = False
+    for line in intent.splitlines():
+        match = _LABEL.match(line) or _HEADING.match(line)
+        if match and _FIELD.search(match.group(1)):
+            collecting = bool(label.search(match.group(1)))
+            if collecting:
+                values.extend(_values(match.group(2)))
+            continue
+        if collecting and _BULLET.match(line):
+            values.extend(_values(_BULLET.sub("", line)))
+        elif collecting and line.strip():
+            collecting = False
+
+    seen, unique = set(), []
+    for value in (_clean(v) for v in values):
+        if value.lower() not in _EMPTY and value.lower() not in seen:
+            seen.add(value.lower())
+            unique.append(value)
+    return unique
+
+
+def plan_subqueries(intent: str, max_subqueries: int = FANOUT_MAX_SUBQUERIES) -> List[str]:
+    """Split the user-analysis summary into independent region/topic research focuses."""
+    regions = _section_values(intent, re.compile(r"region|countr", re.I))
+    topics = _section_values(intent, re.compile(r"topic|theme", re.I))
+
+    if len(regions) > 1:
+        suffix = f" — {', '.join(topics[:3])}" if topics else ""
+        focuses = [f"{region}{suffix}" for region in regions]
+    elif len(topics) > 1:
+        suffix = f" ({regions[0]})" if regions else ""
+        focuses = [f"{topic}{suffix}" for topic in topics]
+    else:
+        focuses = []
+    return focuses[:max_subqueries]
+
+
+def merge_findings(results: List[Tuple[str, str]]) -> str:
+    """Merge per-focus research outputs into one list, dropping repeated facts."""
+    seen_text, seen_source = set(), set()
+    sections = []
+    for focus, raw in results:
+        items = []
+        for line in raw.splitlines():
+            item = _BULLET.sub("", line).strip()
+            if not item or item.startswith("#"):
+                continue
+            key = normalize_query(item)
+            url = _URL.search(item)
+            source_key = (url.group(0).rstrip(".,"), " ".join(key.split()[:8])) if url else None
+            if key in seen_text or (source_key and source_key in seen_source):
+                continue
+            seen_text.add(key)
+            if source_key:
+                seen_source.add(source_key)
+            items.append(f"- {item}")
+        if items:
+            sections.append(f"### {focus}\n" + "\n".join(items))
+    return "\n\n".join(sections)
+
+
+def run_fanout(
+    focuses: List[str],
+    research: Callable[[str], str],
+    max_workers: int = FANOUT_WORKERS,
+) -> List[Tuple[str, str]]:
+    """Run ``research(focus)`` for every focus on a bounded thread pool, keeping input order.
+
+    Each call runs in a copy of the caller's context so run-scoped context
+    variables (such as the bound event stream) follow it onto the worker.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(focuses)))) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, research, focus) for focus in focuses]
+        outputs = [future.result() for future in futures]
+    return list(zip(focuses, outputs))
@@ -0,0 +1,368 @@
+import asyncio
+import codecs
+import ipaddress
+import os
+import threading
+import time
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from .cache import TTLCache, cache_path
+from .compaction import canonical_url
+
+FETCH_MAX_CONNECTIONS = int(os.getenv("FETCH_MAX_CONNECTIONS", 20))
+FETCH_PER_HOST = int(os.getenv("FETCH_PER_HOST", 4))
+FETCH_TIMEOUT = float(os.getenv("FETCH_TIMEOUT", 10))
+FETCH_MAX_BYTES = int(os.getenv("FETCH_MAX_BYTES", 1_000_000))
+FETCH_MAX_CHARS = int(os.getenv("FETCH_MAX_CHARS", 6000))
+PAGE_CACHE_TTL = float(os.getenv("PAGE_CACHE_TTL", 7 * 24 * 3600))
+PAGE_CACHE_FRESH = float(os.getenv("PAGE_CACHE_FRESH", 6 * 3600))
+# URLs come from the model, so only public addresses are fetched unless this is set (local stub servers)
+FETCH_ALLOW_PRIVATE = os.getenv("FETCH_ALLOW_PRIVATE", "0") == "1"
+FETCH_MAX_REDIRECTS = int(os.getenv("FETCH_MAX_REDIRECTS", 5))
+
+_TEXT_TYPES = ("text/html", "application/xhtml", "text/plain")
+_CHUNK_SIZE = 16 * 1024
+
+
+class BlockedURL(ValueError):
+    """The URL isn't http(s) or its host resolves to a loopback, private, link-local or reserved address."""
+
+
+async def check_url(url: str, allow_private: bool = False) -> Optional[str]:
+    """Raise BlockedURL unless ``url`` is http(s) and every address its host resolves to is public.
+
+    Returns the vetted address to connect to (None with ``allow_private``).
+    Connecting to it rather than to the host name means a second lookup
+    can't swap in a private address after the check (DNS rebinding).
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise BlockedURL(f"only http(s) URLs with a host can be fetched: {url}")
+    if allow_private:
+        return None
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+    except ValueError as e:
+        raise BlockedURL(str(e)) from None
+    infos = await asyncio.get_running_loop().getaddrinfo(parts.hostname, port)
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%", 1)[0])
+        mapped = getattr(address, "ipv4_mapped", None)
+        if not (mapped or address).is_global or (mapped or address).is_multicast:
+            raise BlockedURL(f"{parts.hostname} resolves to a non-public address ({address})")
+    if not infos:
+        raise BlockedURL(f"{parts.hostname} does not resolve")
+    return infos[0][4][0]
+
+
+def _pinned(url: str, address: str) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """URL, headers and request extensions that reach ``address`` while asking for ``url``'s host.
+
+    The Host header and TLS server name (certificate check included) stay
+    those of the original host name.
+    """
+    parts = urlsplit(url)
+    host = f"[{address}]" if ":" in address else address
+    netloc = f"{host}:{parts.port}" if parts.port else host
+    origin = f"{parts.hostname}:{parts.port}" if parts.port else parts.hostname
+    return parts._replace(netloc=netloc).geturl(), {"Host": origin}, {"sni_hostname": parts.hostname}
+
+
+@dataclass
+class Page:
+    url: str
+    title: str = ""
+    text: str = ""
+    status: int = 0
+    cache: str = ""  # "", "hit" (served from cache) or "revalidated" (server answered 304)
+    truncated: bool = False
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class TextExtractor(HTMLParser):
+    """Incremental HTML-to-text: feed it decoded chunks, read ``text()`` at any point.
+
+    Scripts, styles and page chrome (nav, header, footer, asides, forms) are
+    skipped; lines of fewer than ``min_words`` words that aren't headings are
+    dropped as menu and button residue.
+    """
+
+    SKIP = {"script", "style", "noscript", "template", "svg", "iframe", "nav", "header", "footer", "aside", "form"}
+    BLOCK = {
+        "p", "div", "section", "article", "main", "li", "ul", "ol", "br", "tr", "td", "th", "table",
+        "blockquote", "pre", "dd", "dt", "figcaption", "h1", "h2", "h3", "h4", "h5", "h6",
+    }
+    HEADINGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+
+    def __init__(self, min_words: int = 4):
+        super().__init__(convert_charrefs=True)
+        self.min_words = min_words
+        self.title = ""
+        self.chars = 0
+        self._skip = 0
+        self._in_title = False
+        self._heading = False
+        self._line: List[str] = []
+        self._lines: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: Any) -> None:
+        if tag in self.SKIP:
+            self._skip += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag in self.BLOCK:
+            self._flush()
+            self._heading = tag in self.HEADINGS
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self.SKIP:
+            self._skip = max(0, self._skip - 1)
+        elif tag == "title":
+            self._in_title = False
+        elif tag in self.BLOCK:
+            self._flush()
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += data
+        elif not self._skip:
+            self._line.append(data)
+
+    def _flush(self) -> None:
+        line = " ".join("".join(self._line).split())
+        if line and (self._heading or len(line.split()) >= self.min_words):
+            self._lines.append(f"## {line}" if self._heading else line)
+            self.chars += len(line) + 1
+        self._line = []
+        self._heading = False
+
+    def text(self) -> str:
+        self._flush()
+        return "\n".join(self._lines)
+
+
+class PageFetcher:
+    """Fetches batches of pages concurrently over one pooled async HTTP client.
+
+    The client and its connection pool live on a background event loop, so
+    connections are reused across batches and across the threads calling
+    ``fetch``. Each host gets at most ``per_host`` requests at a time, each
+    page at most ``timeout`` seconds and ``max_bytes`` of body, and extraction
+    runs while the body streams in, stopping once ``max_chars`` of text exist.
+
+    Extracted text is cached by URL. Within ``fresh`` seconds it is served as
+    is; after that the page is revalidated with its ETag/Last-Modified and a
+    304 reuses the cached text.
+
+    URLs are chosen by the model, so unless ``allow_private`` is set each one,
+    and each redirect target, must resolve only to public addresses (see
+    check_url), and the connection goes to the address that was checked.
+    That keeps fetches away from internal services and cloud metadata
+    endpoints.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = FETCH_MAX_CONNECTIONS,
+        per_host: int = FETCH_PER_HOST,
+        timeout: float = FETCH_TIMEOUT,
+        max_bytes: int = FETCH_MAX_BYTES,
+        max_chars: int = FETCH_MAX_CHARS,
+        fresh: float = PAGE_CACHE_FRESH,
+        cache: Optional[TTLCache] = None,
+        allow_private: bool = FETCH_ALLOW_PRIVATE,
+        max_redirects: int = FETCH_MAX_REDIRECTS,
+    ):
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self.fresh = fresh
+        self.allow_private = allow_private
+        self.max_redirects = max_redirects
+        self._cache = cache or TTLCache(cache_path("pages.sqlite3"), ttl=PAGE_CACHE_TTL)
+        self._lock = threading.Lock()
+        self._stats = {
+            "fetched": 0, "cache_hits": 0, "revalidated": 0, "errors": 0, "blocked": 0, "truncated": 0, "bytes": 0,
+        }
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client = None
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="page-fetcher", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def fetch(self, urls: List[str]) -> List[Page]:
+        """Fetch ``urls`` concurrently (duplicates once) and return their pages in the same order."""
+        future = asyncio.run_coroutine_threadsafe(self.afetch(urls), self._ensure_loop())
+        return future.result()
+
+    async def afetch(self, urls: List[str]) -> List[Page]:
+        """``fetch`` for callers already running on this fetcher's loop."""
+        unique = list(dict.fromkeys(urls))
+        pages = await asyncio.gather(*(self._fetch_one(url) for url in unique))
+        by_url = dict(zip(unique, pages))
+        return [by_url[url] for url in urls]
+
+    def _http(self):
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                follow_redirects=False,  # followed in _download, so every hop is checked
+                timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 5.0)),
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                headers={"User-Agent": "world-economics/0.1 (+research assistant)", "Accept": "text/html,text/plain"},
+            )
+        return self._client
+
+    async def _fetch_one(self, url: str) -> Page:
+        started = time.perf_counter()
+        key = canonical_url(url)
+        # the SQLite cache blocks, so it runs off the event loop
+        cached = await asyncio.to_thread(self._cache.get, key)
+        if cached is not None and time.time() - cached["fetched_at"] < self.fresh:
+            self._count("cache_hits")
+            return Page(url, cached["title"], cached["text"], cached["status"], cache="hit")
+
+        host = urlsplit(url).netloc.lower()
+        semaphore = self._hosts.setdefault(host, asyncio.Semaphore(self.per_host))
+        try:
+            async with semaphore:
+                page = await asyncio.wait_for(self._download(url, cached), self.timeout)
+        except BlockedURL as e:
+            self._count("blocked")
+            page = Page(url, error=f"blocked: {e}")
+        except Exception as e:
+            self._count("errors")
+            message = "timed out" if isinstance(e, asyncio.TimeoutError) else f"{type(e).__name__}: {e}"
+            page = Page(url, error=message)
+        else:
+            if page.error:
+                self._count("errors")
+            elif page.cache == "revalidated":
+                self._count("revalidated")
+            if not page.error:
+                await asyncio.to_thread(self._cache.set, key, {
+                    "title": page.title, "text": page.text, "status": page.status, "fetched_at": time.time(),
+                    "etag": page.etag, "last_modified": page.last_modified,
+                })
+        page.elapsed_ms = (time.perf_counter() - started) * 1000
+        return page
+
+    async def _download(self, url: str, cached: Optional[Dict[str, Any]]) -> Page:
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        target = url
+        for _ in range(self.max_redirects + 1):
+            address = await check_url(target, self.allow_private)
+            request_url, extensions = target, {}
+            hop_headers = dict(headers)
+            if address is not None:
+                request_url, host, extensions = _pinned(target, address)
+                hop_headers.update(host)
+            async with self._http().stream("GET", request_url, headers=hop_headers, extensions=extensions) as response:
+                if response.is_redirect and "Location" in response.headers:
+                    target = urljoin(target, response.headers["Location"])
+                    continue
+                return await self._read(url, response, cached)
+        return Page(url, error=f"more than {self.max_redirects} redirects")
+
+    async def _read(self, url: str, response: Any, cached: Optional[Dict[str, Any]]) -> Page:
+        page = Page(url, status=response.status_code)
+        page.etag = response.headers.get("ETag")
+        page.last_modified = response.headers.get("Last-Modified")
+        if response.status_code == 304 and cached is not None:
+            page.title, page.text, page.cache = cached["title"], cached["text"], "revalidated"
+            page.etag = page.etag or cached.get("etag")
+            page.last_modified = page.last_modified or cached.get("last_modified")
+            return page
+        if response.status_code >= 400:
+            page.error = f"HTTP {response.status_code}"
+            return page
+        content_type = response.headers.get("Content-Type", "text/html").lower()
+        if not content_type.startswith(_TEXT_TYPES):
+            page.error = f"unsupported content type {content_type.split(';')[0]}"
+            return page
+
+        extractor = TextExtractor()
+        plain = content_type.startswith("text/plain")
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+        received = 0
+        async for chunk in response.aiter_bytes(_CHUNK_SIZE):
+            chunk = chunk[: self.max_bytes - received]
+            received += len(chunk)
+            text = decoder.decode(chunk)
+            if plain:
+                page.text += text
+            else:
+                extractor.feed(text)
+            if received >= self.max_bytes or extractor.chars >= self.max_chars or len(page.text) >= self.max_chars:
+                page.truncated = True
+                break
+        self._count("bytes", received)
+        self._count("fetched")
+        if page.truncated:
+            self._count("truncated")
+
+        if not plain:
+            page.title = " ".join(extractor.title.split())
+            page.text = extractor.text()
+        page.text = page.text[: self.max_chars]
+        return page
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["fetched"] + stats["cache_hits"] + stats["revalidated"]
+        stats["hit_rate"] = (stats["cache_hits"] + stats["revalidated"]) / lookups if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Close pooled connections and stop the background loop."""
+        with self._lock:
+            loop, client, self._loop, self._client = self._loop, self._client, None, None
+        if loop is None:
+            return
+        if client is not None:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+
+_fetcher: Optional[PageFetcher] = None
+_fetcher_lock = threading.Lock()
+
+
+def get_page_fetcher() -> PageFetcher:
+    """The shared fetcher, so every agent draws on one connection pool and one page cache."""
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = PageFetcher()
+    return _fetcher
+
+
+def page_fetch_stats() -> Optional[Dict[str, Any]]:
+    """Fetch counters, or None if no page has been fetched in this process yet."""
+    return _fetcher.stats() if _fetcher is not None else None
@@ -0,0 +1,129 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import cache_path
+
+REPORT_HISTORY = os.getenv("REPORT_HISTORY", "1") == "1"
+
+
+@dataclass
+class ReportEntry:
+    id: int
+    run_id: str
+    query: str
+    year: str
+    model: str
+    created_at: float
+    elapsed: float
+    size: int
+    snippet: str = ""
+
+
+def fts_query(text: str) -> str:
+    """FTS5 MATCH expression requiring every word of ``text``; the last word may be a prefix."""
+    words = re.findall(r"\w+", text.lower())
+    return " ".join(f'"{w}"' for w in words[:-1]) + (f' "{words[-1]}"*' if words else "")
+
+
+def snippet(text: str, query: str, width: int = 220) -> str:
+    """A window of ``text`` around the first occurrence of a query word."""
+    words = [w for w in re.findall(r"\w+", query.lower()) if len(w) > 2]
+    flat = " ".join(text.split())
+    lowered = flat.lower()
+    hit = min((i for i in (lowered.find(w) for w in words) if i >= 0), default=0)
+    start = max(0, hit - width // 3)
+    return ("…" if start else "") + flat[start:start + width] + ("…" if start + width < len(flat) else "")
+
+
+class ReportHistory:
+    """Every generated report, kept in SQLite with zlib-compressed bodies.
+
+    Metadata lives in a plain table indexed by id, so listing pages by id
+    (``page(before=...)``) only touches the rows it returns. Queries and bodies
+    are indexed in a contentless FTS5 table, so text isn't stored twice and
+    search is an index lookup ranked by bm25.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or cache_path("history.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "CREATE TABLE IF NOT EXISTS reports ("
+            "id INTEGER PRIMARY KEY, run_id TEXT NOT NULL, query TEXT NOT NULL, year TEXT NOT NULL, "
+            "model TEXT NOT NULL, created_at REAL NOT NULL, elapsed REAL NOT NULL, size INTEGER NOT NULL, "
+            "body BLOB NOT NULL);"
+            "CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts USING fts5(query, body, content='', tokenize='porter');"
+        )
+        self._conn.commit()
+
+    def add(self, run_id: str, query: str, year: str, report: str, model: str = "", elapsed: float = 0.0) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO reports (run_id, query, year, model, created_at, elapsed, size, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, query, year, model, time.time(), elapsed, len(report), zlib.compress(report.encode(), 6)),
+            )
+            self._conn.execute(
+                "INSERT INTO reports_fts (rowid, query, body) VALUES (?, ?, ?)", (cursor.lastrowid, query, report)
+            )
+            self._conn.commit()
+            return cursor.lastrowid
+
+    def get(self, report_id: int) -> Optional[Tuple[ReportEntry, str]]:
+        """An entry and its full report."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, run_id, query, year, model, created_at, elapsed, size, body FROM reports WHERE id = ?",
+                (report_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return ReportEntry(*row[:8]), zlib.decompress(row[8]).decode()
+
+    def page(self, limit: int = 10, before: Optional[int] = None) -> List[ReportEntry]:
+        """Newest entries first; pass the last id of a page as ``before`` to get the next one."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, run_id, query, year, model, created_at, elapsed, size FROM reports "
+                "WHERE id < ? ORDER BY id DESC LIMIT ?",
+                (before if before is not None else 2 ** 63 - 1, limit),
+            ).fetchall()
+        return [ReportEntry(*row) for row in rows]
+
+    def search(self, text: str, limit: int = 10, offset: int = 0) -> List[ReportEntry]:
+        """Best matches for ``text`` in queries and report bodies, with a snippet of each body."""
+        match = fts_query(text)
+        if not match:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT r.id, r.run_id, r.query, r.year, r.model, r.created_at, r.elapsed, r.size, r.body "
+                "FROM (SELECT rowid, rank FROM reports_fts WHERE reports_fts MATCH ? ORDER BY rank LIMIT ? OFFSET ?) f "
+                "JOIN reports r ON r.id = f.rowid ORDER BY f.rank",
+                (match, limit, offset),
+            ).fetchall()
+        return [ReportEntry(*row[:8], snippet=snippet(zlib.decompress(row[8]).decode(), text)) for row in rows]
+
+    def count(self, text: str = "") -> int:
+        with self._lock:
+            if text:
+                match = fts_query(text)
+                if not match:
+                    return 0
+                return self._conn.execute("SELECT COUNT(*) FROM reports_fts WHERE reports_fts MATCH ?", (match,)).fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, raw, stored = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(body)), 0) FROM reports"
+            ).fetchone()
+        return {"reports": count, "bytes": raw, "stored_bytes": stored, "compression": raw / stored if stored else 0.0}
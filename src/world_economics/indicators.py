@@ -0,0 +1,234 @@
+import argparse
+import csv
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+INDICATOR_DIR = os.getenv("INDICATOR_DIR", "data/indicators")
+
+_COUNTRY_CODE = ("country code", "country_code", "iso3", "iso", "code")
+_COUNTRY_NAME = ("country name", "country_name", "country", "economy")
+_INDICATOR_CODE = ("indicator code", "indicator_code", "series code", "series_code", "indicator_id")
+_INDICATOR_NAME = ("indicator name", "indicator_name", "indicator", "series name", "series")
+_YEAR = ("year", "time", "date", "period")
+_VALUE = ("value", "obs_value", "observation")
+_YEAR_HEADER = re.compile(r"^(\d{4})(?:\s*\[YR\d{4}\])?$")
+
+
+def _find(header: List[str], names: Tuple[str, ...]) -> Optional[int]:
+    lowered = [h.strip().lower() for h in header]
+    for name in names:
+        if name in lowered:
+            return lowered.index(name)
+    return None
+
+
+def _number(text: str) -> Optional[float]:
+    text = text.strip().replace(",", "")
+    if not text or text in ("..", "-", "NA", "n/a", "nan"):
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def read_observations(path: str) -> Iterator[Tuple[str, str, str, str, int, float]]:
+    """Yield ``(country_code, country_name, indicator_code, indicator_name, year, value)`` from a CSV dump.
+
+    Handles World Bank style wide files (one column per year, with or without
+    the preamble lines of a WDI download) and long files with year/value columns.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        rows = csv.reader(f)
+        header: List[str] = []
+        for row in rows:
+            if _find(row, _COUNTRY_CODE + _COUNTRY_NAME) is not None and (
+                _find(row, _INDICATOR_CODE + _INDICATOR_NAME) is not None
+            ):
+                header = row
+                break
+        if not header:
+            raise ValueError(f"{path}: no header with country and indicator columns")
+
+        country_code, country_name = _find(header, _COUNTRY_CODE), _find(header, _COUNTRY_NAME)
+        indicator_code, indicator_name = _find(header, _INDICATOR_CODE), _find(header, _INDICATOR_NAME)
+        year_columns = [(i, int(m.group(1))) for i, h in enumerate(header) if (m := _YEAR_HEADER.match(h.strip()))]
+        year, value = _find(header, _YEAR), _find(header, _VALUE)
+        if not year_columns and (year is None or value is None):
+            raise ValueError(f"{path}: expected year columns or year/value columns")
+
+        for row in rows:
+            if len(row) < len(header) // 2:
+                continue
+            c_name = row[country_name].strip() if country_name is not None else ""
+            c_code = row[country_code].strip() if country_code is not None else c_name
+            i_name = row[indicator_name].strip() if indicator_name is not None else ""
+            i_code = row[indicator_code].strip() if indicator_code is not None else i_name
+            if not c_code or not i_code:
+                continue
+            if year_columns:
+                cells = ((y, row[i]) for i, y in year_columns if i < len(row))
+            else:
+                match = re.match(r"\d{4}", row[year].strip())
+                cells = [(int(match.group()), row[value])] if match else []
+            for y, cell in cells:
+                number = _number(cell)
+                if number is not None:
+                    yield c_code, c_name or c_code, i_code, i_name or i_code, y, number
+
+
+class IndicatorStore:
+    """Country x indicator x year observations in memory-mapped columnar arrays.
+
+    Rows are sorted by (indicator, country, year). ``offsets`` is a dense
+    index over (indicator, country) pairs, so the rows of one series are
+    ``offsets[i * n_countries + c]:offsets[i * n_countries + c + 1]``.
+    Arrays are opened with ``mmap_mode="r"`` and paged in on demand.
+    """
+
+    ARRAYS = ("years", "values", "offsets")
+
+    def __init__(self, path: str = INDICATOR_DIR):
+        self.path = path
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def available(self) -> bool:
+        return os.path.exists(os.path.join(self.path, "meta.json"))
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            with open(os.path.join(self.path, "meta.json")) as f:
+                meta = json.load(f)
+            self.countries: List[Tuple[str, str]] = [tuple(c) for c in meta["countries"]]
+            self.indicators: List[Tuple[str, str]] = [tuple(i) for i in meta["indicators"]]
+            self._country_index: Dict[str, int] = {}
+            for i, (code, name) in enumerate(self.countries):
+                self._country_index[code.lower()] = i
+                self._country_index[name.lower()] = i
+            self._indicator_index = {code.lower(): i for i, (code, _) in enumerate(self.indicators)}
+            for name in self.ARRAYS:
+                # plain ndarray views over the mapping slice faster than np.memmap objects
+                setattr(self, f"_{name}", np.asarray(np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r")))
+            self._loaded = True
+
+    @classmethod
+    def build(cls, csv_paths: Iterable[str], path: str = INDICATOR_DIR) -> "IndicatorStore":
+        """Ingest CSV dumps into a new store at ``path``, replacing any existing one.
+
+        When the same observation appears more than once, the last file wins.
+        """
+        countries: Dict[str, str] = {}
+        indicators: Dict[str, str] = {}
+        observations: Dict[Tuple[str, str, int], float] = {}
+        for csv_path in csv_paths:
+            for c_code, c_name, i_code, i_name, year, value in read_observations(csv_path):
+                countries.setdefault(c_code, c_name)
+                indicators.setdefault(i_code, i_name)
+                observations[(i_code, c_code, year)] = value
+
+        country_ids = {code: i for i, code in enumerate(sorted(countries))}
+        indicator_ids = {code: i for i, code in enumerate(sorted(indicators))}
+        n_countries = len(country_ids)
+        keys = sorted(observations, key=lambda k: (indicator_ids[k[0]], country_ids[k[1]], k[2]))
+        pair_ids = np.fromiter(
+            (indicator_ids[i] * n_countries + country_ids[c] for i, c, _ in keys), dtype=np.int64, count=len(keys)
+        )
+        arrays = {
+            "years": np.fromiter((k[2] for k in keys), dtype=np.int16, count=len(keys)),
+            "values": np.fromiter((observations[k] for k in keys), dtype=np.float64, count=len(keys)),
+            "offsets": np.searchsorted(pair_ids, np.arange(len(indicator_ids) * n_countries + 1)).astype(np.int64),
+        }
+
+        staging = f"{path}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        for name, array in arrays.items():
+            np.save(os.path.join(staging, f"{name}.npy"), array)
+        with open(os.path.join(staging, "meta.json"), "w") as f:
+            json.dump({
+                "countries": [[code, countries[code]] for code in sorted(countries)],
+                "indicators": [[code, indicators[code]] for code in sorted(indicators)],
+                "observations": len(keys),
+                "built_at": time.time(),
+            }, f)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(staging, path)
+        return cls(path)
+
+    def country(self, text: str) -> Optional[int]:
+        """Index of a country by ISO code or name (case-insensitive)."""
+        self._load()
+        return self._country_index.get(text.strip().lower())
+
+    def find_indicators(self, text: str, limit: int = 5) -> List[int]:
+        """Indicators matching a code exactly, else those whose names contain the most query words."""
+        self._load()
+        exact = self._indicator_index.get(text.strip().lower())
+        if exact is not None:
+            return [exact]
+        words = re.findall(r"[a-z0-9]+", text.lower())
+        if not words:
+            return []
+        scored = []
+        for i, (code, name) in enumerate(self.indicators):
+            haystack = f"{code} {name}".lower()
+            score = sum(word in haystack for word in words)
+            if score:
+                scored.append((-score, len(name), i))
+        return [i for _, _, i in sorted(scored)[:limit]]
+
+    def series(
+        self, country: int, indicator: int, start_year: Optional[int] = None, end_year: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """``(years, values)`` of one country's indicator, optionally restricted to a year range."""
+        self._load()
+        pair = indicator * len(self.countries) + country
+        lo, hi = int(self._offsets[pair]), int(self._offsets[pair + 1])
+        years = self._years[lo:hi]
+        if start_year is not None:
+            lo += int(np.searchsorted(years, start_year, side="left"))
+        if end_year is not None:
+            hi = int(self._offsets[pair]) + int(np.searchsorted(years, end_year, side="right"))
+        return self._years[lo:hi], self._values[lo:hi]
+
+    def stats(self) -> Dict[str, int]:
+        self._load()
+        return {"countries": len(self.countries), "indicators": len(self.indicators), "observations": len(self._values)}
+
+
+_store: Optional[IndicatorStore] = None
+
+
+def get_indicator_store() -> Optional[IndicatorStore]:
+    """The shared store at INDICATOR_DIR, or None until one has been ingested."""
+    global _store
+    if _store is None:
+        _store = IndicatorStore()
+    return _store if _store.available() else None
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Ingest World Bank/IMF-style CSV dumps into the local indicator store.")
+    parser.add_argument("csv", nargs="+", help="CSV files, wide (one column per year) or long (year/value columns)")
+    parser.add_argument("--output-dir", default=INDICATOR_DIR)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    store = IndicatorStore.build(args.csv, args.output_dir)
+    stats = store.stats()
+    print(
+        f"Ingested {stats['observations']} observations for {stats['countries']} countries and "
+        f"{stats['indicators']} indicators into {args.output_dir} in {time.perf_counter() - started:.1f}s"
+    )
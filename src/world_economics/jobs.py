@@ -0,0 +1,88 @@
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+from .events import EventStream, bind_stream
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    id: str
+    description: str
+    status: JobStatus = JobStatus.QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    traceback: Optional[str] = None
+    events: EventStream = field(default_factory=EventStream, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+class JobQueue:
+    """Runs submitted callables on a bounded worker pool and keeps their state by job id.
+
+    Only the most recent ``max_jobs`` finished jobs are retained.
+    """
+
+    def __init__(self, max_workers: int = 2, max_jobs: int = 1000):
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, description: str = "", **kwargs: Any) -> str:
+        job = Job(id=uuid.uuid4().hex, description=description)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim()
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job.id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {status.value: 0 for status in JobStatus}
+            for job in self._jobs.values():
+                counts[job.status.value] += 1
+        return counts
+
+    def _run(self, job: Job, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        try:
+            with bind_stream(job.events):
+                job.result = fn(*args, **kwargs)
+            job.status = JobStatus.SUCCEEDED
+        except Exception as e:
+            job.error = str(e)
+            job.traceback = traceback.format_exc()
+            job.status = JobStatus.FAILED
+        finally:
+            job.finished_at = time.time()
+            job.events.close()
+
+    def _trim(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(self._jobs) - self.max_jobs)]:
+            del self._jobs[job_id]
@@ -0,0 +1,205 @@
+import argparse
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from .cache import cache_path, query_tokens
+from .metrics import span
+from .retrieval import chunk_report
+
+KNOWLEDGE_DIR = os.getenv("KNOWLEDGE_DIR", "knowledge")
+KNOWLEDGE_REFRESH_INTERVAL = float(os.getenv("KNOWLEDGE_REFRESH_INTERVAL", 30))
+
+TEXT_EXTENSIONS = (".txt", ".md", ".markdown", ".rst", ".csv", ".json", ".yaml", ".yml")
+
+
+@dataclass
+class KnowledgeHit:
+    source: str
+    heading: str
+    text: str
+    score: float
+
+
+class KnowledgeIndex:
+    """BM25 postings over the text files of a directory, persisted in SQLite.
+
+    ``refresh`` only re-chunks files whose content hash changed (size and
+    mtime are checked first, so unchanged files aren't even read) and drops
+    files that were removed.
+    """
+
+    def __init__(self, root: str = KNOWLEDGE_DIR, path: Optional[str] = None, k1: float = 1.5, b: float = 0.75):
+        self.root = root
+        self.path = path or cache_path("knowledge.sqlite3")
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._refreshed_at = 0.0
+        self._stats: Dict[str, Any] = {"build_ms_last": 0.0, "queries": 0, "query_ms_total": 0.0, "query_ms_last": 0.0}
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, sha256 TEXT NOT NULL, size INTEGER NOT NULL, mtime REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS chunks ("
+            "id INTEGER PRIMARY KEY, path TEXT NOT NULL, heading TEXT NOT NULL, text TEXT NOT NULL, length INTEGER NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS chunks_path ON chunks(path);"
+            "CREATE TABLE IF NOT EXISTS postings (term TEXT NOT NULL, chunk_id INTEGER NOT NULL, tf INTEGER NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS postings_term ON postings(term);"
+            "CREATE INDEX IF NOT EXISTS postings_chunk ON postings(chunk_id);"
+        )
+        self._conn.commit()
+
+    def _files(self) -> Dict[str, os.stat_result]:
+        files = {}
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if name.lower().endswith(TEXT_EXTENSIONS):
+                    full = os.path.join(directory, name)
+                    files[os.path.relpath(full, self.root)] = os.stat(full)
+        return files
+
+    def refresh(self) -> Dict[str, Any]:
+        """Bring the index in line with the directory; returns what changed and how long it took."""
+        started = time.perf_counter()
+        counts = {"files": 0, "reindexed": 0, "removed": 0, "chunks_added": 0}
+        with self._lock, span("knowledge", "refresh") as attrs:
+            known = {row[0]: row[1:] for row in self._conn.execute("SELECT path, sha256, size, mtime FROM files")}
+            current = self._files() if os.path.isdir(self.root) else {}
+            counts["files"] = len(current)
+
+            for path in set(known) - set(current):
+                self._remove(path)
+                self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                counts["removed"] += 1
+
+            for path, stat in current.items():
+                previous = known.get(path)
+                if previous and previous[1] == stat.st_size and previous[2] == stat.st_mtime:
+                    continue
+                with open(os.path.join(self.root, path), "rb") as f:
+                    content = f.read()
+                digest = hashlib.sha256(content).hexdigest()
+                if not previous or previous[0] != digest:
+                    self._remove(path)
+                    counts["chunks_added"] += self._add(path, content.decode("utf-8", errors="replace"))
+                    counts["reindexed"] += 1
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO files (path, sha256, size, mtime) VALUES (?, ?, ?, ?)",
+                    (path, digest, stat.st_size, stat.st_mtime),
+                )
+            self._conn.commit()
+            self._refreshed_at = time.time()
+            attrs.update(counts)
+        counts["build_ms"] = (time.perf_counter() - started) * 1000
+        self._stats["build_ms_last"] = counts["build_ms"]
+        return counts
+
+    def refresh_if_stale(self, interval: float = KNOWLEDGE_REFRESH_INTERVAL) -> None:
+        if time.time() - self._refreshed_at >= interval:
+            self.refresh()
+
+    def _remove(self, path: str) -> None:
+        self._conn.execute("DELETE FROM postings WHERE chunk_id IN (SELECT id FROM chunks WHERE path = ?)", (path,))
+        self._conn.execute("DELETE FROM chunks WHERE path = ?", (path,))
+
+    def _add(self, path: str, text: str) -> int:
+        chunks = chunk_report(text)
+        for chunk in chunks:
+            terms = Counter(query_tokens(chunk.text))
+            cursor = self._conn.execute(
+                "INSERT INTO chunks (path, heading, text, length) VALUES (?, ?, ?, ?)",
+                (path, chunk.heading, chunk.text, sum(terms.values())),
+            )
+            self._conn.executemany(
+                "INSERT INTO postings (term, chunk_id, tf) VALUES (?, ?, ?)",
+                [(term, cursor.lastrowid, tf) for term, tf in terms.items()],
+            )
+        return len(chunks)
+
+    def search(self, query: str, k: int = 4) -> List[KnowledgeHit]:
+        started = time.perf_counter()
+        terms = sorted(set(query_tokens(query)))
+        hits: List[KnowledgeHit] = []
+        with self._lock, span("knowledge", "query"):
+            if terms:
+                n, avg_length = self._conn.execute("SELECT COUNT(*), AVG(length) FROM chunks").fetchone()
+                marks = ",".join("?" * len(terms))
+                df = dict(self._conn.execute(
+                    f"SELECT term, COUNT(*) FROM postings WHERE term IN ({marks}) GROUP BY term", terms
+                ))
+                scores: Counter = Counter()
+                for term, chunk_id, tf, length in self._conn.execute(
+                    f"SELECT p.term, p.chunk_id, p.tf, c.length FROM postings p JOIN chunks c ON c.id = p.chunk_id "
+                    f"WHERE p.term IN ({marks})",
+                    terms,
+                ):
+                    idf = math.log(1 + (n - df[term] + 0.5) / (df[term] + 0.5))
+                    norm = self.k1 * (1 - self.b + self.b * length / (avg_length or 1))
+                    scores[chunk_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+                for chunk_id, score in scores.most_common(k):
+                    source, heading, text = self._conn.execute(
+                        "SELECT path, heading, text FROM chunks WHERE id = ?", (chunk_id,)
+                    ).fetchone()
+                    hits.append(KnowledgeHit(source, heading, text, score))
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._stats["queries"] += 1
+            self._stats["query_ms_total"] += elapsed
+            self._stats["query_ms_last"] = elapsed
+        return hits
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["files"] = self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+            stats["chunks"] = self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+        stats["query_ms_avg"] = stats["query_ms_total"] / stats["queries"] if stats["queries"] else 0.0
+        return stats
+
+
+_index: Optional[KnowledgeIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_knowledge_index() -> Optional[KnowledgeIndex]:
+    """The shared index of KNOWLEDGE_DIR, refreshed at most every KNOWLEDGE_REFRESH_INTERVAL seconds.
+
+    None when the directory has no text files.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = KnowledgeIndex()
+        _index.refresh_if_stale()
+    return _index if _index.stats()["chunks"] else None
+
+
+def knowledge_stats() -> Optional[Dict[str, Any]]:
+    """Index counters, or None if no agent has used the knowledge index in this process yet."""
+    return _index.stats() if _index is not None else None
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Update the knowledge/ index and optionally query it.")
+    parser.add_argument("query", nargs="*", help="search the index after refreshing it")
+    parser.add_argument("-k", type=int, default=4, help="results to show")
+    args = parser.parse_args(argv)
+
+    index = KnowledgeIndex()
+    changes = index.refresh()
+    print(
+        f"Indexed {changes['files']} files in {changes['build_ms']:.1f} ms "
+        f"({changes['reindexed']} re-indexed, {changes['removed']} removed, {changes['chunks_added']} chunks added)"
+    )
+    if args.query:
+        hits = index.search(" ".join(args.query), args.k)
+        for hit in hits:
+            print(f"\n[{hit.source}{' > ' + hit.heading if hit.heading else ''}] score {hit.score:.2f}\n{hit.text}")
+        print(f"\nQuery took {index.stats()['query_ms_last']:.2f} ms")
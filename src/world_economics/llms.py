@@ -0,0 +1,67 @@
+import functools
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from crewai import LLM
+from crewai.utilities.llm_utils import create_llm
+
+from .ratelimit import provider_of, rate_limiter
+
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", 20))
+
+_llms: Dict[Tuple[Optional[str], bool], LLM] = {}
+_lock = threading.Lock()
+_http_configured = False
+
+
+def _configure_http_pool() -> None:
+    """Give litellm one shared keep-alive connection pool instead of a client per call."""
+    global _http_configured
+    if _http_configured:
+        return
+    import httpx
+    import litellm
+
+    limits = httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_CONNECTIONS)
+    if getattr(litellm, "client_session", None) is None:
+        litellm.client_session = httpx.Client(limits=limits, timeout=600)
+    if getattr(litellm, "aclient_session", None) is None:
+        litellm.aclient_session = httpx.AsyncClient(limits=limits, timeout=600)
+    _http_configured = True
+
+
+def _rate_limited(llm: LLM, provider: str) -> LLM:
+    """Route ``llm``'s calls through the process-wide rate limiter for ``provider``."""
+    call = llm.call
+
+    @functools.wraps(call)
+    def limited(*args, **kwargs):
+        return rate_limiter.call(provider, lambda: call(*args, **kwargs))
+
+    llm.call = limited
+    return llm
+
+
+def get_llm(model: Optional[str] = None, stream: bool = False) -> LLM:
+    """Process-wide LLM client for ``model`` (default: the MODEL environment variable).
+
+    Its calls wait for the provider's quota and are retried on rate limits (see ratelimit.RateLimiter).
+    """
+    model = model or os.getenv("MODEL")
+    key = (model, stream)
+    with _lock:
+        llm = _llms.get(key)
+        if llm is None:
+            _configure_http_pool()
+            llm = _rate_limited(create_llm(model), provider_of(model))
+            if stream:
+                llm.stream = True
+            _llms[key] = llm
+        return llm
+
+
+def register_llm(model: str, llm: LLM, stream: bool = False) -> None:
+    """Make get_llm(model) return ``llm`` (used to plug in stand-ins such as the benchmark stub)."""
+    with _lock:
+        _llms[(model, stream)] = llm
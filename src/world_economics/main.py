@@ -2,20 +2,24 @@
 import sys
 import warnings
 from datetime import datetime
-from world_economics.crew import WorldEconomics
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
+# crewai and the crew are imported inside each entry point so that commands
+# which don't run a crew (and --help style failures) start instantly.
+
 
 def run():
     """Run the WorldEconomics crew for a topic."""
+    from world_economics.crew import WorldEconomicsCrew
+
     inputs = {
-        'question':  "What is the impact of rising US interest rates on emerging economies in the global south?",
+        'user_query':  "What is the impact of rising US interest rates on emerging economies in the global south?",
         'current_year': str(datetime.now().year)
     }
 
     try:
-        WorldEconomics().crew().kickoff(inputs=inputs)
+        WorldEconomicsCrew().crew().kickoff(inputs=inputs)
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
 
@@ -23,12 +27,14 @@ def train():
     """
     Train the crew for a given number of iterations.
     """
+    from world_economics.crew import WorldEconomicsCrew
+
     inputs = {
-        "topic": "AI LLMs",
+        "user_query": "AI LLMs",
         'current_year': str(datetime.now().year)
     }
     try:
-        WorldEconomics().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
+        WorldEconomicsCrew().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
 
     except Exception as e:
         raise Exception(f"An error occurred while training the crew: {e}")
@@ -37,8 +43,10 @@ def replay():
     """
     Replay the crew execution from a specific task.
     """
+    from world_economics.crew import WorldEconomicsCrew
+
     try:
-        WorldEconomics().crew().replay(task_id=sys.argv[1])
+        WorldEconomicsCrew().crew().replay(task_id=sys.argv[1])
 
     except Exception as e:
         raise Exception(f"An error occurred while replaying the crew: {e}")
@@ -47,13 +55,79 @@ def test():
     """
     Test the crew execution and returns the results.
     """
+    from world_economics.crew import WorldEconomicsCrew
+
     inputs = {
-        "topic": "AI LLMs",
+        "user_query": "AI LLMs",
         "current_year": str(datetime.now().year)
     }
-    
+
     try:
-        WorldEconomics().crew().test(n_iterations=int(sys.argv[1]), eval_llm=sys.argv[2], inputs=inputs)
+        WorldEconomicsCrew().crew().test(n_iterations=int(sys.argv[1]), eval_llm=sys.argv[2], inputs=inputs)
 
     except Exception as e:
         raise Exception(f"An error occurred while testing the crew: {e}")
+
+def startup_time():
+    """
+    Report the cold import time of the app and crew modules (or the modules given as arguments).
+    """
+    from world_economics.startup import DEFAULT_MODULES, report
+
+    print(report(sys.argv[1:] or DEFAULT_MODULES))
+
+def benchmark():
+    """
+    Benchmark the report pipeline and chat flow offline, against stub LLM and Serper backends.
+    """
+    from world_economics.benchmark import main
+
+    main(sys.argv[1:])
+
+def batch():
+    """
+    Generate reports for every question in a JSONL or CSV file, resuming an interrupted batch.
+    """
+    from world_economics.batch import main
+
+    main(sys.argv[1:])
+
+def ingest_indicators():
+    """
+    Ingest World Bank/IMF-style CSV dumps into the local indicator store used by the data researcher.
+    """
+    from world_economics.indicators import main
+
+    main(sys.argv[1:])
+
+def knowledge_index():
+    """
+    Update the knowledge/ index (only changed files are re-indexed) and optionally run a query against it.
+    """
+    from world_economics.knowledge import main
+
+    main(sys.argv[1:])
+
+def rerun():
+    """
+    Regenerate a report, executing only the tasks whose config, model or upstream outputs changed.
+    """
+    from world_economics.runner import main
+
+    main(sys.argv[1:])
+
+def warmup():
+    """
+    Regenerate cached reports for the example and most-asked questions that are missing or close to expiring.
+    """
+    from world_economics.warmup import main
+
+    main(sys.argv[1:])
+
+def serve():
+    """
+    Serve the HTTP API for queued report generation (with server-sent progress events) and follow-up chat.
+    """
+    from world_economics.api import main
+
+    main(sys.argv[1:])
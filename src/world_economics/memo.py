@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from .cache import TTLCache, cache_path
+
+# reuse stored task outputs in every run, not only in partial reruns (rerun_from)
+TASK_MEMO = os.getenv("TASK_MEMO", "0") == "1"
+# never longer than a cached report is served, so reuse can't pass an old report off as fresh
+_REPORT_MAX_AGE = float(os.getenv("REPORT_CACHE_MAX_AGE", 24 * 3600))
+TASK_MEMO_TTL = min(float(os.getenv("TASK_MEMO_TTL", _REPORT_MAX_AGE)), _REPORT_MAX_AGE)
+
+
+def _settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    # crewai replaces agent/context names in the loaded configs with objects; only plain settings matter here
+    return {k: v for k, v in config.items() if isinstance(v, (str, int, float, bool))}
+
+
+class TaskMemo:
+    """Task outputs addressed by a hash of everything that produced them.
+
+    The key covers the task's config, its agent's config and tools, the
+    model, the run inputs and the outputs the task received as context. A
+    changed prompt or model therefore misses for that task, and its new output
+    changes the keys of everything downstream, while unchanged tasks upstream
+    keep hitting.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = TASK_MEMO_TTL):
+        self._cache = TTLCache(path or cache_path("tasks.sqlite3"), ttl=ttl)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def key(
+        task_config: Dict[str, Any],
+        agent_config: Dict[str, Any],
+        model: Optional[str],
+        inputs: Dict[str, str],
+        context: List[str],
+        tools: Optional[List[str]] = None,
+    ) -> str:
+        payload = {
+            "task": _settings(task_config),
+            "agent": _settings(agent_config),
+            "tools": sorted(tools or []),
+            "model": model,
+            "inputs": inputs,
+            "context": [hashlib.sha256(raw.encode()).hexdigest() for raw in context],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def get(self, task_name: str, key: str) -> Optional[str]:
+        raw = self._cache.get(key)
+        with self._lock:
+            counts = self._stats.setdefault(task_name, {"hits": 0, "misses": 0})
+            counts["hits" if raw is not None else "misses"] += 1
+        return raw
+
+    def put(self, key: str, raw: str) -> None:
+        if raw:
+            self._cache.set(key, raw)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hits and misses per task name."""
+        with self._lock:
+            return {name: dict(counts) for name, counts in self._stats.items()}
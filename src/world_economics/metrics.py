@@ -0,0 +1,416 @@
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .cache import normalize_query
+from .tokens import estimate_tokens
+
+METRICS_LOG = os.getenv("METRICS_LOG", "")
+METRICS_LOG_MAX_BYTES = int(os.getenv("METRICS_LOG_MAX_BYTES", 50_000_000))
+METRICS_LOG_BACKUPS = int(os.getenv("METRICS_LOG_BACKUPS", 3))
+# user questions can be personal; spans identify them by hash unless this is set
+METRICS_LOG_QUERIES = os.getenv("METRICS_LOG_QUERIES", "0") == "1"
+METRICS_PORT = os.getenv("METRICS_PORT")
+# loopback only unless a scraper elsewhere needs it, e.g. 0.0.0.0
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+
+_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+@dataclass
+class Span:
+    kind: str
+    name: str
+    start: float
+    duration: float
+    run_id: Optional[str] = None
+    task: Optional[str] = None
+    error: Optional[str] = None
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+
+class _JsonlWriter:
+    """Appends records to a JSON-lines file from a background thread, off the hot path.
+
+    The thread starts with the first record. Once the file reaches
+    ``max_bytes`` it is renamed to ``path.1`` (older ones shift up to
+    ``path.<backups>``, the oldest is dropped) and a new file is started.
+    """
+
+    def __init__(self, path: str, max_bytes: int = METRICS_LOG_MAX_BYTES, backups: int = METRICS_LOG_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._queue: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
+        self._started = False
+        self._lock = threading.Lock()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._queue.put(record)
+        if not self._started:
+            with self._lock:
+                if not self._started:
+                    threading.Thread(target=self._drain, daemon=True, name="metrics-writer").start()
+                    self._started = True
+
+    def _rotate(self) -> None:
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def _drain(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        f = open(self.path, "a")
+        size = f.tell()
+        while True:
+            records = [self._queue.get()]
+            while not self._queue.empty():
+                records.append(self._queue.get())
+            for record in records:
+                line = json.dumps(record, default=str) + "\n"
+                f.write(line)
+                size += len(line)
+                if self.max_bytes and size >= self.max_bytes:
+                    f.close()
+                    self._rotate()
+                    f = open(self.path, "a")
+                    size = 0
+            f.flush()
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: Any) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class MetricsRegistry:
+    """Aggregates spans into per-(kind, name) latency histograms plus token and cost counters."""
+
+    def __init__(self, log_path: Optional[str] = METRICS_LOG):
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._tokens: Dict[Tuple[str, str], int] = {}
+        self._cost: Dict[str, float] = {}
+        self._collectors: List[Callable[[], str]] = []
+        self._writer = _JsonlWriter(log_path) if log_path else None
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            series = self._series.setdefault(
+                (span.kind, span.name),
+                {"count": 0, "sum": 0.0, "errors": 0, "cost_usd": 0.0, "tokens": 0, "buckets": [0] * len(_BUCKETS)},
+            )
+            series["count"] += 1
+            series["sum"] += span.duration
+            series["errors"] += 1 if span.error else 0
+            series["cost_usd"] += span.attrs.get("cost_usd", 0.0)
+            series["tokens"] += span.attrs.get("prompt_tokens", 0) + span.attrs.get("completion_tokens", 0)
+            for i, bound in enumerate(_BUCKETS):
+                if span.duration <= bound:
+                    series["buckets"][i] += 1
+            model = span.attrs.get("model")
+            if model:
+                for kind in ("prompt", "completion"):
+                    tokens = span.attrs.get(f"{kind}_tokens", 0)
+                    self._tokens[(model, kind)] = self._tokens.get((model, kind), 0) + tokens
+                self._cost[model] = self._cost.get(model, 0.0) + span.attrs.get("cost_usd", 0.0)
+        if self._writer is not None:
+            self._writer.write(asdict(span))
+
+    def series(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        with self._lock:
+            return {key: dict(value) for key, value in self._series.items()}
+
+    def dashboard(self) -> Dict[str, Any]:
+        """Headline numbers for the app's metrics panel."""
+        with self._lock:
+            def total(kind: str, stat: str = "count", name: Optional[str] = None) -> float:
+                return sum(s[stat] for (k, n), s in self._series.items() if k == kind and name in (None, n))
+
+            reports = total("run", name="report")
+            searches = self._series.get(("search", "serper"), {})
+            return {
+                "reports": int(reports),
+                "report_avg_s": total("run", "sum", "report") / reports if reports else 0.0,
+                "llm_calls": int(total("llm")),
+                "tokens": sum(self._tokens.values()),
+                "cost_usd": sum(self._cost.values()),
+                "tool_calls": int(total("tool")),
+                "search_calls": int(searches.get("count", 0)),
+                "search_avg_s": searches["sum"] / searches["count"] if searches.get("count") else 0.0,
+            }
+
+    def routes(self) -> Dict[str, Dict[str, float]]:
+        """Calls, average latency, tokens and cost per route: each agent/model pair, plus the local fast path."""
+        with self._lock:
+            return {
+                name: {
+                    "calls": s["count"],
+                    "avg_ms": s["sum"] / s["count"] * 1000 if s["count"] else 0.0,
+                    "tokens": s["tokens"],
+                    "cost_usd": s["cost_usd"],
+                }
+                for (kind, name), s in sorted(self._series.items())
+                if kind in ("llm", "route")
+            }
+
+    def add_collector(self, collector: Callable[[], str]) -> None:
+        """Append ``collector()``'s Prometheus text (gauges kept elsewhere) to every scrape."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def prometheus_text(self) -> str:
+        lines = [
+            "# HELP world_economics_span_seconds Duration of instrumented runs, tasks, agents, LLM and tool calls.",
+            "# TYPE world_economics_span_seconds histogram",
+        ]
+        with self._lock:
+            for (kind, name), s in sorted(self._series.items()):
+                for bound, count in zip(_BUCKETS, s["buckets"]):
+                    lines.append(f"world_economics_span_seconds_bucket{_labels(kind=kind, name=name, le=bound)} {count}")
+                lines.append(f"world_economics_span_seconds_bucket{_labels(kind=kind, name=name, le='+Inf')} {s['count']}")
+                lines.append(f"world_economics_span_seconds_sum{_labels(kind=kind, name=name)} {s['sum']:.6f}")
+                lines.append(f"world_economics_span_seconds_count{_labels(kind=kind, name=name)} {s['count']}")
+            lines += ["# HELP world_economics_span_errors_total Spans that ended in an error.",
+                      "# TYPE world_economics_span_errors_total counter"]
+            for (kind, name), s in sorted(self._series.items()):
+                lines.append(f"world_economics_span_errors_total{_labels(kind=kind, name=name)} {s['errors']}")
+            lines += ["# HELP world_economics_span_cost_usd_total Estimated LLM cost by span (per route for LLM calls).",
+                      "# TYPE world_economics_span_cost_usd_total counter"]
+            for (kind, name), s in sorted(self._series.items()):
+                if kind == "llm":
+                    lines.append(f"world_economics_span_cost_usd_total{_labels(kind=kind, name=name)} {s['cost_usd']:.6f}")
+            lines += ["# HELP world_economics_llm_tokens_total Estimated LLM tokens by model.",
+                      "# TYPE world_economics_llm_tokens_total counter"]
+            for (model, kind), tokens in sorted(self._tokens.items()):
+                lines.append(f"world_economics_llm_tokens_total{_labels(model=model, type=kind)} {tokens}")
+            lines += ["# HELP world_economics_llm_cost_usd_total Estimated LLM cost by model.",
+                      "# TYPE world_economics_llm_cost_usd_total counter"]
+            for model, cost in sorted(self._cost.items()):
+                lines.append(f"world_economics_llm_cost_usd_total{_labels(model=model)} {cost:.6f}")
+            collectors = list(self._collectors)
+        return "\n".join(lines) + "\n" + "".join(collector() for collector in collectors)
+
+
+registry = MetricsRegistry()
+
+_run_id: ContextVar[Optional[str]] = ContextVar("metrics_run_id", default=None)
+_local = threading.local()
+
+
+@contextmanager
+def bind_run(run_id: str) -> Iterator[None]:
+    """Tag spans recorded in this context with ``run_id``."""
+    token = _run_id.set(run_id)
+    try:
+        yield
+    finally:
+        _run_id.reset(token)
+
+
+@contextmanager
+def span(kind: str, name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """Time the enclosed block; the yielded dict can be filled with extra attributes."""
+    started, clock = time.time(), time.perf_counter()
+    error = None
+    try:
+        yield attrs
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        registry.record(Span(kind, name, started, time.perf_counter() - clock, _run_id.get(),
+                             getattr(_local, "task", None), error, attrs))
+
+
+def record(kind: str, name: str, started: float, duration: float, **attrs: Any) -> None:
+    """Record a span timed elsewhere, e.g. one only worth keeping once its duration is known."""
+    registry.record(Span(kind, name, started, duration, _run_id.get(), getattr(_local, "task", None), None, attrs))
+
+
+def query_attrs(query: str) -> Dict[str, str]:
+    """Span attributes identifying a user question.
+
+    These are a hash of its normalized form, plus the text itself only with
+    METRICS_LOG_QUERIES=1.
+    """
+    attrs = {"query_hash": hashlib.sha256(normalize_query(query).encode()).hexdigest()[:16]}
+    if METRICS_LOG_QUERIES:
+        attrs["query"] = query
+    return attrs
+
+
+def _open(key: Tuple) -> None:
+    if not hasattr(_local, "open"):
+        _local.open = {}
+    _local.open[key] = (time.time(), time.perf_counter())
+
+
+def _close(key: Tuple, kind: str, name: str, error: Optional[str] = None, **attrs: Any) -> None:
+    opened = getattr(_local, "open", {}).pop(key, None)
+    if opened is not None:
+        registry.record(Span(kind, name, opened[0], time.perf_counter() - opened[1], _run_id.get(),
+                             getattr(_local, "task", None), error, attrs))
+
+
+def route_name(model: str) -> str:
+    """LLM spans are named by route: the agent running on this thread and the model it called."""
+    agent = getattr(_local, "agent", None)
+    return f"{agent} · {model}" if agent else model
+
+
+_prices: Dict[str, Tuple[float, float]] = {}
+
+
+def llm_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Cost in USD from litellm's price table; 0 for models it doesn't know."""
+    if model not in _prices:
+        try:
+            import litellm
+
+            info = litellm.model_cost.get(model) or litellm.model_cost.get(model.split("/", 1)[-1]) or {}
+        except ImportError:
+            info = {}
+        _prices[model] = (info.get("input_cost_per_token") or 0.0, info.get("output_cost_per_token") or 0.0)
+    input_price, output_price = _prices[model]
+    return prompt_tokens * input_price + completion_tokens * output_price
+
+
+_installed = False
+_install_lock = threading.Lock()
+
+
+def install_crewai_instrumentation() -> None:
+    """Record task, agent, LLM-call and tool-call spans from crewai's event bus."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        from crewai.utilities.events import (
+            AgentExecutionCompletedEvent,
+            AgentExecutionErrorEvent,
+            AgentExecutionStartedEvent,
+            LLMCallCompletedEvent,
+            LLMCallFailedEvent,
+            LLMCallStartedEvent,
+            TaskCompletedEvent,
+            TaskFailedEvent,
+            TaskStartedEvent,
+            ToolUsageErrorEvent,
+            ToolUsageFinishedEvent,
+            ToolUsageStartedEvent,
+            crewai_event_bus,
+        )
+
+        def task_of(source, event):
+            task = getattr(event, "task", None) or source
+            return task, getattr(task, "name", None) or "task"
+
+        @crewai_event_bus.on(TaskStartedEvent)
+        def on_task_started(source, event):
+            task, name = task_of(source, event)
+            _local.task = name
+            _open(("task", id(task)))
+
+        @crewai_event_bus.on(TaskCompletedEvent)
+        def on_task_completed(source, event):
+            task, name = task_of(source, event)
+            _close(("task", id(task)), "task", name)
+
+        @crewai_event_bus.on(TaskFailedEvent)
+        def on_task_failed(source, event):
+            task, name = task_of(source, event)
+            _close(("task", id(task)), "task", name, error=str(getattr(event, "error", "")))
+
+        @crewai_event_bus.on(AgentExecutionStartedEvent)
+        def on_agent_started(source, event):
+            _local.agent = event.agent.role.strip()
+            _open(("agent", id(event.agent)))
+
+        @crewai_event_bus.on(AgentExecutionCompletedEvent)
+        def on_agent_completed(source, event):
+            _close(("agent", id(event.agent)), "agent", event.agent.role)
+
+        @crewai_event_bus.on(AgentExecutionErrorEvent)
+        def on_agent_error(source, event):
+            _close(("agent", id(event.agent)), "agent", event.agent.role, error=str(event.error))
+
+        @crewai_event_bus.on(LLMCallStartedEvent)
+        def on_llm_started(source, event):
+            messages = event.messages if isinstance(event.messages, list) else [{"content": event.messages}]
+            _local.prompt_tokens = sum(estimate_tokens(str(m.get("content", ""))) for m in messages)
+            _open(("llm", id(source)))
+
+        @crewai_event_bus.on(LLMCallCompletedEvent)
+        def on_llm_completed(source, event):
+            model = getattr(source, "model", None) or "unknown"
+            prompt_tokens = getattr(_local, "prompt_tokens", 0)
+            completion_tokens = estimate_tokens(str(event.response))
+            _close(("llm", id(source)), "llm", route_name(model), model=model, prompt_tokens=prompt_tokens,
+                   completion_tokens=completion_tokens,
+                   cost_usd=llm_cost(model, prompt_tokens, completion_tokens))
+
+        @crewai_event_bus.on(LLMCallFailedEvent)
+        def on_llm_failed(source, event):
+            model = getattr(source, "model", None) or "unknown"
+            _close(("llm", id(source)), "llm", route_name(model), model=model, error=str(event.error))
+
+        @crewai_event_bus.on(ToolUsageStartedEvent)
+        def on_tool_started(source, event):
+            _open(("tool", event.tool_name))
+
+        @crewai_event_bus.on(ToolUsageFinishedEvent)
+        def on_tool_finished(source, event):
+            _close(("tool", event.tool_name), "tool", event.tool_name, from_cache=getattr(event, "from_cache", False))
+
+        @crewai_event_bus.on(ToolUsageErrorEvent)
+        def on_tool_error(source, event):
+            _close(("tool", event.tool_name), "tool", event.tool_name, error=str(event.error))
+
+        _installed = True
+
+
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def start_metrics_server(port: Optional[int] = None, host: str = METRICS_HOST) -> Optional[ThreadingHTTPServer]:
+    """Serve ``/metrics`` in Prometheus text format on ``host``:``port`` (default METRICS_PORT); once per process."""
+    global _server
+    port = port if port is not None else (int(METRICS_PORT) if METRICS_PORT else None)
+    with _install_lock:
+        if _server is not None or port is None:
+            return _server
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        _server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=_server.serve_forever, daemon=True, name="metrics-server").start()
+    return _server
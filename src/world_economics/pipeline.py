@@ -0,0 +1,174 @@
+import os
+from typing import Callable, Dict, List, Optional
+
+from crewai import Crew, Process, Task
+from crewai.agents.agent_builder.base_agent import BaseAgent
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
+
+from .compaction import CONTEXT_COMPACTION, compact
+from .crew import WorldEconomicsCrew
+from .events import STAGE, TASK_COMPLETED, emit, install_crewai_listeners
+from .fanout import merge_findings, plan_subqueries, run_fanout
+from .memo import TaskMemo
+from .metrics import install_crewai_instrumentation, span
+from .routing import ROUTER_CONFIDENCE, ROUTER_FAST_PATH, classify_query, model_for
+
+FANOUT_ENABLED = os.getenv("RESEARCH_FANOUT", "1") == "1"
+
+# Report tasks in execution order, with the agent (crew method name) that runs each.
+STAGES = {
+    "user_analysis_task": "user_analyst",
+    "research_task": "data_researcher",
+    "analysis_task": "economic_analyst",
+    "reporting_task": "response_writer",
+}
+
+
+def _kickoff(agents: List[BaseAgent], tasks: List[Task], inputs: Dict[str, str]) -> CrewOutput:
+    return Crew(agents=agents, tasks=tasks, process=Process.sequential, verbose=True).kickoff(inputs=inputs)
+
+
+def _preset_output(task: Task, raw: str, agent: BaseAgent) -> None:
+    """Give ``task`` an output produced outside crewai, so downstream tasks can use it as context."""
+    task.output = TaskOutput(description=task.description, raw=raw, agent=agent.role)
+    if task.output_file:
+        with open(task.output_file, "w") as f:
+            f.write(raw)
+    emit(TASK_COMPLETED, task.name, output=raw)
+
+
+def _compact_context(task: Task, budget: int, query: str) -> None:
+    """Replace ``task``'s output, as later tasks will see it, with a version of at most ~``budget`` tokens."""
+    with span("compaction", task.name) as attrs:
+        result = compact(task.output.raw, budget, query)
+        attrs.update(tokens_before=result.tokens_before, tokens_after=result.tokens_after,
+                     duplicates=result.duplicates, dropped=result.dropped)
+    if result.text != task.output.raw:
+        task.output = task.output.model_copy(update={"raw": result.text})
+    emit(STAGE, task.name, stage="compaction", tokens_before=result.tokens_before, tokens_after=result.tokens_after)
+
+
+def run_pipeline(
+    crew_base: WorldEconomicsCrew,
+    inputs: Dict[str, str],
+    fanout: bool = FANOUT_ENABLED,
+    save_output: Optional[Callable[[str, str], None]] = None,
+    fast_path: bool = ROUTER_FAST_PATH,
+    compaction: bool = CONTEXT_COMPACTION,
+    memo: Optional[TaskMemo] = None,
+    reuse_outputs: bool = True,
+    rerun_from: Optional[str] = None,
+    on_reuse: Optional[Callable[[str], None]] = None,
+) -> CrewOutput:
+    """Run the report tasks stage by stage.
+
+    With ``fast_path``, a query the local classifier is confident about gets
+    its intent summary without the user_analysis_task LLM round-trip.
+    When the user analysis names several regions or topics, research is split
+    into one sub-task per focus, run concurrently, and the merged findings
+    become research_task's output for analysis_task to consume. Each task's
+    output is handed to ``save_output(task_name, raw)`` as soon as it exists.
+    With ``compaction``, outputs are then cut to the crew's ``context_budgets``
+    before later tasks receive them as context.
+
+    With a ``memo``, every executed task's output is stored there. With
+    ``reuse_outputs`` as well, a task whose config, agent, model, inputs and
+    context are unchanged since an earlier run gets that run's output back
+    instead of executing; each reused task is reported to ``on_reuse``.
+    ``rerun_from`` forces the named task and all later ones to execute
+    regardless.
+    """
+    forced = set(list(STAGES)[list(STAGES).index(rerun_from):]) if rerun_from else set()
+
+    def memo_key(task: Task) -> Optional[str]:
+        if memo is None:
+            return None
+        agent_name = STAGES[task.name]
+        context = task.context if isinstance(task.context, list) else []
+        return TaskMemo.key(
+            crew_base.tasks_config[task.name],
+            crew_base.agents_config[agent_name],
+            model_for(agent_name),
+            inputs,
+            [t.output.raw for t in context if t.output is not None],
+            [tool.name for tool in getattr(crew_base, agent_name)().tools or []],
+        )
+
+    def reuse(task: Task, key: Optional[str]) -> bool:
+        """Preset ``task``'s stored output if the memo has one for ``key``."""
+        if key is None or not reuse_outputs or task.name in forced:
+            return False
+        with span("memo", task.name) as attrs:
+            raw = memo.get(task.name, key)
+            attrs["hit"] = raw is not None
+        if raw is None:
+            return False
+        emit(STAGE, task.name, stage="memo_hit")
+        _preset_output(task, raw, getattr(crew_base, STAGES[task.name])())
+        if on_reuse is not None:
+            on_reuse(task.name)
+        return True
+
+    def remember(task: Task, key: Optional[str]) -> None:
+        if key is not None:
+            memo.put(key, task.output.raw)
+
+    def record(*tasks: Task) -> None:
+        for t in tasks:
+            if save_output is not None:
+                save_output(t.name, t.output.raw)
+            if compaction and t.name in crew_base.context_budgets:
+                _compact_context(t, crew_base.context_budgets[t.name], inputs["user_query"])
+
+    install_crewai_listeners()
+    install_crewai_instrumentation()
+    user_analysis_task = crew_base.user_analysis_task()
+    intent = None
+    if fast_path:
+        with span("route", "user_analysis_task · local") as attrs:
+            intent = classify_query(inputs["user_query"])
+            attrs["confidence"] = intent.confidence
+    if intent is not None and intent.confidence >= ROUTER_CONFIDENCE:
+        emit(STAGE, "user_analysis_task", stage="fast_path", confidence=intent.confidence)
+        _preset_output(user_analysis_task, intent.summary(), crew_base.user_analyst())
+    else:
+        key = memo_key(user_analysis_task)
+        if not reuse(user_analysis_task, key):
+            _kickoff([crew_base.user_analyst()], [user_analysis_task], inputs)
+            remember(user_analysis_task, key)
+    record(user_analysis_task)
+
+    research_task = crew_base.research_task()
+    key = memo_key(research_task)
+    if not reuse(research_task, key):
+        focuses = plan_subqueries(user_analysis_task.output.raw) if fanout else []
+        if len(focuses) > 1:
+            def research(focus: str) -> str:
+                task = crew_base.research_subtask(focus)
+                return _kickoff([task.agent], [task], inputs).raw
+
+            emit(STAGE, "research_task", stage="research_fanout", focuses=focuses)
+            merged = merge_findings(run_fanout(focuses, research))
+            _preset_output(research_task, merged, crew_base.data_researcher())
+        else:
+            _kickoff([crew_base.data_researcher()], [research_task], inputs)
+        remember(research_task, key)
+    record(research_task)
+
+    analysis_task = crew_base.analysis_task()
+    key = memo_key(analysis_task)
+    if not reuse(analysis_task, key):
+        _kickoff([crew_base.economic_analyst()], [analysis_task], inputs)
+        remember(analysis_task, key)
+    record(analysis_task)
+
+    reporting_task = crew_base.reporting_task()
+    key = memo_key(reporting_task)
+    if reuse(reporting_task, key):
+        result = CrewOutput(raw=reporting_task.output.raw, tasks_output=[reporting_task.output])
+    else:
+        result = _kickoff([crew_base.response_writer()], [reporting_task], inputs)
+        remember(reporting_task, key)
+    record(reporting_task)
+    return result
@@ -0,0 +1,236 @@
+import heapq
+import itertools
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from .metrics import record, registry
+
+RATE_LIMIT_RETRIES = int(os.getenv("RATE_LIMIT_RETRIES", 5))
+RATE_LIMIT_BACKOFF = float(os.getenv("RATE_LIMIT_BACKOFF", 2))
+RATE_LIMIT_MAX_BACKOFF = float(os.getenv("RATE_LIMIT_MAX_BACKOFF", 60))
+
+T = TypeVar("T")
+
+# exception classes providers and their SDKs raise for throttling, matched by name along the MRO
+_RATE_LIMIT_ERRORS = {"RateLimitError", "ResourceExhausted", "TooManyRequests"}
+_RATE_LIMIT_TEXT = re.compile(
+    r"\b(?:rate[ _-]?limit(?:ed|s)?|too many requests|resource[ _]exhausted|quota exceeded)\b"
+    r"|\b(?:status[ _]?code|code|error|http)\W{0,3}429\b",
+    re.IGNORECASE,
+)
+
+
+class Priority(IntEnum):
+    """Lower values are served first when callers queue for the same provider."""
+    INTERACTIVE = 0
+    REPORT = 1
+    BATCH = 2
+
+
+_priority: ContextVar[Priority] = ContextVar("rate_limit_priority", default=Priority.REPORT)
+
+
+@contextmanager
+def priority(level: Priority) -> Iterator[None]:
+    """Queue the LLM and search calls made in this context at ``level``."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Priority:
+    return _priority.get()
+
+
+def quota(provider: str) -> Optional[Tuple[float, float]]:
+    """``(requests per minute, burst)`` from RATE_LIMIT_<PROVIDER>, e.g. ``RATE_LIMIT_GEMINI=15`` or ``=60:10``.
+
+    None means the provider has no configured quota; calls are then only
+    retried when the provider reports a rate limit.
+    """
+    spec = os.getenv(f"RATE_LIMIT_{re.sub(r'[^A-Z0-9]', '_', provider.upper())}")
+    if not spec:
+        return None
+    rpm, _, burst = spec.partition(":")
+    return float(rpm), float(burst) if burst else max(1.0, float(rpm) / 6)
+
+
+_providers: Dict[str, str] = {}
+
+
+def provider_of(model: Optional[str]) -> str:
+    """The provider litellm routes ``model`` to (``gpt-4o`` -> ``openai``, ``gemini/gemini-2.0-flash`` -> ``gemini``).
+
+    "default" when litellm can't resolve the name.
+    """
+    if not model:
+        return "default"
+    if model not in _providers:
+        try:
+            from litellm import get_llm_provider
+
+            _providers[model] = get_llm_provider(model)[1].lower()
+        except Exception:
+            _providers[model] = "default"
+    return _providers[model]
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Whether ``error`` is a provider's rate-limit response: HTTP 429, a throttling exception type or message."""
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    if status == 429 or any(cls.__name__ in _RATE_LIMIT_ERRORS for cls in type(error).__mro__):
+        return True
+    return _RATE_LIMIT_TEXT.search(str(error)) is not None
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after") or headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class _Bucket:
+    def __init__(self, rpm: Optional[float], burst: Optional[float]):
+        self.rate = rpm / 60 if rpm else None
+        self.capacity = burst or 1.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.waiters: List[Tuple[int, int]] = []  # heap of (priority, arrival)
+        self.stats = {"acquired": 0, "waited": 0, "wait_s": 0.0, "throttled": 0, "retries": 0, "failed": 0, "max_depth": 0}
+
+    def delay(self, now: float) -> float:
+        """Seconds until a call may start; takes a token and returns 0 when it can start now."""
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.rate is None:
+            return 0.0
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Process-wide token buckets with a priority queue per provider.
+
+    Every LLM and search call goes through ``call``: it waits for a token
+    from its provider's bucket, where the highest-priority (then oldest)
+    waiter is always served first, and retries calls the provider rejected
+    with a rate limit using jittered exponential backoff. A rate-limit
+    response also pauses the whole provider for the backoff period, so
+    concurrent callers back off together instead of piling on.
+    """
+
+    def __init__(self, retries: int = RATE_LIMIT_RETRIES, backoff: float = RATE_LIMIT_BACKOFF,
+                 max_backoff: float = RATE_LIMIT_MAX_BACKOFF):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._buckets: Dict[str, _Bucket] = {}
+        self._arrivals = itertools.count()
+        self._cond = threading.Condition()
+
+    def _bucket(self, provider: str) -> _Bucket:
+        bucket = self._buckets.get(provider)
+        if bucket is None:
+            bucket = self._buckets[provider] = _Bucket(*(quota(provider) or (None, None)))
+        return bucket
+
+    def acquire(self, provider: str, level: Optional[Priority] = None) -> float:
+        """Block until ``provider`` may be called; returns the seconds spent waiting."""
+        entry = (int(_priority.get() if level is None else level), next(self._arrivals))
+        started = time.monotonic()
+        with self._cond:
+            bucket = self._bucket(provider)
+            heapq.heappush(bucket.waiters, entry)
+            bucket.stats["max_depth"] = max(bucket.stats["max_depth"], len(bucket.waiters))
+            while True:
+                if bucket.waiters[0] == entry:
+                    wait = bucket.delay(time.monotonic())
+                    if wait == 0:
+                        heapq.heappop(bucket.waiters)
+                        self._cond.notify_all()
+                        break
+                else:
+                    wait = None  # woken when the head of the queue is served
+                self._cond.wait(wait)
+            waited = time.monotonic() - started
+            bucket.stats["acquired"] += 1
+            if waited > 0.001:
+                bucket.stats["waited"] += 1
+                bucket.stats["wait_s"] += waited
+        if waited > 0.001:
+            record("queue", provider, time.time() - waited, waited, priority=Priority(entry[0]).name.lower())
+        return waited
+
+    def pause(self, provider: str, seconds: float) -> None:
+        """Hold every caller of ``provider`` for ``seconds`` (after a rate-limit response)."""
+        with self._cond:
+            bucket = self._bucket(provider)
+            bucket.paused_until = max(bucket.paused_until, time.monotonic() + seconds)
+            bucket.tokens, bucket.updated = 0.0, bucket.paused_until
+            self._cond.notify_all()
+
+    def call(self, provider: str, fn: Callable[[], T], level: Optional[Priority] = None) -> T:
+        """Run ``fn`` under ``provider``'s quota, retrying rate-limit failures with backoff."""
+        for attempt in range(self.retries + 1):
+            self.acquire(provider, level)
+            try:
+                return fn()
+            except Exception as e:
+                if not is_rate_limited(e):
+                    raise
+                with self._cond:
+                    stats = self._bucket(provider).stats
+                    stats["throttled"] += 1
+                    if attempt == self.retries:
+                        stats["failed"] += 1
+                        raise
+                    stats["retries"] += 1
+                delay = _retry_after(e) or min(self.max_backoff, self.backoff * 2 ** attempt)
+                self.pause(provider, delay * random.uniform(0.5, 1.5))
+        raise AssertionError("unreachable")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Counters and current queue depth per provider."""
+        with self._cond:
+            return {
+                provider: {
+                    **bucket.stats,
+                    "queued": len(bucket.waiters),
+                    "rpm": bucket.rate * 60 if bucket.rate else None,
+                }
+                for provider, bucket in self._buckets.items()
+            }
+
+    def prometheus_text(self) -> str:
+        lines = [
+            "# HELP world_economics_rate_limit_queue_depth Calls waiting for a provider token.",
+            "# TYPE world_economics_rate_limit_queue_depth gauge",
+        ]
+        stats = self.stats()
+        for provider, s in sorted(stats.items()):
+            lines.append(f'world_economics_rate_limit_queue_depth{{provider="{provider}"}} {s["queued"]}')
+        lines += ["# HELP world_economics_rate_limit_throttled_total Calls the provider rejected with a rate limit.",
+                  "# TYPE world_economics_rate_limit_throttled_total counter"]
+        for provider, s in sorted(stats.items()):
+            lines.append(f'world_economics_rate_limit_throttled_total{{provider="{provider}"}} {s["throttled"]}')
+        return "\n".join(lines) + "\n"
+
+
+rate_limiter = RateLimiter()
+registry.add_collector(rate_limiter.prometheus_text)
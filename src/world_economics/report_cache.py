@@ -0,0 +1,140 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from .cache import cache_path, normalize_query, query_tokens
+from .routing import find_regions
+
+
+def shingles(query: str, size: int = 2) -> FrozenSet[str]:
+    """Word unigrams plus word n-grams of the query's content tokens."""
+    tokens = query_tokens(query)
+    grams = set(tokens)
+    for n in range(2, size + 1):
+        grams.update(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+    return frozenset(grams)
+
+
+def entities(query: str) -> Tuple[Tuple[str, ...], FrozenSet[str], FrozenSet[str]]:
+    """What a rephrasing must keep to ask the same question.
+
+    These are the regions in the order they are named, other capitalized
+    names and acronyms, and the numbers in the query.
+    """
+    words = re.findall(r"[\w.%$]+", " ".join(query.split()))
+    names = frozenset(w.lower() for w in words[1:] if w[:1].isupper())
+    numbers = frozenset(re.findall(r"\d+(?:\.\d+)?", query))
+    return tuple(find_regions(query)), names, numbers
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class ReportCache:
+    """Stores finished reports keyed on normalized query + year.
+
+    Lookups try the exact normalized key first. When ``similarity_threshold``
+    is below 1.0 (0.9 by default), they fall back to the freshest report for
+    the same year whose query shingles overlap at least that much and that
+    names the same regions, in the same order, plus the same other names and
+    numbers. Shared filler words alone can't make a report for Asia answer a
+    question about Africa, and at 0.9 a single changed content word
+    ("exports" for "imports") is already a miss.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_age: Optional[float] = None,
+        similarity_threshold: Optional[float] = None,
+    ):
+        self.path = path or cache_path("reports.sqlite3")
+        self.max_age = max_age if max_age is not None else float(os.getenv("REPORT_CACHE_MAX_AGE", 24 * 3600))
+        self.similarity_threshold = (
+            similarity_threshold
+            if similarity_threshold is not None
+            else float(os.getenv("REPORT_CACHE_SIMILARITY", 0.9))
+        )
+        self._lock = threading.Lock()
+        self._stats = {"exact_hits": 0, "similar_hits": 0, "misses": 0, "writes": 0}
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS reports ("
+            "key TEXT PRIMARY KEY, year TEXT NOT NULL, query TEXT NOT NULL, "
+            "shingles TEXT NOT NULL, report TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS reports_year ON reports(year, created_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def key(user_query: str, current_year: str) -> str:
+        return f"{current_year}::{normalize_query(user_query)}"
+
+    def get(self, user_query: str, current_year: str) -> Optional[str]:
+        oldest = time.time() - self.max_age
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT report FROM reports WHERE key = ? AND created_at > ?",
+                (self.key(user_query, current_year), oldest),
+            ).fetchone()
+            if row is not None:
+                self._stats["exact_hits"] += 1
+                return row[0]
+
+            if self.similarity_threshold < 1.0:
+                wanted, wanted_entities = shingles(user_query), entities(user_query)
+                best_score, best_key = 0.0, None
+                rows = self._conn.execute(
+                    "SELECT key, query, shingles FROM reports WHERE year = ? AND created_at > ? "
+                    "ORDER BY created_at DESC",
+                    (str(current_year), oldest),
+                ).fetchall()
+                for key, query, stored in rows:
+                    score = jaccard(wanted, frozenset(json.loads(stored)))
+                    if score > best_score and score >= self.similarity_threshold and entities(query) == wanted_entities:
+                        best_score, best_key = score, key
+                if best_key is not None:
+                    self._stats["similar_hits"] += 1
+                    return self._conn.execute("SELECT report FROM reports WHERE key = ?", (best_key,)).fetchone()[0]
+
+            self._stats["misses"] += 1
+            return None
+
+    def age(self, user_query: str, current_year: str) -> Optional[float]:
+        """Seconds since the exact-key report was stored, or None if there is none (not counted in stats)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at FROM reports WHERE key = ?", (self.key(user_query, current_year),)
+            ).fetchone()
+        return time.time() - row[0] if row is not None else None
+
+    def put(self, user_query: str, current_year: str, report: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO reports (key, year, query, shingles, report, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self.key(user_query, current_year),
+                    str(current_year),
+                    user_query,
+                    json.dumps(sorted(shingles(user_query))),
+                    report,
+                    time.time(),
+                ),
+            )
+            self._conn.execute("DELETE FROM reports WHERE created_at <= ?", (time.time() - self.max_age,))
+            self._conn.commit()
+            self._stats["writes"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = self._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+        return stats
@@ -0,0 +1,134 @@
+import hashlib
+import math
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .cache import query_tokens
+from .tokens import estimate_tokens, truncate_to_tokens
+
+CHAT_TOP_K = int(os.getenv("CHAT_TOP_K", 4))
+CHAT_CONTEXT_TOKENS = int(os.getenv("CHAT_CONTEXT_TOKENS", 1500))
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+
+
+@dataclass
+class Chunk:
+    position: int
+    heading: str
+    text: str
+    tokens: int
+
+
+def chunk_report(report: str, max_tokens: int = 300) -> List[Chunk]:
+    """Split a markdown report into heading-scoped sections of at most ~``max_tokens``."""
+    sections = []
+    path: List[str] = []
+    body: List[str] = []
+    lines = report.splitlines()
+    # depth relative to the shallowest heading, so H2 siblings in a report without an H1 don't nest
+    top = min((len(m.group(1)) for m in map(_HEADING.match, lines) if m), default=1)
+
+    def flush():
+        text = "\n".join(body).strip()
+        if text:
+            sections.append((" > ".join(path), text))
+        body.clear()
+
+    for line in lines:
+        match = _HEADING.match(line)
+        if match:
+            flush()
+            depth = len(match.group(1)) - top
+            path[depth:] = [match.group(2).strip(" #*")]
+        else:
+            body.append(line)
+    flush()
+
+    chunks: List[Chunk] = []
+    for heading, text in sections:
+        part: List[str] = []
+        for paragraph in re.split(r"\n\s*\n", text):
+            if part and estimate_tokens("\n\n".join(part + [paragraph])) > max_tokens:
+                chunks.append(_chunk(len(chunks), heading, "\n\n".join(part)))
+                part = []
+            part.append(paragraph)
+        if part:
+            chunks.append(_chunk(len(chunks), heading, "\n\n".join(part)))
+    return chunks
+
+
+def _chunk(position: int, heading: str, text: str) -> Chunk:
+    text = f"## {heading}\n{text}" if heading else text
+    return Chunk(position, heading, text, estimate_tokens(text))
+
+
+class ReportIndex:
+    """BM25 index over the sections of one report."""
+
+    def __init__(self, report: str, k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunk_report(report)
+        self.k1 = k1
+        self.b = b
+        self._terms = [Counter(query_tokens(c.text)) for c in self.chunks]
+        self._lengths = [sum(t.values()) for t in self._terms]
+        self._avg_length = sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        df = Counter(term for terms in self._terms for term in terms)
+        n = len(self.chunks)
+        self._idf = {term: math.log(1 + (n - freq + 0.5) / (freq + 0.5)) for term, freq in df.items()}
+
+    def search(self, query: str, k: int = CHAT_TOP_K) -> List[Chunk]:
+        terms = set(query_tokens(query))
+        scored = []
+        for chunk, tf, length in zip(self.chunks, self._terms, self._lengths):
+            score = 0.0
+            for term in terms:
+                freq = tf.get(term)
+                if freq:
+                    norm = self.k1 * (1 - self.b + self.b * length / (self._avg_length or 1))
+                    score += self._idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            if score > 0:
+                scored.append((score, chunk))
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        return [chunk for _, chunk in scored[:k]]
+
+    def context(self, query: str, k: int = CHAT_TOP_K, token_budget: int = CHAT_CONTEXT_TOKENS) -> str:
+        """Top-k relevant sections, in report order, within ``token_budget``.
+
+        The budget is filled best match first, skipping sections that don't
+        fit, so a long low-ranked section can't crowd out the best one.
+        Falls back to the opening sections when nothing matches the query.
+        """
+        selected = self.search(query, k) or self.chunks[:k]
+        kept, used = [], 0
+        for chunk in selected:
+            if used + chunk.tokens <= token_budget:
+                kept.append(chunk)
+                used += chunk.tokens
+        if not kept:
+            return truncate_to_tokens(selected[0].text, token_budget) if selected else ""
+        return "\n\n".join(chunk.text for chunk in sorted(kept, key=lambda c: c.position))
+
+
+_indexes: "OrderedDict[str, ReportIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def index_for(report: str, max_indexes: int = 16) -> ReportIndex:
+    """The index of ``report``, built once per distinct report content."""
+    key = hashlib.sha1(report.encode()).hexdigest()
+    with _indexes_lock:
+        index: Optional[ReportIndex] = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+    index = ReportIndex(report)
+    with _indexes_lock:
+        _indexes[key] = index
+        while len(_indexes) > max_indexes:
+            _indexes.popitem(last=False)
+    return index
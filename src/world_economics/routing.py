@@ -0,0 +1,197 @@
+import os
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .cache import query_tokens
+
+ROUTER_FAST_PATH = os.getenv("ROUTER_FAST_PATH", "1") == "1"
+ROUTER_CONFIDENCE = float(os.getenv("ROUTER_CONFIDENCE", 0.75))
+
+# Agents whose model can be set on its own with MODEL_<AGENT>, e.g. MODEL_ECONOMIC_ANALYST.
+ROUTED_AGENTS = ("user_analyst", "data_researcher", "economic_analyst", "response_writer", "chat")
+
+
+_overrides: ContextVar[Mapping[str, str]] = ContextVar("model_overrides", default={})
+
+
+@contextmanager
+def override_models(models: Optional[Mapping[str, str]]) -> Iterator[None]:
+    """Assign models for the calls made in this context only, without touching the environment.
+
+    Keys are routed agent names or ``default`` (in place of MODEL); they win
+    over the MODEL and MODEL_<AGENT> variables.
+    """
+    token = _overrides.set(dict(models or {}))
+    try:
+        yield
+    finally:
+        _overrides.reset(token)
+
+
+def model_for(agent: str) -> Optional[str]:
+    """The model assigned to ``agent``: an override from override_models, else MODEL_<AGENT>, else MODEL."""
+    overrides = _overrides.get()
+    return (
+        overrides.get(agent) or overrides.get("default")
+        or os.getenv(f"MODEL_{agent.upper()}") or os.getenv("MODEL")
+    )
+
+
+def model_routes() -> Tuple[Optional[str], ...]:
+    """Current model of every routed agent; changes whenever any assignment changes."""
+    return tuple(model_for(agent) for agent in ROUTED_AGENTS)
+
+
+_CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    "macro": (
+        "inflation", "gdp", "growth", "recession", "interest rate", "unemployment", "employment",
+        "monetary", "fiscal", "debt", "deficit", "exchange rate", "currency", "trade", "exports", "imports",
+        "capital flows", "bond", "yields", "central bank", "economy", "economies", "productivity", "wages",
+    ),
+    "micro": (
+        "firm", "company", "companies", "pricing", "price elasticity", "elasticity", "market share",
+        "competition", "monopoly", "consumer", "supply chain", "industry", "startup", "household",
+        "demand curve", "cost structure",
+    ),
+    "policy": (
+        "policy", "policies", "regulation", "tariff", "tax", "subsidy", "subsidies",
+        "sanctions", "stimulus", "reform", "legislation", "rate hike", "rate cut",
+    ),
+    "data": (
+        "how much", "how many", "what is the", "what was the", "statistics", "figure", "data",
+        "latest", "current level", "percentage", "rate in", "compare", "ranking", "trend",
+    ),
+}
+
+_REGIONS = (
+    "United States", "China", "Japan", "Germany", "India", "United Kingdom", "France", "Italy", "Brazil", "Canada",
+    "Russia", "South Korea", "Australia", "Spain", "Mexico", "Indonesia", "Netherlands", "Saudi Arabia", "Turkey",
+    "Switzerland", "Poland", "Argentina", "Sweden", "Norway", "Belgium", "Ireland", "Israel", "Nigeria", "Egypt",
+    "South Africa", "Kenya", "Ethiopia", "Ghana", "Pakistan", "Bangladesh", "Vietnam", "Thailand", "Malaysia",
+    "Philippines", "Singapore", "Chile", "Colombia", "Peru", "Venezuela", "Iran", "Iraq", "United Arab Emirates",
+    "Qatar", "Ukraine", "Greece", "Portugal", "New Zealand", "Sri Lanka", "Nepal", "Taiwan", "Hong Kong",
+    "Eurozone", "European Union", "Europe", "Asia", "Africa", "Latin America", "Middle East", "Southeast Asia",
+    "Sub-Saharan Africa", "Global South", "emerging economies", "emerging markets", "developing countries",
+    "advanced economies", "G7", "G20", "BRICS", "OPEC", "ASEAN", "world", "global",
+)
+_ALIASES = {
+    "u.s.": "United States", "usa": "United States", "america": "United States",
+    "uk": "United Kingdom", "britain": "United Kingdom", "eu": "European Union", "euro area": "Eurozone",
+    "uae": "United Arab Emirates", "korea": "South Korea", "emerging market": "emerging markets",
+}
+
+_DATA_NEEDS = (
+    ("inflation", "CPI inflation"), ("gdp", "GDP and growth rates"), ("growth", "GDP and growth rates"),
+    ("interest rate", "policy interest rates"), ("rate hike", "policy interest rates"),
+    ("unemployment", "unemployment rate"), ("exchange rate", "exchange rates"), ("currency", "exchange rates"),
+    ("debt", "government debt"), ("trade", "trade balance"), ("exports", "trade balance"),
+    ("capital flows", "capital flows"), ("bond", "bond yields and spreads"), ("yields", "bond yields and spreads"),
+)
+
+
+# Question phrasing that carries no economic content, so it doesn't count against coverage.
+_QUESTION_WORDS = frozenset((
+    "why", "do", "does", "did", "will", "would", "can", "could", "should", "be", "been", "was", "were", "has", "have",
+    "its", "their", "this", "that", "these", "those", "with", "from", "by", "as", "at", "about", "between", "over",
+    "since", "after", "during", "which", "who", "me", "tell", "explain", "affect", "affects", "impact", "impacts",
+    "effect", "effects", "influence", "implications", "role", "change", "changes", "economic",
+))
+
+
+def _phrase_pattern(phrase: str) -> re.Pattern:
+    # whole words, allowing a plural ("tariff" matches "tariffs", "tax" matches "taxes")
+    return re.compile(r"(?<![\w.])" + re.escape(phrase.lower()) + r"(?:e?s)?(?![\w])")
+
+
+_PATTERNS = {phrase: _phrase_pattern(phrase) for phrases in _CATEGORIES.values() for phrase in phrases}
+_REGION_PATTERNS = [(name, _phrase_pattern(name)) for name in _REGIONS]
+_ALIAS_PATTERNS = [(name, _phrase_pattern(alias)) for alias, name in _ALIASES.items()]
+
+
+@dataclass
+class QueryIntent:
+    category: str
+    topics: List[str] = field(default_factory=list)
+    regions: List[str] = field(default_factory=list)
+    data_needs: List[str] = field(default_factory=list)
+    confidence: float = 0.0
+
+    def summary(self) -> str:
+        """The intent in the same shape user_analysis_task is asked to produce."""
+        return "\n".join([
+            f"- Economic category: {self.category}",
+            f"- Topic(s): {', '.join(self.topics) or 'general economic conditions'}",
+            f"- Region or country: {', '.join(self.regions) or 'global'}",
+            f"- Specific data needs: {', '.join(self.data_needs) or 'none specified'}",
+        ])
+
+
+def find_regions(user_query: str) -> List[str]:
+    """Countries and regions named in the query, in the order they are first mentioned."""
+    text = " ".join(user_query.split())
+    lowered = text.lower()
+    first: Dict[str, int] = {}
+    for name, pattern in _REGION_PATTERNS + _ALIAS_PATTERNS:
+        match = pattern.search(lowered)
+        if match and match.start() < first.get(name, len(text)):
+            first[name] = match.start()
+    us = re.search(r"\bU\.?S\.?A?\b", text)  # "US" only counts in capitals, not as the pronoun
+    if us and us.start() < first.get("United States", len(text)):
+        first["United States"] = us.start()
+    regions = sorted(first, key=first.get)
+    if "global" in regions and len(regions) > 1:
+        regions.remove("global")
+    return regions
+
+
+def classify_query(user_query: str) -> QueryIntent:
+    """Rule-based stand-in for user_analysis_task.
+
+    Confidence is high when the known phrases and regions account for most
+    of the query's words, there are several of them and one category
+    dominates. A single keyword in an otherwise unrecognized question
+    ("the dollar weakened against the yen as exports slowed") scores low, as
+    do vague or mixed queries and ones missing a topic or a region; those go
+    to the LLM.
+    """
+    text = " ".join(user_query.lower().split())
+    matches = {phrase for phrase, pattern in _PATTERNS.items() if pattern.search(text)}
+    scores = {category: sum(p in matches for p in phrases) for category, phrases in _CATEGORIES.items()}
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    (category, best), (_, runner_up) = ranked[0], ranked[1]
+
+    regions = find_regions(user_query)
+    topics = sorted(
+        {p for p in matches if p not in _CATEGORIES["data"]},
+        key=lambda phrase: _PATTERNS[phrase].search(text).start(),
+    )
+    # keep the longest of overlapping phrases ("interest rates" over "interest rate")
+    topics = [
+        t for t in topics
+        if not any(t != other and t in other for other in topics) and not any(t in r.lower() for r in regions)
+    ]
+    data_needs = list(dict.fromkeys(need for key, need in _DATA_NEEDS if key in matches))
+
+    # share of the query's content words the matched phrases and regions account for
+    known = {t for phrase in matches for t in query_tokens(phrase)}
+    known.update(t for region in regions for t in query_tokens(region))
+    known.update(t for alias, name in _ALIASES.items() if name in regions for t in query_tokens(alias))
+    if "United States" in regions:
+        known.update(("us", "u.s", "usa"))
+    content = [t for t in query_tokens(user_query) if t not in _QUESTION_WORDS and not t.isdigit()]
+    covered = sum(t in known or t[:-1] in known or t[:-2] in known for t in content)
+    coverage = covered / len(content) if content else 0.0
+
+    confidence = 0.0
+    if best:
+        dominance = (best - runner_up) / best
+        evidence = min(1.0, (len(matches) + len(regions)) / 3)
+        confidence = 0.2 * dominance + 0.2 * evidence + 0.6 * coverage
+    if not (regions and topics):
+        confidence = min(confidence, 0.6)
+    if len(query_tokens(user_query)) > 40:
+        confidence *= 0.8  # long, multi-part questions are better left to the model
+    return QueryIntent(category if best else "macro", topics, regions, data_needs, round(min(confidence, 1.0), 2))
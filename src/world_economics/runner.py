@@ -0,0 +1,190 @@
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .artifacts import ArtifactStore
+from .events import STAGE, emit
+from .factory import crew_factory
+from .history import REPORT_HISTORY, ReportHistory
+from .jobs import JobQueue
+from .memo import TASK_MEMO, TaskMemo
+from .metrics import bind_run, query_attrs, span
+from .ratelimit import current_priority
+from .routing import model_routes, override_models
+from .report_cache import ReportCache
+from .singleflight import Flight, SingleFlight
+
+FINAL_REPORT = "reporting_task"
+
+T = TypeVar("T")
+
+# the stores open their SQLite files and directories on first use, not when this module is imported
+_stores: Dict[str, Any] = {}
+_stores_lock = threading.Lock()
+
+
+def _store(name: str, create: Callable[[], T]) -> T:
+    with _stores_lock:
+        if name not in _stores:
+            _stores[name] = create()
+        return _stores[name]
+
+
+def get_artifacts() -> ArtifactStore:
+    return _store("artifacts", ArtifactStore)
+
+
+def get_report_cache() -> ReportCache:
+    return _store("report_cache", ReportCache)
+
+
+def get_task_memo() -> TaskMemo:
+    return _store("task_memo", TaskMemo)
+
+
+def get_report_history() -> ReportHistory:
+    return _store("report_history", ReportHistory)
+
+
+report_jobs = JobQueue(max_workers=int(os.getenv("REPORT_WORKERS", 2)))
+report_flights = SingleFlight()
+
+
+@dataclass
+class ReportResult:
+    run_id: str
+    report: str
+    cached: bool
+    elapsed: float
+    coalesced: bool = False
+    reused: List[str] = field(default_factory=list)  # tasks whose stored output was reused
+
+
+def generate_report(
+    user_query: str,
+    current_year: Optional[str] = None,
+    use_cache: bool = True,
+    reuse_tasks: Optional[bool] = None,
+    rerun_from: Optional[str] = None,
+    models: Optional[Dict[str, str]] = None,
+) -> ReportResult:
+    """Return a report for the query, serving it from the report cache when possible.
+
+    Task outputs are kept in the run-scoped artifact store under a fresh run id.
+    Concurrent requests for the same normalized question share one crew run.
+    Every executed task's output is stored in the task memo. With
+    ``reuse_tasks``, tasks whose inputs are unchanged since an earlier run
+    reuse that run's output (see memo.TaskMemo); ``rerun_from`` executes that
+    task and every later one regardless. By default tasks are reused only in
+    partial reruns (``rerun_from`` given) or with TASK_MEMO=1.
+    ``models`` assigns models to agents for this run only (see
+    routing.override_models).
+    """
+    started = time.perf_counter()
+    current_year = current_year or str(datetime.now().year)
+    if reuse_tasks is None:
+        reuse_tasks = TASK_MEMO or rerun_from is not None
+    artifacts, report_cache = get_artifacts(), get_report_cache()
+    run_id = artifacts.new_run()
+
+    with override_models(models), bind_run(run_id), span("run", "report") as attrs:
+        attrs["cached"] = False
+        # request log for cache warming (see warmup.top_queries), which skips batch and warm-up runs
+        attrs.update(query_attrs(user_query), priority=current_priority().name.lower())
+        if use_cache:
+            report = report_cache.get(user_query, current_year)
+            if report is not None:
+                attrs["cached"] = True
+                emit(STAGE, stage="cache_hit")
+                artifacts.put(run_id, FINAL_REPORT, report)
+                return ReportResult(run_id, report, True, time.perf_counter() - started)
+
+        def run() -> Tuple[str, str, List[str]]:
+            inputs = {
+                "user_query": user_query,
+                "current_year": current_year
+            }
+            from .pipeline import run_pipeline
+
+            reused: List[str] = []
+            with crew_factory.report_crew() as crew_base:
+                result = run_pipeline(
+                    crew_base,
+                    inputs,
+                    save_output=lambda name, raw: artifacts.put(run_id, name, raw),
+                    memo=get_task_memo(),
+                    reuse_outputs=reuse_tasks,
+                    rerun_from=rerun_from,
+                    on_reuse=reused.append,
+                )
+            report_cache.put(user_query, current_year, result.raw)
+            if REPORT_HISTORY:
+                used = ", ".join(dict.fromkeys(m for m in model_routes() if m))
+                get_report_history().add(run_id, user_query, current_year, result.raw, used, time.perf_counter() - started)
+            return run_id, result.raw, reused
+
+        # only runs that would produce the same report may share one: a refresh must not join a run
+        # that reuses stored task outputs or fills in from the cache
+        key = f"{ReportCache.key(user_query, current_year)}::cache={use_cache:d}::memo={reuse_tasks:d}"
+        if rerun_from:
+            key += f"::{rerun_from}"
+        if models:
+            key += "::" + ",".join(f"{agent}={model}" for agent, model in sorted(models.items()))
+        (leader_run_id, report, reused), shared = report_flights.run(key, run, on_join=_follow)
+        attrs["coalesced"] = shared
+        attrs["reused_tasks"] = len(reused)
+        if shared:
+            for name, content in artifacts.outputs(leader_run_id).items():
+                artifacts.put(run_id, name, content)
+    return ReportResult(run_id, report, False, time.perf_counter() - started, coalesced=shared, reused=reused)
+
+
+def _follow(flight: Flight) -> None:
+    """Mirror the in-flight run's progress into this job's event stream until it finishes."""
+    emit(STAGE, stage="coalesced")
+    if flight.events is None:
+        return
+    index = 0
+    while not flight.future.done():
+        events = flight.events.wait(index, timeout=0.5)
+        for event in events:
+            emit(event.type, event.task, **event.data)
+        index += len(events)
+
+
+def submit_report(
+    user_query: str,
+    current_year: Optional[str] = None,
+    use_cache: bool = True,
+    rerun_from: Optional[str] = None,
+    models: Optional[Dict[str, str]] = None,
+) -> str:
+    """Queue generate_report on the background worker pool and return the job id."""
+    return report_jobs.submit(
+        generate_report, user_query, current_year, use_cache,
+        rerun_from=rerun_from, models=models, description=user_query,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+
+    from .pipeline import STAGES
+
+    parser = argparse.ArgumentParser(
+        description="Regenerate a report, reusing stored outputs of tasks whose inputs haven't changed."
+    )
+    parser.add_argument("query", help="the question to report on")
+    parser.add_argument("--year", default=None, help="current_year input (default: this year)")
+    parser.add_argument("--from", dest="rerun_from", choices=list(STAGES), default=None,
+                        help="always execute this task and the ones after it")
+    args = parser.parse_args(argv)
+
+    # the report cache doesn't know about prompt or model changes, so always go through the task memo
+    result = generate_report(args.query, args.year, use_cache=False, reuse_tasks=True, rerun_from=args.rerun_from)
+    for name in STAGES:
+        print(f"{name:<20} {'reused' if name in result.reused else 'executed'}")
+    print(f"\nRun {result.run_id} finished in {result.elapsed:.1f}s\n\n{result.report}")
@@ -0,0 +1,66 @@
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .events import EventStream, current_stream
+
+
+@dataclass
+class Flight:
+    key: str
+    future: Future = field(default_factory=Future)
+    events: Optional[EventStream] = None
+    followers: int = 0
+
+
+class SingleFlight:
+    """Lets concurrent callers with the same key share a single execution.
+
+    The first caller runs ``fn``; callers arriving while it is in flight wait for
+    and return its result (or exception). The leader's event stream is kept on
+    the flight so followers can mirror its progress.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, Flight] = {}
+        self._lock = threading.Lock()
+        self._stats = {"executions": 0, "suppressed": 0}
+
+    def run(self, key: str, fn: Callable[[], Any], on_join: Optional[Callable[[Flight], None]] = None) -> Tuple[Any, bool]:
+        """Return ``(result, shared)``; ``shared`` is True when another caller's run was reused."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Flight(key, events=current_stream())
+                self._stats["executions"] += 1
+            else:
+                flight.followers += 1
+                self._stats["suppressed"] += 1
+
+        if not leader:
+            if on_join is not None:
+                on_join(flight)
+            return flight.future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            flight.future.set_exception(e)
+            raise
+        else:
+            flight.future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["in_flight"] = len(self._flights)
+            stats["waiting"] = sum(f.followers for f in self._flights.values())
+        requests = stats["executions"] + stats["suppressed"]
+        stats["suppression_rate"] = stats["suppressed"] / requests if requests else 0.0
+        return stats
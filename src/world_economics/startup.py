@@ -0,0 +1,72 @@
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# What the Streamlit app imports up front, what a report or chat run loads
+# later, and the heavy third-party packages behind them.
+DEFAULT_MODULES = [
+    "world_economics.runner",
+    "world_economics.jobs",
+    "world_economics.events",
+    "world_economics.factory",
+    "world_economics.tools.serper_tool",
+    "world_economics.crew",
+    "world_economics.pipeline",
+    "world_economics.chat",
+    "crewai",
+    "crewai_tools",
+    "streamlit",
+]
+
+_IMPORT_TIME = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_import(module: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """Cold import time of ``module`` in a fresh interpreter, in ms, plus its direct dependencies' times."""
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [src_dir, os.environ.get("PYTHONPATH")])))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"cannot import {module}")
+
+    # importtime lists a module's imports (indented one level deeper) just before the module itself
+    total = 0.0
+    children: Dict[str, float] = {}
+    pending: Dict[str, float] = {}
+    for line in proc.stderr.splitlines():
+        match = _IMPORT_TIME.match(line)
+        if not match:
+            continue
+        cumulative_ms = int(match.group(2)) / 1000
+        depth = len(match.group(3)) // 2
+        name = match.group(4)
+        if depth == 1:
+            pending[name] = cumulative_ms
+        elif depth == 0:
+            if name == module:
+                total, children = cumulative_ms, pending
+            pending = {}
+    top = sorted(children.items(), key=lambda item: item[1], reverse=True)[:5]
+    return total, top
+
+
+def report(modules: List[str]) -> str:
+    lines = [f"{'module':<40} {'import ms':>10}", "-" * 51]
+    for module in modules:
+        try:
+            total, top = measure_import(module)
+        except RuntimeError as e:
+            lines.append(f"{module:<40} {'error':>10}  {e}")
+            continue
+        lines.append(f"{module:<40} {total:>10.1f}")
+        for name, ms in top:
+            if ms >= 1.0:
+                lines.append(f"    {name:<36} {ms:>10.1f}")
+    return "\n".join(lines)
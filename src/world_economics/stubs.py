@@ -0,0 +1,184 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Union
+
+from crewai.llms.base_llm import BaseLLM
+
+STUB_MODEL = "stub/bench"
+
+_WORDS = (
+    "inflation growth rates policy capital flows currency exports demand credit "
+    "yields spreads employment output investment trade deficit reserves"
+).split()
+
+_INTENT = """- Economic category: macro
+- Topic(s): monetary policy, capital flows
+- Region or country: United States, Brazil, India
+- Specific data needs: policy rates, bond spreads"""
+
+
+def filler_text(tokens: int) -> str:
+    return " ".join(_WORDS[i % len(_WORDS)] for i in range(tokens))
+
+
+class StubLLM(BaseLLM):
+    """Offline stand-in for a chat model with fixed latency and output size.
+
+    Speaks crewai's ReAct format: when the prompt offers tools it first asks for
+    one tool call, then returns a final answer. Time spent "in the model" is
+    accumulated in ``simulated_seconds`` so callers can separate it from
+    orchestration overhead.
+    """
+
+    def __init__(self, model: str = STUB_MODEL, latency: float = 0.05, output_tokens: int = 200, stream: bool = False):
+        super().__init__(model=model)
+        self.latency = latency
+        self.output_tokens = output_tokens
+        self.stream = stream
+        self.calls = 0
+        self.simulated_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> str:
+        prompt = messages if isinstance(messages, str) else "\n".join(str(m.get("content", "")) for m in messages)
+        time.sleep(self.latency)
+        with self._lock:
+            self.calls += 1
+            self.simulated_seconds += self.latency
+
+        tool = re.search(r"Tool Name: (.+)", prompt)
+        if tool and "Observation:" not in prompt:
+            query = json.dumps({"search_query": f"stub query {self.calls}"})
+            return f"Thought: I should search for data.\nAction: {tool.group(1).strip()}\nAction Input: {query}"
+
+        body = _INTENT if "Classify the query" in prompt else filler_text(self.output_tokens)
+        answer = f"Thought: I now can give a great answer\nFinal Answer: {body}"
+        if self.stream:
+            self._emit_chunks(body)
+        return answer
+
+    def _emit_chunks(self, body: str) -> None:
+        from crewai.utilities.events import LLMStreamChunkEvent, crewai_event_bus
+
+        for word in body.split(" "):
+            crewai_event_bus.emit(self, event=LLMStreamChunkEvent(chunk=word + " "))
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return True
+
+    def get_context_window_size(self) -> int:
+        return 128000
+
+
+def stub_page(path: str) -> str:
+    """A small article with page chrome around it, as served for result links by StubSerperServer."""
+    paragraphs = "".join(f"<p>{filler_text(60)}</p>" for _ in range(5))
+    return (
+        f"<html><head><title>Stub page {path}</title><style>body {{ margin: 0 }}</style></head><body>"
+        f"<nav><a href='/'>Home</a> <a href='/about'>About</a></nav>"
+        f"<article><h1>Stub page {path}</h1>{paragraphs}</article>"
+        f"<footer>Copyright stub publisher, all rights reserved</footer><script>track();</script></body></html>"
+    )
+
+
+class StubSerperServer:
+    """Local HTTP server answering any POST with a Serper-shaped JSON result after ``latency`` seconds.
+
+    Result links point back at the server, whose GET handler serves an HTML
+    page per path with an ETag and answers conditional requests with 304.
+    """
+
+    def __init__(self, latency: float = 0.05, results: int = 10, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.results = results
+        self.requests = 0
+        self.page_requests = 0
+        self.simulated_seconds = 0.0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubSerperServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubSerperServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                query = json.loads(self.rfile.read(length) or b"{}").get("q", "")
+                time.sleep(server.latency)
+                with server._lock:
+                    server.requests += 1
+                    server.simulated_seconds += server.latency
+                body = json.dumps({
+                    "searchParameters": {"q": query},
+                    "organic": [
+                        {
+                            "title": f"Result {i} for {query}",
+                            "link": f"{server.base_url}/page/{i}",
+                            "snippet": filler_text(30),
+                            "position": i,
+                        }
+                        for i in range(1, server.results + 1)
+                    ],
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                time.sleep(server.latency)
+                with server._lock:
+                    server.page_requests += 1
+                    server.simulated_seconds += server.latency
+                etag = f'"{self.path}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                body = stub_page(self.path).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,19 @@
+import math
+
+# Rough characters-per-token ratio for English prose; close enough for budgeting
+# prompt sizes without pulling in a model-specific tokenizer.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Cut ``text`` to roughly ``budget`` tokens, preferring a paragraph or line boundary."""
+    limit = budget * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    boundary = max(cut.rfind("\n\n"), cut.rfind("\n"))
+    return (cut[:boundary] if boundary > limit // 2 else cut).rstrip() + " …"
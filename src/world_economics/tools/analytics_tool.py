@@ -0,0 +1,88 @@
+from crewai.tools import BaseTool
+from typing import Optional, Type
+from pydantic import BaseModel, Field
+
+from ..analytics import OPERATIONS, analyze, is_rate, parse_series, series_rates
+from ..indicators import get_indicator_store
+
+
+class EconomicAnalyticsInput(BaseModel):
+    """Input schema for EconomicAnalyticsTool."""
+    data: str = Field(
+        "",
+        description=(
+            "Numeric series, one per line as 'Label: 2020: 3.2, 2021: 8.3, ...' (the local indicator tool's output "
+            "can be passed as is) or JSON like {\"Brazil\": {\"2020\": 3.2, \"2021\": 8.3}}. "
+            "Leave empty to load 'indicator' for 'countries' from the local dataset instead."
+        ),
+    )
+    operations: str = Field(
+        "all",
+        description=f"Comma-separated subset of: {', '.join(OPERATIONS)}; or 'all'.",
+    )
+    window: int = Field(3, ge=2, le=20, description="Window in years for rolling statistics.")
+    unit: str = Field(
+        "auto",
+        description=(
+            "'percent' for rates and shares (inflation, GDP growth, % of GDP): changes are then reported in "
+            "percentage points instead of % growth and CAGR. 'level' for amounts and indices. "
+            "'auto' decides per series from its label, the heading above it or the indicator name."
+        ),
+    )
+    indicator: Optional[str] = Field(None, description="Local dataset indicator code or keywords, used when 'data' is empty.")
+    countries: Optional[str] = Field(None, description="Comma-separated countries for 'indicator'.")
+
+
+class EconomicAnalyticsTool(BaseTool):
+    name: str = "Compute economic statistics"
+    description: str = (
+        "Computes year-over-year changes, CAGR, rolling mean/std, cross-country correlations and rankings for "
+        "numeric yearly series in one call, and returns compact markdown tables you can cite. Series that are "
+        "already percentages get percentage-point changes instead. Use it instead of calculating growth rates or "
+        "averages yourself."
+    )
+    args_schema: Type[BaseModel] = EconomicAnalyticsInput
+
+    def _run(
+        self,
+        data: str = "",
+        operations: str = "all",
+        window: int = 3,
+        indicator: Optional[str] = None,
+        countries: Optional[str] = None,
+        unit: str = "auto",
+    ) -> str:
+        if data.strip():
+            series = parse_series(data)
+            rates = series_rates(data)
+        elif indicator and countries:
+            series = self._local_series(indicator, countries)
+            rates = is_rate(indicator, self._indicator_name(indicator))
+        else:
+            return "Provide numeric series in 'data', or an 'indicator' and 'countries' from the local dataset."
+        if not series:
+            return "No numeric series found. Use lines like 'Brazil: 2020: 3.2, 2021: 8.3' or a JSON object."
+
+        requested = [op.strip().lower() for op in operations.split(",")]
+        unit = unit.strip().lower()
+        if unit in ("percent", "level"):
+            rates = unit == "percent"
+        return analyze(series, None if "all" in requested else requested, window=window, rates=rates)
+
+    def _indicator_name(self, indicator: str) -> str:
+        store = get_indicator_store()
+        matches = store.find_indicators(indicator) if store else []
+        return " ".join(store.indicators[matches[0]]) if matches else ""
+
+    def _local_series(self, indicator: str, countries: str) -> dict:
+        store = get_indicator_store()
+        matches = store.find_indicators(indicator) if store else []
+        if not matches:
+            return {}
+        series = {}
+        for name in filter(None, (c.strip() for c in countries.split(","))):
+            country = store.country(name)
+            if country is not None:
+                years, values = store.series(country, matches[0])
+                series[store.countries[country][1]] = dict(zip(years.tolist(), values.tolist()))
+        return series
@@ -0,0 +1,68 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Type
+
+from crewai.tools import BaseTool
+from crewai_tools import SerperDevTool
+from pydantic import BaseModel, Field, PrivateAttr
+
+from ..cache import TTLCache, cache_path, normalize_query
+from ..metrics import span
+from ..ratelimit import rate_limiter
+
+
+class CachedSerperToolInput(BaseModel):
+    """Input schema for CachedSerperTool."""
+    search_query: str = Field(..., description="Mandatory search query you want to use to search the internet")
+
+
+class CachedSerperTool(BaseTool):
+    name: str = "Search the internet with Serper"
+    description: str = (
+        "A tool that can be used to search the internet with a search_query. "
+        "Repeated or near-identical queries are answered from a local cache."
+    )
+    args_schema: Type[BaseModel] = CachedSerperToolInput
+    tool: BaseTool = Field(default_factory=SerperDevTool)
+    ttl: float = Field(default_factory=lambda: float(os.getenv("SERPER_CACHE_TTL", 6 * 3600)))
+    max_entries: int = Field(default_factory=lambda: int(os.getenv("SERPER_CACHE_MAX_ENTRIES", 5000)))
+    memory_entries: int = Field(default_factory=lambda: int(os.getenv("SERPER_CACHE_MEMORY_ENTRIES", 256)))
+
+    _cache: TTLCache = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        self._cache = TTLCache(
+            cache_path("serper.sqlite3"),
+            ttl=self.ttl,
+            max_entries=self.max_entries,
+            memory_entries=self.memory_entries,
+        )
+
+    def cache_key(self, **kwargs: Any) -> str:
+        query = kwargs.get("search_query") or kwargs.get("query") or ""
+        params = {
+            "q": normalize_query(query),
+            "type": kwargs.get("search_type", getattr(self.tool, "search_type", "search")),
+            "n": getattr(self.tool, "n_results", None),
+            "country": getattr(self.tool, "country", None),
+            "location": getattr(self.tool, "location", None),
+            "locale": getattr(self.tool, "locale", None),
+        }
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+    def _run(self, **kwargs: Any) -> Any:
+        with span("search", "serper") as attrs:
+            key = self.cache_key(**kwargs)
+            cached = self._cache.get(key)
+            attrs["cache_hit"] = cached is not None
+            if cached is not None:
+                return cached
+            result = rate_limiter.call("serper", lambda: self.tool.run(**kwargs))
+            if result:
+                self._cache.set(key, result)
+            return result
@@ -0,0 +1,61 @@
+from crewai.tools import BaseTool
+from typing import Optional, Type
+from pydantic import BaseModel, Field
+
+from ..indicators import IndicatorStore, get_indicator_store
+
+
+class IndicatorQueryInput(BaseModel):
+    """Input schema for IndicatorQueryTool."""
+    countries: str = Field(..., description="Comma-separated country names or ISO3 codes, e.g. 'Brazil, IND, United States'.")
+    indicator: str = Field(..., description="Indicator code (e.g. 'NY.GDP.MKTP.KD.ZG') or keywords (e.g. 'GDP growth', 'inflation consumer prices').")
+    start_year: Optional[int] = Field(None, description="First year to include.")
+    end_year: Optional[int] = Field(None, description="Last year to include.")
+
+
+class IndicatorQueryTool(BaseTool):
+    name: str = "Query local economic indicators"
+    description: str = (
+        "Look up historical economic indicators (GDP, inflation, interest rates, trade, debt, ...) by country and year "
+        "from a local World Bank/IMF dataset. Instant and offline: use it for figures before searching the web."
+    )
+    args_schema: Type[BaseModel] = IndicatorQueryInput
+    max_rows: int = 40
+
+    def _run(self, countries: str, indicator: str, start_year: Optional[int] = None, end_year: Optional[int] = None) -> str:
+        store = get_indicator_store()
+        if store is None:
+            return "The local indicator store is empty; use web search instead."
+        return format_query(store, countries, indicator, start_year, end_year, self.max_rows)
+
+
+def format_query(
+    store: IndicatorStore,
+    countries: str,
+    indicator: str,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    max_rows: int = 40,
+) -> str:
+    matches = store.find_indicators(indicator)
+    if not matches:
+        return f"No indicator matches '{indicator}'."
+    ids, unknown = [], []
+    for name in filter(None, (c.strip() for c in countries.split(","))):
+        index = store.country(name)
+        if index is None:
+            unknown.append(name)
+        else:
+            ids.append(index)
+
+    code, title = store.indicators[matches[0]]
+    lines = [f"{title} ({code})"]
+    for country in ids:
+        years, values = store.series(country, matches[0], start_year, end_year)
+        cells = ", ".join(f"{y}: {v:,.4g}" for y, v in zip(years[-max_rows:].tolist(), values[-max_rows:].tolist()))
+        lines.append(f"- {store.countries[country][1]}: {cells or 'no data for these years'}")
+    if unknown:
+        lines.append(f"Unknown countries: {', '.join(unknown)}")
+    if len(matches) > 1:
+        lines.append("Other matching indicators: " + "; ".join(f"{store.indicators[i][1]} ({store.indicators[i][0]})" for i in matches[1:]))
+    return "\n".join(lines)
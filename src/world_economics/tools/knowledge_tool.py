@@ -0,0 +1,27 @@
+from crewai.tools import BaseTool
+from typing import Type
+from pydantic import BaseModel, Field
+
+from ..knowledge import get_knowledge_index
+
+
+class KnowledgeLookupInput(BaseModel):
+    """Input schema for KnowledgeLookupTool."""
+    search_query: str = Field(..., description="What to look up in the project's knowledge files, e.g. 'user background'.")
+
+
+class KnowledgeLookupTool(BaseTool):
+    name: str = "Search project knowledge"
+    description: str = (
+        "Searches the local knowledge files (user preferences, background notes, reference material) "
+        "and returns the most relevant passages with their source file."
+    )
+    args_schema: Type[BaseModel] = KnowledgeLookupInput
+    top_k: int = 4
+
+    def _run(self, search_query: str) -> str:
+        index = get_knowledge_index()
+        hits = index.search(search_query, self.top_k) if index else []
+        if not hits:
+            return "Nothing relevant in the knowledge files."
+        return "\n\n".join(f"[{hit.source}]\n{hit.text}" for hit in hits)
@@ -0,0 +1,42 @@
+import re
+from crewai.tools import BaseTool
+from typing import Type
+from pydantic import BaseModel, Field
+
+from ..fetch import get_page_fetcher
+from ..metrics import span
+
+
+class PageFetchInput(BaseModel):
+    """Input schema for PageFetchTool."""
+    urls: str = Field(..., description="Result links to read, separated by commas or spaces, e.g. 'https://www.imf.org/..., https://data.worldbank.org/...'.")
+
+
+class PageFetchTool(BaseTool):
+    name: str = "Read web pages"
+    description: str = (
+        "Fetches several web pages at once (e.g. the most promising search result links) and returns their main text. "
+        "Use it when search snippets are not enough to get figures, dates or context."
+    )
+    args_schema: Type[BaseModel] = PageFetchInput
+    max_urls: int = 6
+
+    def _run(self, urls: str) -> str:
+        links = list(dict.fromkeys(re.findall(r"https?://[^\s,'\"<>]+", urls)))[: self.max_urls]
+        if not links:
+            return "No http(s) links given."
+        with span("fetch", "pages") as attrs:
+            pages = get_page_fetcher().fetch(links)
+            attrs.update(
+                urls=len(pages),
+                cache_hits=sum(1 for p in pages if p.cache),
+                errors=sum(1 for p in pages if p.error),
+            )
+        sections = []
+        for page in pages:
+            if page.error:
+                sections.append(f"[{page.url}] could not be read ({page.error})")
+            else:
+                note = " (truncated)" if page.truncated else ""
+                sections.append(f"[{page.url}] {page.title}{note}\n{page.text or '(no readable text)'}")
+        return "\n\n".join(sections)
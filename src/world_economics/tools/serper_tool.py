@@ -1,10 +1,37 @@
 import os
-from dotenv import load_dotenv
-from crewai_tools import SerperDevTool
-load_dotenv()
-# os.environ['SERPER_API_KEY'] = os.getenv('SERPER_API_KEY')
+import threading
+from typing import Any, Dict, Optional
 
-# inititlaize the tool for internet searching capabilities
-serper_tool = SerperDevTool()
+# The search tool pulls in crewai_tools, which is slow to import, so it is
+# built on first use rather than when this module is imported.
+_serper_tool = None
+_lock = threading.Lock()
 
 
+def get_serper_tool():
+    """The shared internet search tool, fronted by a persistent cache so repeated queries skip the Serper round-trip."""
+    global _serper_tool
+    with _lock:
+        if _serper_tool is None:
+            from dotenv import load_dotenv
+            from crewai_tools import SerperDevTool
+            from .cached_serper_tool import CachedSerperTool
+
+            load_dotenv()
+            # os.environ['SERPER_API_KEY'] = os.getenv('SERPER_API_KEY')
+            base_url = os.getenv("SERPER_BASE_URL")
+            search = SerperDevTool(base_url=base_url) if base_url else SerperDevTool()
+            _serper_tool = CachedSerperTool(tool=search)
+    return _serper_tool
+
+
+def search_cache_stats() -> Optional[Dict[str, Any]]:
+    """Search cache counters, or None if no search has been set up in this process yet."""
+    return _serper_tool.stats() if _serper_tool is not None else None
+
+
+def __getattr__(name: str) -> Any:
+    # keeps `from .tools.serper_tool import serper_tool` working, lazily
+    if name == "serper_tool":
+        return get_serper_tool()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,227 @@
+import argparse
+import json
+import os
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import normalize_query
+from .metrics import METRICS_LOG, query_attrs, span
+
+WARMUP = os.getenv("WARMUP", "0") == "1"
+WARMUP_TOP_N = int(os.getenv("WARMUP_TOP_N", 10))
+WARMUP_CONCURRENCY = int(os.getenv("WARMUP_CONCURRENCY", 1))
+WARMUP_INTERVAL = float(os.getenv("WARMUP_INTERVAL", 900))
+WARMUP_HOURS = os.getenv("WARMUP_HOURS", "0-6")
+# regenerate once a report has used this share of the report cache's max age
+WARMUP_REFRESH_AT = float(os.getenv("WARMUP_REFRESH_AT", 0.75))
+
+EXAMPLE_QUESTIONS = (
+    "How do interest rate changes affect emerging markets?",
+    "What is the impact of inflation on consumer spending patterns?",
+    "How does geopolitical tension influence global supply chains?",
+    "What are the economic implications of cryptocurrency adoption?",
+    "How do trade wars affect international commerce?",
+)
+
+
+def top_queries(n: int = WARMUP_TOP_N, log_path: Optional[str] = METRICS_LOG, max_lines: int = 200_000) -> List[str]:
+    """The ``n`` most requested report questions in the span log, by normalized form.
+
+    Each is returned as its most recent wording. Batch and warm-up runs don't
+    count, and only the last ``max_lines`` log records are read. Question
+    text is only logged with METRICS_LOG_QUERIES=1; without it this returns
+    nothing and only the example questions are warmed.
+    """
+    if not log_path or not os.path.exists(log_path):
+        return []
+    counts: Counter = Counter()
+    wording: Dict[str, str] = {}
+    with open(log_path) as f:
+        for line in deque(f, maxlen=max_lines):
+            if '"report"' not in line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            attrs = record.get("attrs", {})
+            query = attrs.get("query")
+            if record.get("kind") == "run" and record.get("name") == "report" and query and attrs.get("priority") != "batch":
+                key = normalize_query(query)
+                counts[key] += 1
+                wording[key] = query
+    return [wording[key] for key, _ in counts.most_common(n)]
+
+
+def warmup_questions(top_n: int = WARMUP_TOP_N) -> List[str]:
+    """The example questions plus the most requested ones, without duplicates."""
+    questions: Dict[str, str] = {}
+    for question in (*EXAMPLE_QUESTIONS, *top_queries(top_n)):
+        questions.setdefault(normalize_query(question), question)
+    return list(questions.values())
+
+
+def _hours(spec: str) -> Optional[Tuple[int, int]]:
+    if not spec.strip():
+        return None
+    start, _, end = spec.partition("-")
+    return int(start), int(end or start)
+
+
+def off_peak(now: Optional[datetime] = None, spec: str = WARMUP_HOURS) -> bool:
+    """Whether ``now`` (local time) falls in the ``start-end`` hour window; an empty spec means always."""
+    window = _hours(spec)
+    if window is None:
+        return True
+    hour = (now or datetime.now()).hour
+    start, end = window
+    return start <= hour < end if start < end else hour >= start or hour < end
+
+
+class WarmupScheduler:
+    """Keeps reports for common questions in the report cache.
+
+    ``run_once`` regenerates every question whose cached report is missing
+    or older than ``refresh_at`` of the cache's max age, at most
+    ``concurrency`` at a time and at batch priority, so warming never delays
+    interactive users' LLM or search calls. ``start`` repeats that every
+    ``interval`` seconds while in the off-peak window.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = WARMUP_CONCURRENCY,
+        interval: float = WARMUP_INTERVAL,
+        hours: str = WARMUP_HOURS,
+        refresh_at: float = WARMUP_REFRESH_AT,
+        top_n: int = WARMUP_TOP_N,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.interval = interval
+        self.hours = hours
+        self.refresh_at = refresh_at
+        self.top_n = top_n
+        self._lock = threading.Lock()
+        self._running = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stats: Dict[str, Any] = {"passes": 0, "warmed": 0, "fresh": 0, "failed": 0, "last_pass_at": None}
+
+    def due(self, questions: List[str], current_year: str) -> List[str]:
+        from .runner import get_report_cache
+
+        report_cache = get_report_cache()
+        limit = report_cache.max_age * self.refresh_at
+        due = []
+        for question in questions:
+            age = report_cache.age(question, current_year)
+            if age is None or age >= limit:
+                due.append(question)
+        return due
+
+    def run_once(self, questions: Optional[List[str]] = None) -> Dict[str, Any]:
+        """One warming pass; skipped (returns ``{}``) if another pass is still running."""
+        from .ratelimit import Priority, priority
+        from .runner import generate_report
+
+        if not self._running.acquire(blocking=False):
+            return {}
+        try:
+            current_year = str(datetime.now().year)
+            questions = questions if questions is not None else warmup_questions(self.top_n)
+            due = self.due(questions, current_year)
+            result = {"questions": len(questions), "fresh": len(questions) - len(due), "warmed": 0, "failed": []}
+
+            def warm(question: str) -> None:
+                # stored task outputs would just reproduce the old report; warming is for fresh data
+                with priority(Priority.BATCH), span("warmup", "report", **query_attrs(question)):
+                    generate_report(question, current_year, use_cache=False, reuse_tasks=False)
+
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="warmup") as pool:
+                futures = {question: pool.submit(warm, question) for question in due}
+                for question, future in futures.items():
+                    try:
+                        future.result()
+                        result["warmed"] += 1
+                    except Exception as e:
+                        result["failed"].append(f"{question}: {e}")
+
+            with self._lock:
+                self._stats["passes"] += 1
+                self._stats["warmed"] += result["warmed"]
+                self._stats["fresh"] += result["fresh"]
+                self._stats["failed"] += len(result["failed"])
+                self._stats["last_pass_at"] = time.time()
+            return result
+        finally:
+            self._running.release()
+
+    def start(self) -> None:
+        """Run passes in a background thread every ``interval`` seconds during off-peak hours; once per scheduler."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._loop, daemon=True, name="warmup-scheduler")
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            if off_peak(spec=self.hours):
+                self.run_once()
+            self._stop.wait(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats)
+
+
+warmup_scheduler = WarmupScheduler()
+
+
+def start_warmup() -> Optional[WarmupScheduler]:
+    """Start the shared scheduler if WARMUP=1; safe to call on every app rerun."""
+    if not WARMUP:
+        return None
+    warmup_scheduler.start()
+    return warmup_scheduler
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Regenerate cached reports for the example and most-asked questions.")
+    parser.add_argument("--top", type=int, default=WARMUP_TOP_N, help="most requested questions to include")
+    parser.add_argument("--concurrency", type=int, default=WARMUP_CONCURRENCY, help="reports generated at once")
+    parser.add_argument("--list", action="store_true", help="only show the questions and which are due")
+    parser.add_argument("--loop", action="store_true", help="keep running passes during WARMUP_HOURS")
+    args = parser.parse_args(argv)
+
+    scheduler = WarmupScheduler(concurrency=args.concurrency, top_n=args.top)
+    if args.list:
+        questions = warmup_questions(args.top)
+        due = set(scheduler.due(questions, str(datetime.now().year)))
+        for question in questions:
+            print(f"{'due  ' if question in due else 'fresh'}  {question}")
+        return
+    if args.loop:
+        scheduler.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            scheduler.stop()
+        return
+
+    started = time.perf_counter()
+    result = scheduler.run_once()
+    print(
+        f"{result['warmed']} reports warmed, {result['fresh']} already fresh, {len(result['failed'])} failed "
+        f"in {time.perf_counter() - started:.0f}s"
+    )
+    for failure in result["failed"]:
+        print(f"  failed: {failure}")
@@ -0,0 +1,11 @@
+import os
+import tempfile
+
+# Settings are read when the package modules are imported, so they are set here, before any test imports them.
+os.environ["WORLD_ECONOMICS_CACHE_DIR"] = tempfile.mkdtemp(prefix="we-test-cache-")
+os.environ["ARTIFACT_PERSIST"] = "0"
+os.environ["REPORT_HISTORY"] = "0"
+os.environ["RESEARCH_FANOUT"] = "0"
+os.environ["ROUTER_FAST_PATH"] = "0"
+os.environ["SERPER_API_KEY"] = "stub"
+os.environ["FETCH_ALLOW_PRIVATE"] = "1"  # the stub pages are served from localhost
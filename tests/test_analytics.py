@@ -0,0 +1,38 @@
+from world_economics.analytics import analyze, parse_series, series_rates
+
+
+def test_comma_separated_pairs_stay_separate_points():
+    assert parse_series("Brazil: 2020: 3,2021: 8") == {"Brazil": {2020: 3.0, 2021: 8.0}}
+    assert parse_series("Brazil: 2020: 3, 2021: 8.3") == {"Brazil": {2020: 3.0, 2021: 8.3}}
+
+
+def test_thousands_separators_are_read():
+    assert parse_series("Brazil GDP: 2020: 1,476.1, 2021: 1,670,647") == {
+        "Brazil GDP": {2020: 1476.1, 2021: 1670647.0}
+    }
+
+
+def test_mixed_panel_gives_each_series_its_own_unit():
+    data = "Brazil GDP (USD bn): 2020: 1476, 2021: 1670\nBrazil inflation: 2020: 3.2, 2021: 8.3"
+    table = analyze(parse_series(data), ["yoy", "cagr"], rates=series_rates(data))
+
+    assert "| Brazil GDP (USD bn) | 13.1 % |" in table
+    assert "| Brazil inflation | 5.1 pp |" in table
+    assert "percentage points for rates, % for levels" in table
+    assert "| Brazil GDP (USD bn) | 2020–2021 | 13.14 % |" in table
+    assert "| Brazil inflation | 2020–2021 | 5.10 pp |" in table
+
+
+def test_country_labels_take_the_unit_of_their_heading():
+    data = (
+        "Inflation, consumer prices (annual %) (FP.CPI.TOTL.ZG)\n- Brazil: 2020: 3.2, 2021: 8.3\n"
+        "GDP (current US$) (NY.GDP.MKTP.CD)\n- Chile: 2020: 254, 2021: 317"
+    )
+    assert series_rates(data) == {"Brazil": True, "Chile": False}
+
+
+def test_single_unit_panels_keep_their_titles():
+    rates = analyze({"Brazil inflation": {2020: 3.2, 2021: 8.3}}, ["yoy"])
+    levels = analyze({"Brazil GDP": {2020: 100.0, 2021: 110.0}}, ["yoy"])
+    assert "Year-over-year change (percentage points)" in rates and "| Brazil inflation | 5.1 |" in rates
+    assert "Year-over-year change (%)" in levels and "| Brazil GDP | 10.0 |" in levels
@@ -0,0 +1,15 @@
+from world_economics.benchmark import measure
+
+
+def test_peak_allocation_is_measured_per_level():
+    held = []
+
+    def allocate(i):
+        held.append(bytearray(4 * 1024 * 1024))
+
+    big = measure(allocate, requests=4, concurrency=2)
+    held.clear()
+    small = measure(lambda i: bytearray(1024), requests=4, concurrency=2)
+
+    assert big["peak_alloc_mb"] >= 15
+    assert small["peak_alloc_mb"] < 1
@@ -0,0 +1,19 @@
+import pytest
+
+from world_economics.cache import normalize_query
+
+
+@pytest.mark.parametrize(
+    "variant",
+    ["What is inflation?", "what is inflation", "  What is   inflation ?? ", "What is inflation.", "What is inflation?!"],
+)
+def test_punctuation_and_case_variants_share_a_key(variant):
+    assert normalize_query(variant) == "what is inflation"
+
+
+def test_punctuation_inside_words_and_numbers_is_kept():
+    assert normalize_query("U.S. GDP growth of 2.5% (year-on-year)?") == "u.s gdp growth of 2.5% year-on-year"
+
+
+def test_word_order_is_kept():
+    assert normalize_query("US sanctions on Russia?") != normalize_query("Russia sanctions on US")
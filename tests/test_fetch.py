@@ -0,0 +1,69 @@
+import asyncio
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from world_economics.cache import TTLCache  # noqa: E402
+from world_economics.fetch import PageFetcher, _pinned  # noqa: E402
+
+
+@pytest.fixture
+def internal_server():
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            body = b"<html><body><p>internal secret that must never be fetched</p></body></html>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1], hits
+    server.shutdown()
+    server.server_close()
+
+
+def test_host_rebinding_to_loopback_after_the_check_is_not_fetched(internal_server, monkeypatch, tmp_path):
+    port, hits = internal_server
+    lookups = []
+    real_getaddrinfo = asyncio.base_events.BaseEventLoop.getaddrinfo
+
+    async def getaddrinfo(self, host, *args, **kwargs):
+        name = host.decode() if isinstance(host, bytes) else host  # the HTTP client passes IDNA bytes
+        if name != "rebind.test":
+            return await real_getaddrinfo(self, host, *args, **kwargs)
+        lookups.append(name)
+        # public for the check, loopback for any later lookup
+        address = "93.184.216.34" if len(lookups) == 1 else "127.0.0.1"
+        return [(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", (address, port))]
+
+    monkeypatch.setattr(asyncio.base_events.BaseEventLoop, "getaddrinfo", getaddrinfo)
+    fetcher = PageFetcher(timeout=2, cache=TTLCache(str(tmp_path / "pages.sqlite3")), allow_private=False)
+    try:
+        [page] = fetcher.fetch([f"http://rebind.test:{port}/latest"])
+    finally:
+        fetcher.close()
+
+    assert lookups == ["rebind.test"]
+    assert hits == []
+    assert "secret" not in page.text
+
+
+def test_pinned_request_keeps_the_host_name():
+    url, headers, extensions = _pinned("https://data.example.org:8443/series?id=1", "93.184.216.34")
+    assert url == "https://93.184.216.34:8443/series?id=1"
+    assert headers == {"Host": "data.example.org:8443"}
+    assert extensions == {"sni_hostname": "data.example.org"}
+    assert _pinned("http://example.org/", "2606:2800:220:1::1")[0] == "http://[2606:2800:220:1::1]/"
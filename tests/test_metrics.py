@@ -0,0 +1,11 @@
+import urllib.request
+
+from world_economics.metrics import start_metrics_server
+
+
+def test_metrics_server_listens_on_loopback_by_default():
+    server = start_metrics_server(0)
+    host, port = server.server_address[:2]
+    assert host == "127.0.0.1"
+    with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+        assert response.status == 200
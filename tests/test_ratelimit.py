@@ -0,0 +1,52 @@
+import pytest
+
+from world_economics.ratelimit import is_rate_limited, provider_of
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class HTTPError(Exception):
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        HTTPError("slow down", status_code=429),
+        RateLimitError("litellm.RateLimitError: provider throttled"),
+        Exception("Error code: 429 - {'error': 'busy'}"),
+        Exception("429 RESOURCE_EXHAUSTED: quota"),
+        Exception("Rate limit reached for gpt-4o"),
+        Exception("Too Many Requests"),
+    ],
+)
+def test_rate_limit_errors_are_recognized(error):
+    assert is_rate_limited(error)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        HTTPError("bad request", status_code=400),
+        Exception("context window of 4290 tokens exceeded"),
+        Exception("request 1429 failed: connection reset"),
+        Exception("model took 429 ms to answer invalid JSON"),
+    ],
+)
+def test_other_errors_are_not_rate_limits(error):
+    assert not is_rate_limited(error)
+
+
+def test_provider_of_without_a_model_is_default():
+    assert provider_of(None) == "default"
+
+
+def test_provider_of_resolves_unprefixed_model_names():
+    pytest.importorskip("litellm")
+    assert provider_of("gpt-4o") == "openai"
+    assert provider_of("gemini/gemini-2.0-flash") == "gemini"
+    assert provider_of("no-such-model-anywhere") == "default"
@@ -0,0 +1,36 @@
+import pytest
+
+from world_economics.report_cache import ReportCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ReportCache(str(tmp_path / "reports.sqlite3"))
+    cache.put("What is the impact of tariffs on German exports?", "2026", "tariff report")
+    cache.put("How do rising US rates affect emerging Asia?", "2026", "asia report")
+    return cache
+
+
+def test_rephrased_question_reuses_the_report_by_default(cache):
+    assert cache.similarity_threshold == 0.9
+    assert cache.get("Impact of tariffs on German exports", "2026") == "tariff report"
+    assert cache.stats()["similar_hits"] == 1
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "What is the impact of tariffs on German imports?",
+        "How do rising US rates affect emerging Africa?",
+        "What is the impact of tariffs on German exports in 2027?",
+    ],
+)
+def test_a_different_question_misses(cache, query):
+    assert cache.get(query, "2026") is None
+
+
+def test_threshold_one_means_exact_only(tmp_path):
+    cache = ReportCache(str(tmp_path / "reports.sqlite3"), similarity_threshold=1.0)
+    cache.put("What is the impact of tariffs on German exports?", "2026", "tariff report")
+    assert cache.get("Impact of tariffs on German exports", "2026") is None
+    assert cache.get("what is the impact of tariffs on German exports", "2026") == "tariff report"
@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from world_economics.llms import register_llm  # noqa: E402
+from world_economics.stubs import STUB_MODEL, StubLLM, StubSerperServer  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def stub_models():
+    os.environ["MODEL"] = STUB_MODEL
+    register_llm(STUB_MODEL, StubLLM(latency=0))
+    register_llm(STUB_MODEL, StubLLM(latency=0, stream=True), stream=True)
+    with StubSerperServer(latency=0) as serper:
+        os.environ["SERPER_BASE_URL"] = serper.base_url
+        yield
+
+
+def test_rerun_reuses_outputs_of_a_default_run(stub_models):
+    from world_economics.runner import generate_report
+
+    query = "How did inflation in Brazil respond to US rate hikes?"
+    first = generate_report(query, "2026", use_cache=False)
+    assert first.reused == []
+
+    rerun = generate_report(query, "2026", use_cache=False, rerun_from="analysis_task")
+    assert rerun.reused == ["user_analysis_task", "research_task"]
+    assert rerun.report
+
+
+def test_importing_the_runner_creates_no_store_files(tmp_path):
+    import subprocess
+    import sys
+
+    cache_dir = tmp_path / "cache"
+    env = {**os.environ, "WORLD_ECONOMICS_CACHE_DIR": str(cache_dir), "PYTHONPATH": os.pathsep.join(sys.path)}
+    subprocess.run([sys.executable, "-c", "import world_economics.runner"], env=env, check=True)
+    assert not cache_dir.exists() or not any(cache_dir.iterdir())